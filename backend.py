@@ -4,24 +4,116 @@ Backend-Logik für das Coworking Tool, einschließlich Datenmodell und Google Sh
 """
 
 import os
+import re
+import bisect
 import threading
+import time
 import json
+import queue
+import random
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
-from tkinter import messagebox
 
 # Abhängigkeiten von Drittanbietern
 try:
     import gspread
+    GSPREAD_AVAILABLE = True
 except ImportError:
     gspread = None
+    GSPREAD_AVAILABLE = False
 
 # Lokale Importe
-from utils import now_iso
+import config
+from utils import now_iso, parse_checklist, checklist_stats
+from records import Project, Task
+
+# Spaltenköpfe der Arbeitsblätter - unverändert lassen: ältere Clients leeren ein
+# Arbeitsblatt, dessen Kopfzeile nicht exakt ihren Headern entspricht
+PROJECT_HEADERS = ["project_id", "name", "color", "deadline", "last_update"]
+TASK_HEADERS = ["task_id", "project_id", "name", "goal", "description",
+                "attention", "assignee", "checklist_json", "last_update"]
+
+# Tombstones: gelöschte Records bleiben als Zeile stehen, damit die Löschung per
+# Last-Write-Wins an alle Clients verteilt wird. Markiert werden sie über dieses Suffix
+# am last_update-Wert (keine eigene Spalte, siehe oben)
+TOMBSTONE_SUFFIX = "|deleted"
+
+# Lange Freitext-Spalten eines Tasks: werden nur für den TaskEditor nachgeladen
+TASK_BODY_FIELDS = ("goal", "description", "attention")
+TASK_SUMMARY_FIELDS = [h for h in TASK_HEADERS if h not in TASK_BODY_FIELDS]
+
+# Ab diesem Anteil geänderter Zeilen lohnt sich ein Delta-Abruf nicht mehr
+DELTA_FULL_FETCH_RATIO = 0.5
+
+# Obergrenze für den Backoff des Schreibpuffers nach fehlgeschlagenen Flushes (Sekunden)
+WRITE_MAX_BACKOFF = 60
+
+# Intervall, in dem Ergebnisse von Hintergrund-Jobs in den Tk-Thread übernommen werden (ms)
+ASYNC_PUMP_MS = 50
+
+# Prozessweiter Verbindungs-Cache: Ein gspread-Client hält seine HTTP-Session
+# (Keep-Alive) und erneuert das Token selbst, daher pro Service-Account nur einmal
+# authentifizieren. Geöffnete Sheets samt geprüften Arbeitsblättern werden pro
+# (Service-Account, Sheet-ID) wiederverwendet.
+_connection_lock = threading.Lock()
+_clients = {}       # (Pfad, mtime) -> gspread-Client
+_spreadsheets = {}  # ((Pfad, mtime), sheet_id) -> (Spreadsheet, ws_projects, ws_tasks)
+
+def is_tombstone(record):
+    """Gibt zurück, ob ein Record als gelöscht markiert ist."""
+    flag = record.get("deleted", "")
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("1", "true", "yes", "x")
+    return bool(flag)
+
+def encode_last_update(record):
+    """last_update-Zellwert eines Records (bei Tombstones mit TOMBSTONE_SUFFIX)."""
+    last_update = str(record.get("last_update") or now_iso())
+    return last_update + TOMBSTONE_SUFFIX if is_tombstone(record) else last_update
+
+def split_last_update(value):
+    """Zerlegt einen last_update-Zellwert in (last_update, ist_tombstone)."""
+    value = str(value or "")
+    if value.endswith(TOMBSTONE_SUFFIX):
+        return value[:-len(TOMBSTONE_SUFFIX)], True
+    return value, False
+
+def has_task_body(task):
+    """Gibt zurück, ob Ziel, Beschreibung und Beachtung eines Tasks geladen sind."""
+    return all(field in task for field in TASK_BODY_FIELDS)
+
+def retry_after_seconds(error):
+    """
+    Wartezeit in Sekunden, wenn error eine Rate-Limit-Antwort (HTTP 429) ist - aus dem
+    Retry-After-Header (Sekunden oder HTTP-Datum) oder ein Standardwert. Sonst None.
+    """
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return None
+    value = (getattr(response, "headers", None) or {}).get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    return float(config.RATE_LIMIT_DEFAULT_SECONDS)
+
+def tombstone_cutoff(max_age_days):
+    """last_update-Grenze (ISO, UTC), ab der Tombstones physisch gelöscht werden dürfen."""
+    return (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat()
 
 def ensure_gspread():
-    """Stellt sicher, dass gspread installiert ist."""
+    """
+    Stellt sicher, dass gspread installiert ist. Läuft im Hintergrund-Thread und meldet
+    nur per Exception - den Dialog zeigt die App im Tk-Thread (_on_connect_failed).
+    """
     if gspread is None:
-        messagebox.showerror("Fehlende Abhängigkeit", "Bitte installiere gspread:\n\npip install gspread")
         raise RuntimeError("gspread not installed")
 
 class SheetsBackend:
@@ -35,25 +127,52 @@ class SheetsBackend:
         self.ws_projects = None
         self.ws_tasks = None
         self.lock = threading.Lock()
+        # Zeilen-Index pro Arbeitsblatt (Titel -> {id: Zeilennummer}), damit
+        # Schreibzugriffe ohne vorheriges get_all_records() auskommen
+        self.row_index = {}
+        self.last_row = {}
+        # Zuletzt gesehener last_update-Wert pro Zeile (Titel -> {id: last_update}),
+        # dient als Wasserzeichen für den Delta-Sync
+        self.seen_updates = {}
+        self.connected_settings = None  # (Service-Account, Sheet-ID) der aktuellen Verbindung
+
+    def _connection_settings(self):
+        return (self.config.get("service_account_json") or "", self.config.get("sheet_id") or "")
+
+    def needs_reconnect(self):
+        """Gibt zurück, ob sich die verbindungsrelevanten Einstellungen seit connect() geändert haben."""
+        return not self.is_connected() or self.connected_settings != self._connection_settings()
 
     def connect(self):
-        """Stellt die Verbindung zum Google Sheet her."""
+        """Stellt die Verbindung zum Google Sheet her (wiederverwendet gecachte Clients und Sheets)."""
         ensure_gspread()
-        path = self.config.get("service_account_json") or ""
+        path, sheet_id = self._connection_settings()
         if not path or not os.path.exists(path):
             raise FileNotFoundError("Service-Account JSON nicht gefunden. Bitte in den Einstellungen setzen.")
-        self.gc = gspread.service_account(filename=path)
-        sheet_id = self.config.get("sheet_id") or ""
         if not sheet_id:
             raise ValueError("Sheet-ID fehlt. Bitte in den Einstellungen setzen.")
-        self.sh = self.gc.open_by_key(sheet_id)
-        # Sicherstellen, dass die Arbeitsblätter existieren
-        self.ws_projects = self._ensure_ws("Projects", ["project_id", "name", "color", "deadline", "last_update"])
-        self.ws_tasks    = self._ensure_ws("Tasks",    ["task_id", "project_id", "name", "goal", "description",
-                                                        "attention", "assignee", "checklist_json", "last_update"])
+        # Eine geänderte JSON-Datei (neuer Schlüssel) erzeugt einen neuen Client
+        credentials = (os.path.abspath(path), os.path.getmtime(path))
+        with _connection_lock:
+            self.gc = _clients.get(credentials)
+            if self.gc is None:
+                self.gc = _clients[credentials] = gspread.service_account(filename=path)
+            cached = _spreadsheets.get((credentials, sheet_id))
+            if cached is None:
+                sh = self.gc.open_by_key(sheet_id)
+                self.sh = sh
+                # Sicherstellen, dass die Arbeitsblätter existieren
+                cached = (sh, self._ensure_ws("Projects", PROJECT_HEADERS), self._ensure_ws("Tasks", TASK_HEADERS))
+                _spreadsheets[(credentials, sheet_id)] = cached
+        self.sh, self.ws_projects, self.ws_tasks = cached
+        self.connected_settings = (path, sheet_id)
 
     def _ensure_ws(self, title, headers):
-        """Stellt sicher, dass ein Arbeitsblatt mit den korrekten Headern existiert."""
+        """
+        Stellt sicher, dass ein Arbeitsblatt mit den korrekten Headern existiert.
+        Zusätzliche Spalten hinter den eigenen Headern werden akzeptiert. Ein Blatt mit
+        abweichender Kopfzeile wird nie geleert, sondern als Fehler gemeldet.
+        """
         try:
             ws = self.sh.worksheet(title)
         except gspread.exceptions.WorksheetNotFound:
@@ -61,157 +180,1120 @@ class SheetsBackend:
             ws.append_row(headers)
         # Header überprüfen
         first_row = ws.row_values(1)
-        if first_row != headers:
-            ws.clear()
-            ws.append_row(headers)
-        return ws
+        while first_row and not first_row[-1]:
+            first_row.pop()
+        if first_row[:len(headers)] == headers:
+            return ws
+        if first_row == headers[:len(first_row)]:
+            # Leeres Blatt oder ältere Version ohne neue Spalten: nur die fehlenden Header ergänzen
+            if ws.col_count < len(headers):
+                ws.add_cols(len(headers) - ws.col_count)
+            ws.update(values=[headers], range_name=f"A1:{self._col_letter(len(headers))}1")
+            return ws
+        raise ValueError(f"Arbeitsblatt '{title}' hat unerwartete Spaltenköpfe: {', '.join(first_row)}")
+
+    @staticmethod
+    def _col_letter(n):
+        """Wandelt eine 1-basierte Spaltennummer in Buchstaben um (1 -> A, 27 -> AA)."""
+        letters = ""
+        while n:
+            n, rem = divmod(n - 1, 26)
+            letters = chr(65 + rem) + letters
+        return letters
+
+    @classmethod
+    def _record_range(cls, row_idx, headers):
+        """A1-Bereich einer ganzen Datenzeile (z.B. A5:J5)."""
+        return f"A{row_idx}:{cls._col_letter(len(headers))}{row_idx}"
+
+    @classmethod
+    def _column_blocks(cls, headers, fields):
+        """Fasst die Spalten der Felder zu zusammenhängenden Blöcken [(erste, letzte)] zusammen."""
+        return cls._row_ranges(headers.index(f) + 1 for f in fields)
+
+    @staticmethod
+    def _assemble(headers, blocks, block_values):
+        """Baut einen Record aus den Werten mehrerer Spaltenblöcke einer Zeile."""
+        record = {}
+        for (first, last), values in zip(blocks, block_values):
+            for col in range(first, last + 1):
+                record[headers[col - 1]] = values[col - first] if col - first < len(values) else ""
+        return record
+
+    def _fetch_columns(self, ws, headers, fields, id_key):
+        """
+        Liest nur die Spalten der angegebenen Felder (ein values_batch_get mit einem
+        Bereich pro Spaltenblock) und baut daraus den Zeilen-Index (Lock muss gehalten werden).
+        """
+        blocks = self._column_blocks(headers, fields)
+        ranges = [f"'{ws.title}'!{self._col_letter(first)}2:{self._col_letter(last)}"
+                  for first, last in blocks]
+        columns = [vr.get("values", []) for vr in self.sh.values_batch_get(ranges).get("valueRanges", [])]
+        columns += [[]] * (len(blocks) - len(columns))
+        count = max((len(c) for c in columns), default=0)
+        rows = [self._assemble(headers, blocks, [c[i] if i < len(c) else [] for c in columns])
+                for i in range(count)]
+        self._index_rows(ws, rows, id_key)
+        return rows
+
+    def _index_rows(self, ws, rows, id_key):
+        """Baut den Zeilen-Index aus bereits geladenen Records auf (Zeile 1 = Header)."""
+        index = {}
+        seen = {}
+        for i, r in enumerate(rows, start=2):
+            rid = r.get(id_key)
+            if rid:
+                index[str(rid)] = i
+                seen[str(rid)] = str(r.get("last_update", "") or "")
+        self.row_index[ws.title] = index
+        self.last_row[ws.title] = len(rows) + 1
+        self.seen_updates[ws.title] = seen
+
+    def _reindex_ids(self, ws, ids=None):
+        """Liest nur die ID-Spalte (oder nutzt bereits gelesene IDs), um den Zeilen-Index neu aufzubauen."""
+        if ids is None:
+            ids = ws.col_values(1)[1:]
+        self.row_index[ws.title] = {rid: i for i, rid in enumerate(ids, start=2) if rid}
+        self.last_row[ws.title] = len(ids) + 1
+
+    def _refresh_ids(self, sheets):
+        """
+        Liest die ID-Spalte mehrerer Blätter in einem values_batch_get und baut deren
+        Zeilen-Index neu auf (Lock muss gehalten werden). Vor dem Schreiben aufgerufen,
+        damit von anderen Clients gelöschte Zeilen nicht zu falschen Zielzeilen führen.
+        """
+        if not sheets:
+            return
+        value_ranges = self.sh.values_batch_get([f"'{ws.title}'!A2:A" for ws in sheets]).get("valueRanges", [])
+        value_ranges += [{}] * (len(sheets) - len(value_ranges))
+        for ws, value_range in zip(sheets, value_ranges):
+            self._reindex_ids(ws, [row[0] if row else "" for row in value_range.get("values", [])])
+
+    def _find_row(self, ws, record_id):
+        """Gibt die Zeilennummer eines Records aus dem Index zurück (oder None)."""
+        if ws.title not in self.row_index:
+            self._reindex_ids(ws)
+        return self.row_index[ws.title].get(record_id)
+
+    def _mark_written(self, ws, record_id, vals):
+        """Merkt sich den selbst geschriebenen last_update-Wert, damit der Delta-Sync ihn nicht erneut lädt."""
+        headers = PROJECT_HEADERS if ws is self.ws_projects else TASK_HEADERS
+        self.seen_updates.setdefault(ws.title, {})[record_id] = str(vals[headers.index("last_update")])
+
+    def _append_rows_indexed(self, ws, record_ids, rows):
+        """Hängt mehrere Zeilen in einem Request an und trägt sie in den Zeilen-Index ein."""
+        for record_id, vals in zip(record_ids, rows):
+            self._mark_written(ws, record_id, vals)
+        if ws.title not in self.row_index:
+            self._reindex_ids(ws)
+        if len(rows) == 1:
+            resp = ws.append_row(rows[0])
+        else:
+            resp = ws.append_rows(rows)
+        first_row = None
+        updated_range = ((resp or {}).get("updates") or {}).get("updatedRange", "")
+        match = re.search(r"![A-Z]+(\d+)", updated_range)
+        if match:
+            first_row = int(match.group(1))
+        if not first_row:
+            first_row = self.last_row.get(ws.title, 1) + 1
+        for offset, record_id in enumerate(record_ids):
+            self.row_index[ws.title][record_id] = first_row + offset
+        self.last_row[ws.title] = max(self.last_row.get(ws.title, 1), first_row + len(rows) - 1)
+
+    @staticmethod
+    def _row_ranges(rows):
+        """Fasst Zeilennummern zu zusammenhängenden Bereichen (start, ende) zusammen."""
+        ranges = []
+        for row in sorted(rows):
+            if ranges and row == ranges[-1][1] + 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        return [tuple(r) for r in ranges]
+
+    def _delete_rows_batch(self, ws, record_ids, ids=None):
+        """
+        Löscht die Zeilen mehrerer Records mit einem einzigen batch_update.
+        Die Zeilen werden vorher aus der ID-Spalte bestimmt (ids, falls schon gelesen),
+        damit Löschungen anderer Clients nicht zu falschen Zeilen führen.
+        Zusammenhängende Zeilen werden zu einem deleteDimension-Bereich zusammengefasst.
+        """
+        record_ids = set(record_ids)
+        if not record_ids:
+            return
+        self._reindex_ids(ws, ids)
+        index = self.row_index[ws.title]
+        rows = sorted(index[rid] for rid in record_ids if rid in index)
+        if not rows:
+            return
+        # Von unten nach oben löschen, damit die Zeilennummern der übrigen Bereiche gültig bleiben
+        requests = [{
+            "deleteDimension": {
+                "range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}
+            }
+        } for start, end in reversed(self._row_ranges(rows))]
+        self.sh.batch_update({"requests": requests})
+
+        seen = self.seen_updates.get(ws.title, {})
+        for rid in record_ids:
+            index.pop(rid, None)
+            seen.pop(rid, None)
+        for rid, i in index.items():
+            index[rid] = i - bisect.bisect_left(rows, i)
+        self.last_row[ws.title] = max(1, self.last_row.get(ws.title, 1) - len(rows))
+
+    def is_connected(self):
+        """Gibt zurück, ob die Arbeitsblätter verbunden sind."""
+        return self.ws_projects is not None and self.ws_tasks is not None
+
+    @staticmethod
+    def _project_values(project):
+        """Wandelt ein Projekt in die Zeilenwerte (Spalten A-E) um."""
+        return [
+            project.get("project_id", ""),
+            project.get("name", ""),
+            project.get("color", ""),
+            project.get("deadline", ""),
+            encode_last_update(project)
+        ]
+
+    @staticmethod
+    def _task_values(task):
+        """Wandelt einen Task in die Zeilenwerte (Spalten A-I) um."""
+        # Handle assignee as either string or list - save as comma-separated string
+        assignee_data = task.get("assignee", "")
+        if isinstance(assignee_data, list):
+            # Join multiple assignees with comma and space
+            assignee_str = ", ".join(assignee_data) if assignee_data else ""
+        else:
+            assignee_str = str(assignee_data) if assignee_data else ""
+
+        return [
+            task.get("task_id", ""),
+            task.get("project_id", ""),
+            task.get("name", ""),
+            task.get("goal", ""),
+            task.get("description", ""),
+            task.get("attention", ""),
+            assignee_str,
+            task.get("checklist_json", "[]"),
+            encode_last_update(task)
+        ]
+
+    @staticmethod
+    def _normalize_project(r):
+        """Setzt fehlende Projektfelder auf Standardwerte."""
+        r.setdefault("project_id", "")
+        r.setdefault("name", "")
+        r.setdefault("color", "")
+        r.setdefault("deadline", "")
+        r["last_update"], deleted = split_last_update(r.get("last_update", ""))
+        r["deleted"] = deleted or is_tombstone(r)
+        return r
+
+    @staticmethod
+    def _normalize_task(r):
+        """Setzt fehlende Task-Felder auf Standardwerte und wandelt die Assignees in eine Liste."""
+        r.setdefault("task_id", "")
+        r.setdefault("project_id", "")
+        r.setdefault("name", "")
+        r.setdefault("goal", "")
+        r.setdefault("description", "")
+        r.setdefault("attention", "")
+
+        # Handle assignee field - convert comma-separated string to list
+        assignee_data = r.get("assignee", "")
+        if assignee_data:
+            # Split by comma and strip whitespace
+            assignee_list = [name.strip() for name in str(assignee_data).split(",") if name.strip()]
+            r["assignee"] = assignee_list
+        else:
+            r["assignee"] = []
+
+        r.setdefault("checklist_json", "[]")
+        r["last_update"], deleted = split_last_update(r.get("last_update", ""))
+        r["deleted"] = deleted or is_tombstone(r)
+        return r
+
+    @classmethod
+    def _normalize_task_summary(cls, r):
+        """Wie _normalize_task, aber ohne die (nicht geladenen) Freitext-Felder."""
+        r = cls._normalize_task(r)
+        for field in TASK_BODY_FIELDS:
+            r.pop(field, None)
+        return r
 
     def fetch_projects(self):
         """Holt alle Projekte aus dem Sheet."""
         with self.lock:
             rows = self.ws_projects.get_all_records()
+            self._index_rows(self.ws_projects, rows, "project_id")
         # Erforderliche Felder normalisieren
-        for r in rows:
-            r.setdefault("project_id", "")
-            r.setdefault("name", "")
-            r.setdefault("color", "")
-            r.setdefault("deadline", "")
-            r.setdefault("last_update", "")
-        return rows
+        return [self._normalize_project(r) for r in rows]
 
     def fetch_tasks(self):
         """Holt alle Tasks aus dem Sheet."""
         with self.lock:
             rows = self.ws_tasks.get_all_records()
-        for r in rows:
-            r.setdefault("task_id", "")
-            r.setdefault("project_id", "")
-            r.setdefault("name", "")
-            r.setdefault("goal", "")
-            r.setdefault("description", "")
-            r.setdefault("attention", "")
-            
-            # Handle assignee field - convert comma-separated string to list
-            assignee_data = r.get("assignee", "")
-            if assignee_data:
-                # Split by comma and strip whitespace
-                assignee_list = [name.strip() for name in assignee_data.split(",") if name.strip()]
-                r["assignee"] = assignee_list
-            else:
-                r["assignee"] = []
-            
-            r.setdefault("checklist_json", "[]")
-            r.setdefault("last_update", "")
-        return rows
+            self._index_rows(self.ws_tasks, rows, "task_id")
+        return [self._normalize_task(r) for r in rows]
+
+    def fetch_task_summaries(self):
+        """
+        Holt alle Tasks ohne Ziel, Beschreibung und Beachtung (nur die Spalten, die
+        Übersicht und Bubbles brauchen). Die Inhalte lädt fetch_task_body() bei Bedarf.
+        """
+        with self.lock:
+            rows = self._fetch_columns(self.ws_tasks, TASK_HEADERS, TASK_SUMMARY_FIELDS, "task_id")
+        return [self._normalize_task_summary(r) for r in rows]
+
+    def fetch_task_body(self, task_id):
+        """Lädt Ziel, Beschreibung und Beachtung eines Tasks. Gibt None zurück, wenn er nicht existiert."""
+        last_col = max(TASK_HEADERS.index(f) for f in TASK_BODY_FIELDS) + 1
+        with self.lock:
+            for _ in range(2):
+                row_idx = self._find_row(self.ws_tasks, task_id)
+                if not row_idx:
+                    return None
+                # Von der ID-Spalte bis zur letzten Inhaltsspalte lesen, um die Zeile zu prüfen
+                value_range = self.sh.values_batch_get(
+                    [f"'{self.ws_tasks.title}'!A{row_idx}:{self._col_letter(last_col)}{row_idx}"]
+                ).get("valueRanges", [{}])[0]
+                values = (value_range.get("values") or [[]])[0]
+                record = self._assemble(TASK_HEADERS, [(1, last_col)], [values])
+                if record["task_id"] == task_id:
+                    return {field: record[field] for field in TASK_BODY_FIELDS}
+                # Zeilen haben sich verschoben (Löschung eines anderen Clients) - Index neu lesen
+                self._reindex_ids(self.ws_tasks)
+        return None
+
+    def _task_ranges(self, task, row_idx):
+        """
+        Zeilenbereiche und Werte für das Schreiben eines Tasks. Ist der Inhalt nicht
+        geladen, werden Ziel/Beschreibung/Beachtung im Sheet nicht überschrieben.
+        """
+        vals = self._task_values(task)
+        if has_task_body(task):
+            return vals, [(self._record_range(row_idx, TASK_HEADERS), vals)]
+        return vals, [(f"{self._col_letter(first)}{row_idx}:{self._col_letter(last)}{row_idx}", vals[first - 1:last])
+                      for first, last in self._column_blocks(TASK_HEADERS, TASK_SUMMARY_FIELDS)]
+
+    def fetch_changes(self):
+        """
+        Delta-Sync: Liest nur ID- und last_update-Spalte beider Blätter (ein Request)
+        und holt anschließend nur die Zeilen, deren last_update sich seit dem letzten
+        Abruf geändert hat. Gibt (projekte, tasks) zurück - zwei leere Listen, wenn
+        sich nichts geändert hat. Tasks kommen ohne Freitext-Felder (siehe fetch_task_summaries).
+        """
+        sheets = [(self.ws_projects, PROJECT_HEADERS, "project_id", self._normalize_project, PROJECT_HEADERS),
+                  (self.ws_tasks, TASK_HEADERS, "task_id", self._normalize_task_summary, TASK_SUMMARY_FIELDS)]
+        with self.lock:
+            ranges = []
+            for ws, headers, _, _, _ in sheets:
+                update_col = self._col_letter(headers.index("last_update") + 1)
+                ranges += [f"'{ws.title}'!A2:A", f"'{ws.title}'!{update_col}2:{update_col}"]
+            value_ranges = self.sh.values_batch_get(ranges).get("valueRanges", [])
+
+            changed = []  # (ws, headers, normalize, [zeilennummern]) pro Blatt
+            for n, (ws, headers, id_key, normalize, fields) in enumerate(sheets):
+                ids = [row[0] if row else "" for row in value_ranges[2 * n].get("values", [])]
+                updates = [row[0] if row else "" for row in value_ranges[2 * n + 1].get("values", [])]
+                updates += [""] * (len(ids) - len(updates))
+
+                # Zeilen-Index und Wasserzeichen gleich mit aktualisieren
+                seen = self.seen_updates.get(ws.title, {})
+                index, new_seen, rows = {}, {}, []
+                for i, (rid, upd) in enumerate(zip(ids, updates), start=2):
+                    if not rid:
+                        continue
+                    index[rid] = i
+                    new_seen[rid] = upd
+                    if seen.get(rid) != upd:
+                        rows.append(i)
+                self.row_index[ws.title] = index
+                self.last_row[ws.title] = len(ids) + 1
+                self.seen_updates[ws.title] = new_seen
+                changed.append((ws, headers, id_key, normalize, fields, rows, len(index)))
+
+            if not any(rows for _, _, _, _, _, rows, _ in changed):
+                return [], []
+
+            results = []
+            row_ranges = []
+            for ws, headers, id_key, normalize, fields, rows, total in changed:
+                if rows and len(rows) > total * DELTA_FULL_FETCH_RATIO:
+                    # Zu viele Änderungen - ganzes Blatt (nur benötigte Spalten) laden
+                    records = self._fetch_columns(ws, headers, fields, id_key)
+                    results.append([normalize(r) for r in records])
+                else:
+                    blocks = self._column_blocks(headers, fields)
+                    row_ranges += [f"'{ws.title}'!{self._col_letter(first)}{i}:{self._col_letter(last)}{i}"
+                                   for i in rows for first, last in blocks]
+                    results.append(None)
+            if row_ranges:
+                fetched = iter(self.sh.values_batch_get(row_ranges).get("valueRanges", []))
+            for n, (ws, headers, id_key, normalize, fields, rows, total) in enumerate(changed):
+                if results[n] is not None:
+                    continue
+                blocks = self._column_blocks(headers, fields)
+                records = []
+                for _ in rows:
+                    block_values = []
+                    for _ in blocks:
+                        values = next(fetched).get("values", [[]])
+                        block_values.append(values[0] if values else [])
+                    records.append(normalize(self._assemble(headers, blocks, block_values)))
+                results[n] = records
+        return results[0], results[1]
 
     def upsert_project(self, project):
         """Fügt ein Projekt hinzu oder aktualisiert es."""
-        with self.lock:
-            all_rows = self.ws_projects.get_all_records()
-            # Zeile finden
-            row_idx = None
-            for i, r in enumerate(all_rows, start=2):
-                if r.get("project_id") == project["project_id"]:
-                    row_idx = i
-                    break
-            vals = [
-                project.get("project_id", ""),
-                project.get("name", ""),
-                project.get("color", ""),
-                project.get("deadline", ""),
-                project.get("last_update", now_iso())
-            ]
-            if row_idx:
-                self.ws_projects.update(f"A{row_idx}:E{row_idx}", [vals])
-            else:
-                self.ws_projects.append_row(vals)
+        self.apply_writes(projects=[project])
 
     def delete_project(self, project_id):
         """Löscht ein Projekt und die zugehörigen Tasks."""
         with self.lock:
-            # Projektzeile löschen
-            all_rows = self.ws_projects.get_all_records()
-            for i, r in enumerate(all_rows, start=2):
-                if r.get("project_id") == project_id:
-                    self.ws_projects.delete_rows(i)
-                    break
-            # Zugehörige Tasks löschen
-            tasks = self.ws_tasks.get_all_records()
-            to_delete = []
-            for i, r in enumerate(tasks, start=2):
-                if r.get("project_id") == project_id:
-                    to_delete.append(i)
-            for idx in reversed(to_delete):
-                self.ws_tasks.delete_rows(idx)
+            self._delete_records([project_id], [])
+
+    def _delete_records(self, project_ids, task_ids):
+        """
+        Löscht Projekte samt ihrer Tasks sowie einzelne Tasks (Lock muss gehalten werden).
+        Pro Arbeitsblatt genügt ein batch_update, unabhängig von der Anzahl der Zeilen.
+        """
+        project_ids = set(project_ids)
+        task_ids = set(task_ids)
+        if project_ids:
+            self._delete_rows_batch(self.ws_projects, project_ids)
+        if not project_ids and not task_ids:
+            return
+        # ID- und project_id-Spalte in einem Request lesen (nicht das ganze Sheet)
+        ids = None
+        if project_ids:
+            title = self.ws_tasks.title
+            value_ranges = self.sh.values_batch_get([f"'{title}'!A2:A", f"'{title}'!B2:B"]).get("valueRanges", [])
+            ids = [row[0] if row else "" for row in value_ranges[0].get("values", [])]
+            owners = [row[0] if row else "" for row in value_ranges[1].get("values", [])]
+            owners += [""] * (len(ids) - len(owners))
+            task_ids |= {tid for tid, pid in zip(ids, owners) if tid and pid in project_ids}
+        self._delete_rows_batch(self.ws_tasks, task_ids, ids)
 
     def upsert_task(self, task):
         """Fügt einen Task hinzu oder aktualisiert ihn."""
-        with self.lock:
-            all_rows = self.ws_tasks.get_all_records()
-            row_idx = None
-            for i, r in enumerate(all_rows, start=2):
-                if r.get("task_id") == task["task_id"]:
-                    row_idx = i
-                    break
-            # Handle assignee as either string or list - save as comma-separated string
-            assignee_data = task.get("assignee", "")
-            if isinstance(assignee_data, list):
-                # Join multiple assignees with comma and space
-                assignee_str = ", ".join(assignee_data) if assignee_data else ""
-            else:
-                assignee_str = str(assignee_data) if assignee_data else ""
-            
-            vals = [
-                task.get("task_id", ""),
-                task.get("project_id", ""),
-                task.get("name", ""),
-                task.get("goal", ""),
-                task.get("description", ""),
-                task.get("attention", ""),
-                assignee_str,
-                task.get("checklist_json", "[]"),
-                task.get("last_update", now_iso())
-            ]
-            if row_idx:
-                self.ws_tasks.update(values=[vals], range_name=f"A{row_idx}:I{row_idx}")
-            else:
-                self.ws_tasks.append_row(vals)
+        self.apply_writes(tasks=[task])
 
     def delete_task(self, task_id):
         """Löscht einen Task."""
         with self.lock:
-            all_rows = self.ws_tasks.get_all_records()
-            for i, r in enumerate(all_rows, start=2):
-                if r.get("task_id") == task_id:
-                    self.ws_tasks.delete_rows(i)
-                    break
+            self._delete_rows_batch(self.ws_tasks, [task_id])
+
+    def compact_tombstones(self, max_age_days=config.TOMBSTONE_MAX_AGE_DAYS):
+        """
+        Entfernt Tombstones, die älter als max_age_days sind, physisch aus beiden Blättern
+        (ein batch_update pro Blatt). Tasks gelöschter Projekte werden mit entfernt.
+        Gibt die Anzahl entfernter Zeilen (projekte, tasks) zurück.
+        """
+        cutoff = tombstone_cutoff(max_age_days)
+        with self.lock:
+            columns = {}
+            ranges = []
+            for ws, headers, names in ((self.ws_projects, PROJECT_HEADERS, ("project_id", "last_update")),
+                                       (self.ws_tasks, TASK_HEADERS, ("task_id", "project_id", "last_update"))):
+                for name in names:
+                    col = self._col_letter(headers.index(name) + 1)
+                    columns[(ws.title, name)] = len(ranges)
+                    ranges.append(f"'{ws.title}'!{col}2:{col}")
+            value_ranges = self.sh.values_batch_get(ranges).get("valueRanges", [])
+
+            def column(ws, name):
+                return [row[0] if row else "" for row in value_ranges[columns[(ws.title, name)]].get("values", [])]
+
+            def expired(ws, id_name):
+                ids = column(ws, id_name)
+                updates = [split_last_update(value) for value in column(ws, "last_update")]
+                updates += [("", False)] * (len(ids) - len(updates))
+                return ids, {rid for rid, (upd, deleted) in zip(ids, updates)
+                             if rid and deleted and upd < cutoff}
+
+            project_ids, project_tombstones = expired(self.ws_projects, "project_id")
+            task_ids, task_tombstones = expired(self.ws_tasks, "task_id")
+            owners = column(self.ws_tasks, "project_id")
+            task_tombstones |= {tid for tid, pid in zip(task_ids, owners) if tid and pid in project_tombstones}
+
+            self._delete_rows_batch(self.ws_projects, project_tombstones, project_ids)
+            self._delete_rows_batch(self.ws_tasks, task_tombstones, task_ids)
+        return len(project_tombstones), len(task_tombstones)
+
+    def apply_writes(self, projects=(), tasks=(), task_deletes=(), project_deletes=()):
+        """
+        Schreibt einen gesammelten Satz von Änderungen mit möglichst wenigen Requests:
+        Löschungen zuerst, dann alle bekannten Zeilen in einem values_batch_update
+        und neue Zeilen per append_rows (ein Request pro Arbeitsblatt).
+        Die Zielzeilen werden vorher aus der ID-Spalte bestimmt (ein Request für beide
+        Blätter): Hat ein anderer Client Zeilen gelöscht oder kompaktiert, würde der
+        gecachte Index sonst fremde Zeilen überschreiben. Nicht mehr gefundene IDs
+        werden angehängt.
+        """
+        with self.lock:
+            self._delete_records(project_deletes, task_deletes)
+            self._refresh_ids([ws for ws, records in ((self.ws_projects, projects), (self.ws_tasks, tasks)) if records])
+
+            data, written = [], []
+            new_projects, new_tasks = [], []
+            for project in projects:
+                row_idx = self._find_row(self.ws_projects, project["project_id"])
+                if row_idx:
+                    vals = self._project_values(project)
+                    data.append({"range": f"'{self.ws_projects.title}'!{self._record_range(row_idx, PROJECT_HEADERS)}", "values": [vals]})
+                    written.append((self.ws_projects, project["project_id"], vals))
+                else:
+                    new_projects.append(project)
+            for task in tasks:
+                row_idx = self._find_row(self.ws_tasks, task["task_id"])
+                if row_idx:
+                    vals, ranges = self._task_ranges(task, row_idx)
+                    data += [{"range": f"'{self.ws_tasks.title}'!{range_name}", "values": [values]}
+                             for range_name, values in ranges]
+                    written.append((self.ws_tasks, task["task_id"], vals))
+                else:
+                    new_tasks.append(task)
+
+            if data:
+                self.sh.values_batch_update({"valueInputOption": "RAW", "data": data})
+                for ws, record_id, vals in written:
+                    self._mark_written(ws, record_id, vals)
+            if new_projects:
+                self._append_rows_indexed(self.ws_projects, [p["project_id"] for p in new_projects],
+                                          [self._project_values(p) for p in new_projects])
+            if new_tasks:
+                self._append_rows_indexed(self.ws_tasks, [t["task_id"] for t in new_tasks],
+                                          [self._task_values(t) for t in new_tasks])
+
+class WriteQueue:
+    """
+    Write-Behind-Puffer zwischen Model und SheetsBackend.
+    Sammelt Änderungen, fasst mehrere Edits derselben ID zusammen und schreibt sie
+    in einem Hintergrund-Thread gebündelt pro Intervall. Fehlgeschlagene Flushes
+    werden mit exponentiellem Backoff wiederholt.
+    """
+    def __init__(self, backend, interval=config.DEFAULT_WRITE_FLUSH_SECONDS):
+        self.backend = backend
+        self.interval = max(0.5, float(interval))
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # verhindert parallele Flushes (Reihenfolge bleibt erhalten)
+        self.pending_projects = {}      # project_id -> dict (Kopie)
+        self.pending_tasks = {}         # task_id -> dict (Kopie)
+        self.deleted_tasks = set()
+        self.deleted_projects = set()
+        self.failures = 0
+        self.next_attempt = 0
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.on_flushed = None  # optionaler Callback nach erfolgreichem Flush (Hintergrund-Thread)
+
+    def set_interval(self, interval):
+        """Ändert das Flush-Intervall (z.B. nach einer Einstellungsänderung)."""
+        self.interval = max(0.5, float(interval))
+        self.wakeup.set()
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def upsert_project(self, project):
+        with self.lock:
+            self.pending_projects[project["project_id"]] = dict(project)
+            self.deleted_projects.discard(project["project_id"])
+        self._ensure_thread()
+
+    def upsert_task(self, task):
+        task = dict(task)
+        if isinstance(task.get("assignee"), list):
+            task["assignee"] = list(task["assignee"])
+        with self.lock:
+            self.pending_tasks[task["task_id"]] = task
+            self.deleted_tasks.discard(task["task_id"])
+        self._ensure_thread()
+
+    def delete_task(self, task_id):
+        with self.lock:
+            self.pending_tasks.pop(task_id, None)
+            self.deleted_tasks.add(task_id)
+        self._ensure_thread()
+
+    def delete_project(self, project_id, task_ids=()):
+        with self.lock:
+            self.pending_projects.pop(project_id, None)
+            for task_id in task_ids:
+                self.pending_tasks.pop(task_id, None)
+                self.deleted_tasks.discard(task_id)
+            self.deleted_projects.add(project_id)
+        self._ensure_thread()
+
+    def is_deleted(self, record_id):
+        """Gibt zurück, ob für die ID eine noch nicht geschriebene Löschung (oder ein Tombstone) aussteht."""
+        with self.lock:
+            if record_id in self.deleted_tasks or record_id in self.deleted_projects:
+                return True
+            pending = self.pending_tasks.get(record_id) or self.pending_projects.get(record_id)
+            return bool(pending) and is_tombstone(pending)
+
+    def is_pending(self, record_id):
+        """Gibt zurück, ob für die ID noch ein Schreibvorgang (Upsert oder Löschung) aussteht."""
+        with self.lock:
+            return (record_id in self.pending_tasks or record_id in self.pending_projects
+                    or record_id in self.deleted_tasks or record_id in self.deleted_projects)
+
+    def export_pending(self):
+        """Gibt eine serialisierbare Kopie der ausstehenden Änderungen zurück."""
+        with self.lock:
+            return {
+                "projects": list(self.pending_projects.values()),
+                "tasks": list(self.pending_tasks.values()),
+                "deleted_tasks": sorted(self.deleted_tasks),
+                "deleted_projects": sorted(self.deleted_projects),
+            }
+
+    def take_pending(self):
+        """
+        Stoppt den Puffer und übergibt seine ausstehenden Änderungen (z.B. an einen neuen
+        WriteQueue). Wartet auf einen laufenden Flush: dessen Records sind schon aus dem
+        Puffer genommen und liegen nach einem Fehlschlag erst danach wieder darin.
+        """
+        with self.flush_lock:
+            self.stop(flush=False)
+            pending = self.export_pending()
+            with self.lock:
+                self.pending_projects, self.pending_tasks = {}, {}
+                self.deleted_tasks, self.deleted_projects = set(), set()
+        return pending
+
+    def import_pending(self, pending):
+        """Übernimmt ausstehende Änderungen (z.B. aus dem lokalen Snapshot)."""
+        with self.lock:
+            for p in pending.get("projects", []):
+                self.pending_projects.setdefault(p["project_id"], p)
+            for t in pending.get("tasks", []):
+                self.pending_tasks.setdefault(t["task_id"], t)
+            self.deleted_tasks.update(pending.get("deleted_tasks", []))
+            self.deleted_projects.update(pending.get("deleted_projects", []))
+            has_pending = bool(self.pending_projects or self.pending_tasks or
+                               self.deleted_tasks or self.deleted_projects)
+        if has_pending:
+            self._ensure_thread()
+
+    def has_pending(self):
+        with self.lock:
+            return bool(self.pending_projects or self.pending_tasks or
+                        self.deleted_tasks or self.deleted_projects)
+
+    def flush(self):
+        """Schreibt alle ausstehenden Änderungen. Gibt False zurück, wenn der Flush fehlschlug."""
+        with self.flush_lock:
+            return self._flush()
+
+    def _flush(self):
+        if not self.backend.is_connected():
+            return False
+        with self.lock:
+            projects, self.pending_projects = self.pending_projects, {}
+            tasks, self.pending_tasks = self.pending_tasks, {}
+            task_deletes, self.deleted_tasks = self.deleted_tasks, set()
+            project_deletes, self.deleted_projects = self.deleted_projects, set()
+        if not (projects or tasks or task_deletes or project_deletes):
+            return True
+        try:
+            self.backend.apply_writes(list(projects.values()), list(tasks.values()),
+                                      list(task_deletes), list(project_deletes))
+        except Exception as e:
+            # Zurücklegen, ohne neuere Änderungen aus der Zwischenzeit zu überschreiben
+            with self.lock:
+                for pid, p in projects.items():
+                    if pid not in self.deleted_projects:
+                        self.pending_projects.setdefault(pid, p)
+                for tid, t in tasks.items():
+                    if tid not in self.deleted_tasks:
+                        self.pending_tasks.setdefault(tid, t)
+                self.deleted_tasks |= {tid for tid in task_deletes if tid not in self.pending_tasks}
+                self.deleted_projects |= {pid for pid in project_deletes if pid not in self.pending_projects}
+                self.failures += 1
+                delay = min(WRITE_MAX_BACKOFF, self.interval * (2 ** self.failures))
+                delay = max(delay, retry_after_seconds(e) or 0)
+                self.next_attempt = time.time() + delay
+            print(f"Write flush failed (retry in {delay:.0f}s): {e}")
+            return False
+        with self.lock:
+            self.failures = 0
+            self.next_attempt = 0
+        if self.on_flushed:
+            self.on_flushed()
+        return True
+
+    def _run(self):
+        while not self.stopped.is_set():
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            if self.stopped.is_set() or time.time() < self.next_attempt:
+                continue
+            self.flush()
+
+    def stop(self, flush=True):
+        """Stoppt den Hintergrund-Thread und schreibt optional ausstehende Änderungen."""
+        self.stopped.set()
+        self.wakeup.set()
+        if flush:
+            self.flush()
+
+class SyncScheduler:
+    """
+    Berechnet das Intervall bis zum nächsten Sync. Nach Änderungen wird schnell
+    abgefragt, ohne Änderungen wächst das Intervall exponentiell bis poll_seconds
+    (bzw. SYNC_UNFOCUSED_MAX_SECONDS, wenn das Fenster nicht fokussiert ist).
+    Jitter verhindert, dass mehrere Clients im Gleichschritt abfragen; nach einem
+    429 wird die Retry-After-Zeit eingehalten.
+    """
+    def __init__(self, poll_seconds=config.DEFAULT_POLL_SECONDS, rng=None):
+        self.rng = rng or random.Random()
+        self.poll_seconds = config.DEFAULT_POLL_SECONDS
+        self.set_poll_seconds(poll_seconds)
+        self.interval = config.SYNC_FAST_SECONDS
+        self.focused = True
+        self.blocked_until = 0  # Zeitpunkt (time.time()), vor dem nicht abgefragt werden darf
+
+    def set_poll_seconds(self, poll_seconds):
+        try:
+            self.poll_seconds = max(config.SYNC_FAST_SECONDS, float(poll_seconds))
+        except (TypeError, ValueError):
+            self.poll_seconds = config.DEFAULT_POLL_SECONDS
+
+    def _max_interval(self):
+        return self.poll_seconds if self.focused else max(self.poll_seconds, config.SYNC_UNFOCUSED_MAX_SECONDS)
+
+    def note_activity(self):
+        """Lokale oder entfernte Änderung: wieder schnell abfragen."""
+        self.interval = config.SYNC_FAST_SECONDS
+
+    def note_result(self, changed):
+        """Ergebnis eines Syncs: bei Änderungen schnell, sonst langsamer werden."""
+        if changed:
+            self.note_activity()
+        else:
+            self.interval = min(self._max_interval(), self.interval * config.SYNC_BACKOFF_FACTOR)
+
+    def note_error(self, error):
+        """Fehlgeschlagener Sync: zurückhaltender werden, bei 429 Retry-After einhalten."""
+        self.interval = min(self._max_interval(), self.interval * config.SYNC_BACKOFF_FACTOR)
+        wait = retry_after_seconds(error)
+        if wait is not None:
+            self.blocked_until = max(self.blocked_until, time.time() + wait)
+
+    def set_focused(self, focused):
+        """Gibt True zurück, wenn das Fenster gerade (wieder) fokussiert wurde."""
+        regained = focused and not self.focused
+        self.focused = focused
+        if regained:
+            self.note_activity()
+        return regained
+
+    def next_delay(self):
+        """Sekunden bis zum nächsten Sync (mit Jitter, frühestens nach Ablauf eines Rate-Limits)."""
+        interval = self.interval if self.focused else max(self.interval, self.poll_seconds)
+        delay = interval * self.rng.uniform(1 - config.SYNC_JITTER, 1 + config.SYNC_JITTER)
+        return max(delay, self.blocked_until - time.time())
+
+class LocalSnapshot:
+    """
+    Lokaler Snapshot von Projekten, Tasks und ausstehenden Schreibzugriffen als
+    kompakte JSON-Lines-Datei (eine Zeile pro Record). Ermöglicht einen sofortigen
+    Start ohne Netzwerk und Offline-Bearbeitung.
+    """
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, sheet_id):
+        """Lädt den Snapshot. Gibt None zurück, wenn keiner für dieses Sheet existiert."""
+        if not self.path or not os.path.exists(self.path):
+            return None
+        data = {"projects": [], "tasks": [],
+                "pending": {"projects": [], "tasks": [], "deleted_tasks": [], "deleted_projects": []}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                meta = json.loads(f.readline() or "{}")
+                if meta.get("version") != self.VERSION or meta.get("sheet_id") != sheet_id:
+                    return None
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Beschädigte Zeile überspringen
+                    kind, record = entry.get("type"), entry.get("data")
+                    if kind == "project":
+                        data["projects"].append(record)
+                    elif kind == "task":
+                        data["tasks"].append(record)
+                    elif kind == "pending":
+                        data["pending"] = record
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data
+
+    def save(self, sheet_id, projects, tasks, pending):
+        """Schreibt den Snapshot atomar (temporäre Datei + Umbenennen)."""
+        tmp_path = self.path + ".tmp"
+        dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(dumps({"version": self.VERSION, "sheet_id": sheet_id, "saved": now_iso()}) + "\n")
+            for p in projects:
+                f.write(dumps({"type": "project", "data": p}) + "\n")
+            for t in tasks:
+                f.write(dumps({"type": "task", "data": t}) + "\n")
+            f.write(dumps({"type": "pending", "data": pending}) + "\n")
+        os.replace(tmp_path, self.path)
+
+class AsyncBackend:
+    """
+    Fassade, die blockierende Sheets-Aufrufe in einem Executor ausführt.
+
+    submit() gibt ein Future zurück; Erfolgs- und Fehler-Callbacks werden nicht im
+    Worker, sondern über eine einzige after()-Pumpe im Tk-Thread aufgerufen. Damit
+    bleibt das Model ausschließlich im Tk-Thread - Worker holen nur Daten.
+    """
+    def __init__(self, backend, master, max_workers=1):
+        self.backend = backend
+        self.master = master
+        # Ein Worker serialisiert alle Sheets-Aufrufe, Dateizugriffe laufen separat
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheets")
+        self.disk_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk")
+        self.results = queue.Queue()
+        self.outstanding = 0  # Jobs, deren Callbacks noch ausstehen
+        self.pump_job = None
+        self.closed = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None):
+        """Führt fn(*args) im Hintergrund aus und meldet das Ergebnis im Tk-Thread (nur aus dem Tk-Thread aufrufen)."""
+        future = self.executor.submit(fn, *args)
+        if on_done or on_error:
+            self.outstanding += 1
+            future.add_done_callback(lambda f: self.results.put((f, on_done, on_error)))
+            self._ensure_pump()
+        return future
+
+    def connect(self, on_done=None, on_error=None):
+        return self.submit(self.backend.connect, on_done=on_done, on_error=on_error)
+
+    def write_file(self, fn, *args):
+        """Führt einen Dateizugriff (z.B. Snapshot) im Hintergrund aus, nacheinander und ohne Callback."""
+        return self.disk_executor.submit(fn, *args)
+
+    def wait_for_disk(self):
+        """Wartet auf alle ausstehenden Dateizugriffe; danach werden keine neuen mehr angenommen."""
+        self.disk_executor.shutdown(wait=True)
+
+    def _ensure_pump(self):
+        # Worker legen Ergebnisse nur in die Queue, die Pumpe läuft im Tk-Thread
+        if self.pump_job is None and not self.closed:
+            self.pump_job = self.master.after(ASYNC_PUMP_MS, self._pump)
+
+    def _pump(self):
+        self.pump_job = None
+        while True:
+            try:
+                future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.outstanding -= 1
+            error = future.exception()
+            try:
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+                else:
+                    print(f"Background job failed: {error}")
+            except Exception as e:
+                print(f"Callback failed: {e}")
+        # Nur weiterlaufen, solange noch Ergebnisse erwartet werden
+        if self.outstanding > 0 and not self.closed:
+            self.pump_job = self.master.after(ASYNC_PUMP_MS, self._pump)
+
+    def shutdown(self, wait=False):
+        """Beendet die Pumpe und den Executor (laufende Jobs dürfen auslaufen)."""
+        self.closed = True
+        if self.pump_job:
+            self.master.after_cancel(self.pump_job)
+            self.pump_job = None
+        self.executor.shutdown(wait=wait)
+        self.disk_executor.shutdown(wait=wait)
 
 class Model:
     """
     Verwaltet den In-Memory-Datenzustand und die Synchronisation mit dem Backend.
+
+    Thread-Zuordnung: Das Model gehört dem Tk-Thread. Hintergrund-Threads rufen nur
+    fetch_remote() auf (liest ausschließlich das Backend) und der WriteQueue-Thread
+    arbeitet auf eigenen Kopien. Übernommen werden Daten mit apply_remote()/apply_full()
+    im Tk-Thread.
     """
-    def __init__(self, backend):
+    def __init__(self, backend, snapshot_path=None):
         self.backend = backend
-        self.projects = {}  # project_id -> dict
-        self.tasks = {}     # task_id -> dict
+        self.projects = {}  # project_id -> Project
+        self.tasks = {}     # task_id -> Task (mit geparster Checkliste)
         self.tasks_by_project = {}  # project_id -> set(task_ids)
+        self.project_stats = {}  # project_id -> Aggregat (Task-Anzahl, ToDos, Deadline, Priorität)
+        self.task_contrib = {}  # task_id -> (project_id, ToDos gesamt, ToDos erledigt)
+        self.tombstones = {}  # project_id/task_id -> last_update der Löschung
+        # Schreibzugriffe laufen gebündelt über den Write-Behind-Puffer
+        self.writer = WriteQueue(backend, backend.config.get("write_flush_seconds",
+                                                             config.DEFAULT_WRITE_FLUSH_SECONDS))
+        # Lokaler Snapshot für Kaltstart und Offline-Betrieb
+        self.snapshot = LocalSnapshot(snapshot_path) if snapshot_path else None
+        self.snapshot_dirty = False
+        self.writer.on_flushed = self._mark_dirty
+        self.on_local_change = None  # optionaler Callback nach lokalen Änderungen (Tk-Thread)
 
-    def load_all(self):
-        """Lädt alle Daten aus dem Backend."""
+    def _mark_dirty(self):
+        self.snapshot_dirty = True
+
+    def _local_change(self):
+        """Nach jeder lokalen Änderung: Snapshot vormerken und Beobachter (Sync-Planung) informieren."""
+        self.snapshot_dirty = True
+        if self.on_local_change:
+            self.on_local_change()
+
+    @staticmethod
+    def _checklist_entry(task):
+        # Tasks des Models cachen ihre geparste Checkliste selbst (neu geparst nur bei geändertem Rohtext)
+        if isinstance(task, Task):
+            return task.checklist_entry()
+        raw = task.get("checklist_json", "[]")
+        items = parse_checklist(raw)
+        return raw, items, checklist_stats(items)
+
+    @staticmethod
+    def _reuse(store, record_id, data, record_type):
+        """Aktualisiert einen vorhandenen Record in place oder legt einen neuen an."""
+        record = store.get(record_id)
+        if record is None:
+            return record_type(data)
+        if record is not data:
+            record.assign(data)
+        return record
+
+    def get_checklist(self, task):
+        """Gibt die geparsten To-Do-Items eines Tasks zurück (gecacht)."""
+        return self._checklist_entry(task)[1]
+
+    def get_checklist_stats(self, task):
+        """Gibt {'total', 'done', 'percent'} der Checkliste eines Tasks zurück (gecacht)."""
+        return self._checklist_entry(task)[2]
+
+    # ---------- Projekt-Aggregate ----------
+    def _project_entry(self, project_id):
+        entry = self.project_stats.get(project_id)
+        if entry is None:
+            entry = self.project_stats[project_id] = {
+                "task_count": 0, "todo_total": 0, "todo_done": 0,
+                "deadline_date": None, "priority": 1
+            }
+        return entry
+
+    def _set_project_deadline(self, project):
+        """Parst die Deadline eines Projekts einmal (YYYY-MM-DD)."""
+        entry = self._project_entry(project["project_id"])
+        try:
+            entry["deadline_date"] = datetime.strptime(project.get("deadline", ""), "%Y-%m-%d")
+        except (ValueError, TypeError):
+            entry["deadline_date"] = None
+
+    def _attach_task(self, task):
+        """Rechnet einen Task in das Aggregat seines Projekts ein."""
+        tid = task.get("task_id")
+        if not tid:
+            return
+        self._detach_task(tid)
+        stats = self.get_checklist_stats(task)
+        pid = task.get("project_id")
+        entry = self._project_entry(pid)
+        entry["task_count"] += 1
+        entry["todo_total"] += stats["total"]
+        entry["todo_done"] += stats["done"]
+        self.task_contrib[tid] = (pid, stats["total"], stats["done"])
+
+    def _detach_task(self, task_id):
+        """Nimmt den zuletzt eingerechneten Beitrag eines Tasks wieder heraus."""
+        contrib = self.task_contrib.pop(task_id, None)
+        if contrib is None:
+            return
+        pid, total, done = contrib
+        entry = self.project_stats.get(pid)
+        if entry:
+            entry["task_count"] -= 1
+            entry["todo_total"] -= total
+            entry["todo_done"] -= done
+
+    def _rank_projects(self):
+        """
+        Vergibt Prioritäten nach Deadline (1-5, 5 = nächste Deadline). Ab dem sechsten
+        Projekt wiederholen sich die Stufen, Projekte ohne Deadline erhalten 1.
+        """
+        priority_levels = [5, 4, 3, 2, 1]
+        dated = []
+        for order, pid in enumerate(self.projects):
+            entry = self._project_entry(pid)
+            if entry["deadline_date"] is None:
+                entry["priority"] = 1
+            else:
+                dated.append((entry["deadline_date"], order, entry))
+        dated.sort(key=lambda x: (x[0], x[1]))
+        for i, (_, _, entry) in enumerate(dated):
+            entry["priority"] = priority_levels[i % len(priority_levels)]
+
+    def _rebuild_project_stats(self):
+        """Baut alle Projekt-Aggregate neu auf (nach vollständigem Laden)."""
+        self.project_stats = {}
+        self.task_contrib = {}
+        for project in self.projects.values():
+            self._set_project_deadline(project)
+        for task in self.tasks.values():
+            self._attach_task(task)
+        self._rank_projects()
+
+    # ---------- Tombstones ----------
+    def _tombstone(self, record, id_key):
+        """Erzeugt die Tombstone-Kopie eines Records und merkt sich den Löschzeitpunkt."""
+        tombstone = dict(record, deleted=True, last_update=now_iso())
+        self.tombstones[record[id_key]] = tombstone["last_update"]
+        return tombstone
+
+    def _note_tombstone(self, record_id, last_update):
+        if (last_update or "") > self.tombstones.get(record_id, ""):
+            self.tombstones[record_id] = last_update
+
+    def _is_buried(self, record_id, last_update):
+        """True, wenn eine bekannte Löschung neuer ist als dieser Stand des Records."""
+        return record_id in self.tombstones and (last_update or "") <= self.tombstones[record_id]
+
+    def prune_tombstones(self, max_age_days=config.TOMBSTONE_MAX_AGE_DAYS):
+        """Vergisst Tombstones, die der Kompaktierer inzwischen aus dem Sheet entfernt hat."""
+        cutoff = tombstone_cutoff(max_age_days)
+        self.tombstones = {rid: ts for rid, ts in self.tombstones.items() if ts >= cutoff}
+
+    def _remove_task(self, task_id):
+        """Entfernt einen Task samt Cache und Aggregat aus dem Speicher."""
+        task = self.tasks.pop(task_id, None)
+        self._detach_task(task_id)
+        if task:
+            self.tasks_by_project.get(task["project_id"], set()).discard(task_id)
+        return task
+
+    def _remove_project(self, project_id):
+        """Entfernt ein Projekt und seine Tasks aus dem Speicher. Gibt die Tasks zurück."""
+        tasks = [self._remove_task(tid) for tid in list(self.tasks_by_project.get(project_id, set()))]
+        self.tasks_by_project.pop(project_id, None)
+        self.projects.pop(project_id, None)
+        self.project_stats.pop(project_id, None)
+        return [t for t in tasks if t]
+
+    def get_project_stats(self, project_id):
+        """
+        Gibt das Aggregat eines Projekts zurück: task_count, todo_total, todo_done,
+        completion_rate, workload, deadline_date, days_until und priority.
+        """
+        entry = self.project_stats.get(project_id)
+        if entry is None:
+            return {"task_count": 0, "todo_total": 0, "todo_done": 0, "completion_rate": 100,
+                    "workload": 0, "deadline_date": None, "days_until": None, "priority": 1}
+        stats = dict(entry)
+        total = entry["todo_total"]
+        stats["completion_rate"] = int((entry["todo_done"] / total) * 100) if total > 0 else 100
+        stats["workload"] = entry["task_count"] + total
+        deadline_date = entry["deadline_date"]
+        stats["days_until"] = (deadline_date - datetime.now()).days if deadline_date else None
+        return stats
+
+    def load_snapshot(self):
+        """Lädt den lokalen Snapshot. Gibt True zurück, wenn Daten geladen wurden."""
+        if not self.snapshot:
+            return False
+        data = self.snapshot.load(self.backend.config.get("sheet_id", ""))
+        if data is None:
+            return False
         self.projects.clear()
         self.tasks.clear()
         self.tasks_by_project.clear()
-        for p in self.backend.fetch_projects():
+        for p in data["projects"]:
+            self.projects[p["project_id"]] = Project(p)
+            self.tasks_by_project.setdefault(p["project_id"], set())
+        for t in data["tasks"]:
+            self.tasks[t["task_id"]] = Task(t)
+            self.tasks_by_project.setdefault(t["project_id"], set()).add(t["task_id"])
+        self._rebuild_project_stats()
+        self.writer.import_pending(data["pending"])
+        return True
+
+    def save_snapshot(self, run_in_background=None):
+        """
+        Schreibt den lokalen Snapshot inklusive ausstehender Schreibzugriffe.
+        Mit run_in_background (z.B. AsyncBackend.submit) wird nur die Datei im
+        Hintergrund geschrieben; die Daten werden vorher im Tk-Thread kopiert.
+        """
+        if not self.snapshot:
+            return
+        self.snapshot_dirty = False
+        args = (self.backend.config.get("sheet_id", ""),
+                [dict(p) for p in self.projects.values()], [dict(t) for t in self.tasks.values()],
+                self.writer.export_pending())
+        if run_in_background:
+            run_in_background(self._write_snapshot, *args)
+        else:
+            self._write_snapshot(*args)
+
+    def _write_snapshot(self, sheet_id, projects, tasks, pending):
+        try:
+            self.snapshot.save(sheet_id, projects, tasks, pending)
+        except OSError as e:
+            print(f"Snapshot konnte nicht gespeichert werden: {e}")
+
+    def load_all(self):
+        """Lädt alle Daten aus dem Backend (Tasks ohne Freitext-Felder)."""
+        self.apply_full(self.backend.fetch_projects(), self.backend.fetch_task_summaries())
+
+    def apply_full(self, remote_projects, remote_tasks):
+        """
+        Ersetzt den gesamten Zustand durch vollständig abgerufene Daten (Tk-Thread).
+        Bereits bekannte Records werden in place aktualisiert statt neu angelegt.
+        """
+        old_projects, old_tasks = self.projects, self.tasks
+        self.projects = {}
+        self.tasks = {}
+        self.tasks_by_project.clear()
+        for p in remote_projects:
+            if is_tombstone(p):
+                self._note_tombstone(p.get("project_id"), p.get("last_update", ""))
+                continue
             pid = p.get("project_id") or str(uuid4())
             p["project_id"] = pid
             p.setdefault("deadline", "")
-            self.projects[pid] = p
+            self.projects[pid] = self._reuse(old_projects, pid, p, Project)
             self.tasks_by_project.setdefault(pid, set())
-        for t in self.backend.fetch_tasks():
+        for t in remote_tasks:
+            if is_tombstone(t):
+                self._note_tombstone(t.get("task_id"), t.get("last_update", ""))
+                continue
+            if t.get("project_id") in self.tombstones and t.get("project_id") not in self.projects:
+                continue  # Task eines gelöschten Projekts
             tid = t.get("task_id") or str(uuid4())
             t["task_id"] = tid
-            self.tasks[tid] = t
+            self.tasks[tid] = self._reuse(old_tasks, tid, t, Task)
             self.tasks_by_project.setdefault(t["project_id"], set()).add(tid)
+        self._rebuild_project_stats()
+        self.snapshot_dirty = True
 
     def get_projects_list(self):
         """Gibt eine Liste aller Projekte zurück."""
@@ -225,85 +1307,207 @@ class Model:
     def new_project(self, name, color="#222222", deadline=""):
         """Erstellt ein neues Projekt."""
         pid = str(uuid4())
-        p = {
-            "project_id": pid,
-            "name": name,
-            "color": color or "#222222",
-            "deadline": deadline or "",
-            "last_update": now_iso()
-        }
+        p = Project(
+            project_id=pid,
+            name=name,
+            color=color or "#222222",
+            deadline=deadline or "",
+            last_update=now_iso()
+        )
         self.projects[pid] = p
         self.tasks_by_project[pid] = set()
-        self.backend.upsert_project(p)
+        self._set_project_deadline(p)
+        self._rank_projects()
+        self.writer.upsert_project(p)
+        self._local_change()
         return p
 
+    def save_project(self, project):
+        """Speichert ein Projekt (gelöschte Projekte werden nicht wiederbelebt)."""
+        if self._is_buried(project.get("project_id"), project.get("last_update")):
+            return
+        project["last_update"] = now_iso()
+        self._set_project_deadline(project)
+        self._rank_projects()
+        self.writer.upsert_project(project)
+        self._local_change()
+
     def delete_project(self, project_id):
         """Löscht ein Projekt und seine Tasks."""
         if project_id in self.projects:
             # Im Speicher entfernen
-            for tid in list(self.tasks_by_project.get(project_id, set())):
-                self.tasks.pop(tid, None)
-            self.tasks_by_project.pop(project_id, None)
-            self.projects.pop(project_id, None)
-            # Im Backend löschen
-            self.backend.delete_project(project_id)
+            project = self.projects[project_id]
+            tasks = self._remove_project(project_id)
+            self._rank_projects()
+            # Als Tombstones schreiben, damit andere Clients die Löschung per Merge übernehmen
+            self.writer.upsert_project(self._tombstone(project, "project_id"))
+            for t in tasks:
+                self.writer.upsert_task(self._tombstone(t, "task_id"))
+            self._local_change()
 
     def new_task(self, project_id, name="Neuer Task"):
         """Erstellt einen neuen Task."""
         tid = str(uuid4())
-        t = {
-            "task_id": tid,
-            "project_id": project_id,
-            "name": name,
-            "goal": "",
-            "description": "",
-            "attention": "",
-            "assignee": [],
-            "checklist_json": "[]",
-            "last_update": now_iso()
-        }
+        t = Task(
+            task_id=tid,
+            project_id=project_id,
+            name=name,
+            goal="",
+            description="",
+            attention="",
+            assignee=[],
+            checklist_json="[]",
+            last_update=now_iso()
+        )
         self.tasks[tid] = t
         self.tasks_by_project.setdefault(project_id, set()).add(tid)
-        self.backend.upsert_task(t)
+        self._attach_task(t)
+        self.writer.upsert_task(t)
+        self._local_change()
         return t
 
     def save_task(self, task):
-        """Speichert einen Task."""
+        """Speichert einen Task (gelöschte Tasks werden nicht wiederbelebt)."""
+        if self._is_buried(task.get("task_id"), task.get("last_update")):
+            return
         task["last_update"] = now_iso()
-        self.backend.upsert_task(task)
+        self._attach_task(task)
+        self.writer.upsert_task(task)
+        self._local_change()
 
     def delete_task(self, task_id):
         """Löscht einen Task."""
-        task = self.tasks.get(task_id)
+        task = self._remove_task(task_id)
         if not task:
             return
-        pid = task["project_id"]
-        self.tasks.pop(task_id, None)
-        if pid in self.tasks_by_project:
-            self.tasks_by_project[pid].discard(task_id)
-        self.backend.delete_task(task_id)
+        self.writer.upsert_task(self._tombstone(task, "task_id"))
+        self._local_change()
 
-    def merge_remote(self):
-        """Holt Remote-Änderungen und führt sie nach dem 'Last-Write-Wins'-Prinzip zusammen."""
-        remote_projects = {p["project_id"]: p for p in self.backend.fetch_projects()}
-        remote_tasks = {t["task_id"]: t for t in self.backend.fetch_tasks()}
+    def apply_task_body(self, task_id, body):
+        """Übernimmt nachgeladene Freitext-Felder in einen Task (Tk-Thread)."""
+        task = self.tasks.get(task_id)
+        if task is None or not body or has_task_body(task):
+            return task
+        task.update(body)
+        self.snapshot_dirty = True
+        return task
+
+    def flush_writes(self):
+        """Schreibt ausstehende Änderungen sofort (z.B. beim Beenden)."""
+        self.writer.stop(flush=True)
+
+    def merge_remote(self, delta=False):
+        """
+        Holt Remote-Änderungen und führt sie nach dem 'Last-Write-Wins'-Prinzip zusammen.
+        Mit delta=True werden nur seit dem letzten Abruf geänderte Zeilen geladen.
+        Gibt True zurück, wenn sich lokal etwas geändert hat.
+        """
+        remote_projects, remote_tasks = self.fetch_remote(delta)
+        return self.apply_remote(remote_projects, remote_tasks, delta)
+
+    def fetch_remote(self, delta=False):
+        """
+        Ruft Remote-Daten ab, ohne den Model-Zustand anzufassen (darf im Hintergrund laufen).
+        Gibt (projects, tasks) zurück - bei delta=True nur geänderte Zeilen. Tasks
+        enthalten keine Freitext-Felder; diese lädt der TaskEditor über fetch_task_body().
+        """
+        if delta:
+            return self.backend.fetch_changes()
+        return self.backend.fetch_projects(), self.backend.fetch_task_summaries()
+
+    def apply_remote(self, remote_projects, remote_tasks, delta=False):
+        """
+        Führt abgerufene Daten per 'Last-Write-Wins' zusammen (Tk-Thread). Tombstones
+        entfernen lokale Records, wenn sie neuer sind; ältere Stände gelöschter Records
+        werden ignoriert. Gibt True bei Änderungen zurück.
+        """
+        if delta and not remote_projects and not remote_tasks:
+            return False
+        changed = False
+        projects_changed = False
 
         # Projekte zusammenführen
-        for pid, r in remote_projects.items():
+        for r in remote_projects:
+            pid = r["project_id"]
+            if not pid or self.writer.is_deleted(pid):
+                continue
             l = self.projects.get(pid)
-            if not l or (r.get("last_update", "") or "") > (l.get("last_update", "") or ""):
-                self.projects[pid] = r
+            r_update = r.get("last_update", "") or ""
+            if is_tombstone(r):
+                if l and r_update <= (l.get("last_update", "") or ""):
+                    # Lokaler Stand ist neuer und bleibt - die Löschung gilt nicht mehr
+                    self.tombstones.pop(pid, None)
+                    continue
+                self._note_tombstone(pid, r_update)
+                if l:
+                    self._remove_project(pid)
+                    projects_changed = True
+                    changed = True
+                continue
+            if self._is_buried(pid, r_update):
+                continue
+            if not l or r_update > (l.get("last_update", "") or ""):
+                self.tombstones.pop(pid, None)
+                # Vorhandene Records in place aktualisieren (keine neuen Objekte pro Sync)
+                l = self.projects[pid] = self._reuse(self.projects, pid, r, Project)
                 self.tasks_by_project.setdefault(pid, set())
+                self._set_project_deadline(l)
+                projects_changed = True
+                changed = True
 
         # Tasks zusammenführen
-        for tid, r in remote_tasks.items():
+        for r in remote_tasks:
+            tid = r["task_id"]
+            if not tid or self.writer.is_deleted(tid) or self.writer.is_deleted(r.get("project_id")):
+                continue
             l = self.tasks.get(tid)
-            if not l or (r.get("last_update", "") or "") > (l.get("last_update", "") or ""):
-                self.tasks[tid] = r
-                self.tasks_by_project.setdefault(r["project_id"], set()).add(tid)
-
-        # tasks_by_project neu aufbauen, um Konsistenz zu gewährleisten
-        tbp = {}
-        for t in self.tasks.values():
-            tbp.setdefault(t["project_id"], set()).add(t["task_id"])
-        self.tasks_by_project = tbp
\ No newline at end of file
+            r_update = r.get("last_update", "") or ""
+            if is_tombstone(r):
+                if l and r_update <= (l.get("last_update", "") or ""):
+                    # Lokaler Stand ist neuer und bleibt - die Löschung gilt nicht mehr
+                    self.tombstones.pop(tid, None)
+                    continue
+                self._note_tombstone(tid, r_update)
+                if l:
+                    self._remove_task(tid)
+                    changed = True
+                continue
+            if self._is_buried(tid, r_update):
+                continue
+            if r["project_id"] not in self.projects and r["project_id"] in self.tombstones:
+                continue  # Task eines gelöschten Projekts
+            if not l or r_update > (l.get("last_update", "") or ""):
+                self.tombstones.pop(tid, None)
+                # Bei Projektwechsel aus der alten Zuordnung entfernen
+                if l and l.get("project_id") != r["project_id"]:
+                    self.tasks_by_project.get(l.get("project_id"), set()).discard(tid)
+                l = self.tasks[tid] = self._reuse(self.tasks, tid, r, Task)
+                self.tasks_by_project.setdefault(l["project_id"], set()).add(tid)
+                if delta:
+                    self._attach_task(l)
+                changed = True
+
+        if not delta:
+            # Vollständiger Abruf: Records, die im Sheet nicht mehr existieren (z.B. kompaktierte
+            # Tombstones oder von älteren Clients gelöschte Zeilen), auch lokal entfernen -
+            # außer für sie steht noch ein eigener Schreibvorgang aus
+            remote_tids = {r["task_id"] for r in remote_tasks}
+            for tid in [tid for tid in self.tasks if tid not in remote_tids and not self.writer.is_pending(tid)]:
+                self._remove_task(tid)
+                changed = True
+            remote_pids = {r["project_id"] for r in remote_projects}
+            for pid in [pid for pid in self.projects if pid not in remote_pids and not self.writer.is_pending(pid)]:
+                if not any(self.writer.is_pending(tid) for tid in self.tasks_by_project.get(pid, ())):
+                    self._remove_project(pid)
+                    changed = True
+            # tasks_by_project neu aufbauen, um Konsistenz zu gewährleisten
+            tbp = {pid: set() for pid in self.projects}
+            for t in self.tasks.values():
+                tbp.setdefault(t["project_id"], set()).add(t["task_id"])
+            self.tasks_by_project = tbp
+            self._rebuild_project_stats()
+        elif projects_changed:
+            self._rank_projects()
+        if changed:
+            self.snapshot_dirty = True
+        return changed
@@ -14,7 +14,20 @@ except ImportError:
     TTKBOOTSTRAP_AVAILABLE = False
 
 CONFIG_FILE = "cowork_config.json"
-DEFAULT_POLL_SECONDS = 5
+CACHE_FILE = "cowork_cache.jsonl"  # Lokaler Snapshot für Kaltstart/Offline-Betrieb
+SNAPSHOT_SAVE_MS = 5000
+DEFAULT_POLL_SECONDS = 5  # Längstes Sync-Intervall bei fokussiertem Fenster ohne Änderungen
+SYNC_FAST_SECONDS = 1.5  # Sync-Intervall direkt nach lokalen oder entfernten Änderungen
+SYNC_BACKOFF_FACTOR = 1.6
+SYNC_UNFOCUSED_MAX_SECONDS = 60  # Längstes Intervall bei minimiertem/inaktivem Fenster
+SYNC_JITTER = 0.2  # ±20 %, damit mehrere Clients nicht im Gleichschritt abfragen
+RATE_LIMIT_DEFAULT_SECONDS = 30  # Wartezeit nach 429 ohne Retry-After
+DEFAULT_WRITE_FLUSH_SECONDS = 2
+TOMBSTONE_MAX_AGE_DAYS = 7  # Gelöschte Records so lange als Tombstone im Sheet behalten
+TOMBSTONE_COMPACT_MS = 60 * 60 * 1000  # Intervall des Tombstone-Kompaktierers
+TOOLTIP_DELAY_MS = 350  # Hover-Verzögerung, bevor ein Tooltip erscheint
+LOD_FULL_ZOOM = 0.6  # Ab diesem Zoom: alle Details (Halos, Schatten, Asteroiden, Fortschrittstext)
+LOD_MID_ZOOM = 0.4  # Darunter nur noch flache Kreise ohne Text
 
 USERS = ["Ricky", "Zimba", "Drez", "Moe", "Unzugewiesen"]
 ASSIGNEE_COLORS = {
@@ -44,6 +57,8 @@ def load_config():
         "service_account_json": "",
         "current_user": "",
         "poll_seconds": DEFAULT_POLL_SECONDS,
+        "write_flush_seconds": DEFAULT_WRITE_FLUSH_SECONDS,
+        "sync_mode": "delta",  # "delta" (nur geänderte Zeilen) oder "full"
         # UI Enhancement Flags
         "ui": {
             "enable_galaxy_bg": False,
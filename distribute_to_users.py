@@ -26,6 +26,8 @@ def main():
         "backend.py",
         "config.py",
         "utils.py",
+        "layout_engine.py",
+        "records.py",
         "update_manager.py",
         "update_script.py",
         "install_for_users.py",
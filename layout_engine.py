@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministische Layout-Engine für die Bubble-Ansicht.
+
+Ersetzt die zufällige Platzierung durch eine iterative Relaxation: jede Bubble
+wird zu ihrem Ring (Rang nach offenen To-dos und Fortschritt) gezogen und von ihren
+Nachbarn weggedrückt. Startwerte kommen aus dem letzten Layout (Warmstart),
+neue Bubbles erhalten eine aus ihrer ID abgeleitete Startposition.
+"""
+
+import math
+import random
+import zlib
+
+from utils import SpatialHash
+
+# Bevorzugte Distanz zur Mitte nach Rang: (Ränge bis ausschließlich, Distanz)
+RANK_BANDS = [(1, 40), (4, 100), (8, 170), (12, 260), (None, 410)]
+# Zusätzlicher Abstand zwischen Ringen und Nachbarn, damit das System zur Ruhe kommt
+RING_SLACK = 1.05
+
+
+def band_distance(rank):
+    """Bevorzugte Distanz zur Mitte für einen Rang (0 = wichtigste Bubble)."""
+    for limit, distance in RANK_BANDS:
+        if limit is None or rank < limit:
+            return distance
+    return RANK_BANDS[-1][1]
+
+
+class ForceLayout:
+    """Seeded Force-Directed-Layout mit Warmstart pro Ansicht (scope)."""
+    def __init__(self, seed=0, max_iterations=200, epsilon=0.5, spring=0.2, damping=0.5):
+        self.seed = seed
+        self.max_iterations = max_iterations
+        self.epsilon = epsilon  # Konvergenz: größte Bewegung pro Iteration in Pixeln
+        self.spring = spring
+        self.damping = damping
+        self.previous = {}  # {scope: {key: (dx, dy)}} relativ zur Mitte
+        self.last_iterations = 0
+
+    def _rng(self, key):
+        """Deterministischer Zufallsgenerator pro Schlüssel (unabhängig von PYTHONHASHSEED)."""
+        return random.Random(zlib.crc32(f"{self.seed}:{key}".encode("utf-8")))
+
+    def forget(self, scope=None):
+        """Verwirft gespeicherte Layouts (alle oder einer Ansicht)."""
+        if scope is None:
+            self.previous.clear()
+        else:
+            self.previous.pop(scope, None)
+
+    def _ring_targets(self, ranked_keys, min_distance):
+        """
+        Weist jedem Rang einen Ring zu. Ein Ring fasst nur so viele Bubbles, wie auf
+        seinen Umfang passen - weitere wandern auf den nächsten Ring nach außen.
+        """
+        spacing = min_distance * RING_SLACK
+        targets = {}
+        slots = {}
+        ring = 0
+        used = 0
+        for rank, key in enumerate(ranked_keys):
+            preferred = band_distance(rank)
+            if preferred > ring:
+                ring, used = preferred, 0
+            if used >= self._ring_capacity(ring, spacing):
+                ring, used = ring + spacing, 0
+            targets[key] = ring
+            slots[key] = used
+            used += 1
+        return targets, slots
+
+    @staticmethod
+    def _ring_capacity(ring, spacing):
+        """Anzahl Bubbles, deren Sehnenabstand auf dem Ring mindestens spacing beträgt."""
+        if spacing >= 2 * ring:
+            return 1
+        return max(1, int(math.pi / math.asin(spacing / (2 * ring))))
+
+    def layout(self, scope, items, center_x, center_y, min_distance):
+        """
+        Berechnet Positionen für items = [(key, open_todos, progress), ...].
+        Mehr offene To-dos = näher zur Mitte, bei Gleichstand liegt der Task mit dem
+        geringeren Fortschritt (Prozent) weiter innen.
+        Gibt die Positionen in der Reihenfolge von items zurück.
+        """
+        if not items:
+            return []
+
+        ranked = sorted(items, key=lambda item: (-item[1], item[2], str(item[0])))
+        targets, slots = self._ring_targets([key for key, _, _ in ranked], min_distance)
+        spacing = min_distance * RING_SLACK
+
+        previous = self.previous.get(scope, {})
+        positions = {}
+        for key, _, _ in items:
+            if key in previous:
+                positions[key] = list(previous[key])
+            elif previous:
+                # Neue Bubble in einem bestehenden Layout: ID-basierter Winkel auf ihrem Ring
+                angle = self._rng(key).uniform(0, 2 * math.pi)
+                positions[key] = [targets[key] * math.cos(angle), targets[key] * math.sin(angle)]
+            else:
+                # Kaltstart: Bubbles gleichmäßig auf ihre Ringe verteilen
+                capacity = self._ring_capacity(targets[key], spacing)
+                angle = self._rng(targets[key]).uniform(0, 2 * math.pi) + 2 * math.pi * slots[key] / capacity
+                positions[key] = [targets[key] * math.cos(angle), targets[key] * math.sin(angle)]
+
+        keys = [key for key, _, _ in items]
+        grid = SpatialHash(min_distance)
+        min_distance_sq = min_distance * min_distance
+
+        iteration = 0
+        for iteration in range(1, self.max_iterations + 1):
+            grid.clear()
+            for index, key in enumerate(keys):
+                grid.insert(index, *positions[key])
+
+            moves = [[0.0, 0.0] for _ in keys]
+            for index, key in enumerate(keys):
+                x, y = positions[key]
+
+                # Feder zum bevorzugten Ring
+                distance = math.hypot(x, y)
+                if distance > 1e-6:
+                    pull = (targets[key] - distance) * self.spring
+                    moves[index][0] += x / distance * pull
+                    moves[index][1] += y / distance * pull
+                elif targets[key] > 0:
+                    angle = self._rng(key).uniform(0, 2 * math.pi)
+                    moves[index][0] += math.cos(angle) * targets[key] * self.spring
+                    moves[index][1] += math.sin(angle) * targets[key] * self.spring
+
+                # Abstoßung nur zu Nachbarn aus dem räumlichen Index
+                for other in grid.candidates(x, y, min_distance):
+                    if other <= index:
+                        continue
+                    ox, oy = positions[keys[other]]
+                    dist_sq = (x - ox) ** 2 + (y - oy) ** 2
+                    if dist_sq >= min_distance_sq:
+                        continue
+                    dist = math.sqrt(dist_sq)
+                    if dist > 1e-6:
+                        ux, uy = (x - ox) / dist, (y - oy) / dist
+                    else:
+                        angle = self._rng((key, keys[other])).uniform(0, 2 * math.pi)
+                        ux, uy = math.cos(angle), math.sin(angle)
+                    push = (min_distance - dist) / 2
+                    moves[index][0] += ux * push
+                    moves[index][1] += uy * push
+                    moves[other][0] -= ux * push
+                    moves[other][1] -= uy * push
+
+            largest = 0.0
+            for index, key in enumerate(keys):
+                mx, my = moves[index]
+                step = math.hypot(mx, my)
+                if step > min_distance:
+                    # Einzelschritte begrenzen, damit das System nicht schwingt
+                    mx, my = mx / step * min_distance, my / step * min_distance
+                    step = min_distance
+                positions[key][0] += mx * self.damping
+                positions[key][1] += my * self.damping
+                largest = max(largest, step * self.damping)
+
+            if largest < self.epsilon:
+                break
+
+        self.last_iterations = iteration
+        # Ausgeblendete Bubbles (z.B. Fokus-Modus) behalten ihre letzte Position
+        self.previous[scope] = {**previous, **{key: tuple(positions[key]) for key in keys}}
+        return [(center_x + positions[key][0], center_y + positions[key][1]) for key in keys]
@@ -6,7 +6,6 @@ Haupt-Einstiegspunkt für das Coworking Projekte Tool.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-import time
 
 # Optionale UI-Bibliotheken
 try:
@@ -18,7 +17,7 @@ except ImportError:
 # Lokale Modul-Importe
 import config
 from utils import AnimationManager, generate_fallback_assets
-from backend import SheetsBackend, Model
+from backend import SheetsBackend, Model, AsyncBackend, SyncScheduler, GSPREAD_AVAILABLE
 from ui import BubbleCanvas, LegendWidget, MiniRadar, NewProjectDialog, TaskEditor, SettingsDialog
 from update_manager import UpdateManager
 
@@ -33,7 +32,10 @@ class App(tk.Tk):
 
         # Backend und Datenmodell initialisieren
         self.backend = SheetsBackend(self.config_data)
-        self.model = Model(self.backend)
+        self.model = Model(self.backend, config.CACHE_FILE)
+        self.model.on_local_change = self._on_local_change
+        # Sheets-Zugriffe laufen im Hintergrund, Ergebnisse kommen per after() zurück
+        self.async_backend = AsyncBackend(self.backend, self)
 
         # UI-Theme und -Stil anwenden
         self.configure(bg=config.get_color(self.config_data, "background", "#0f0f0f"))
@@ -42,6 +44,9 @@ class App(tk.Tk):
         # Fallback-Assets generieren
         generate_fallback_assets()
 
+        # Animations-Manager (gemeinsamer Frame-Scheduler für Canvas und Radar)
+        self.anim_manager = AnimationManager(self, self.config_data.get('ui', {}).get('animation_fps', 30))
+
         # UI-Elemente erstellen
         self._create_widgets()
 
@@ -49,13 +54,15 @@ class App(tk.Tk):
         self.mode = "projects"  # oder "tasks"
         self.current_project_id = None
 
-        # Synchronisations-Thread
-        self.sync_thread = None
+        # Synchronisation (Abruf im Hintergrund, Übernahme im Tk-Thread)
+        self.sync_job = None
+        self.sync_in_flight = False
+        # Adaptives Intervall: schnell nach Änderungen, langsam im Leerlauf/Hintergrund
+        self.sync_scheduler = SyncScheduler(self.config_data.get("poll_seconds", config.DEFAULT_POLL_SECONDS))
         self.stop_sync = threading.Event()
+        self.snapshot_job = None
+        self.compact_job = None
 
-        # Animations-Manager
-        self.anim_manager = AnimationManager(self, self.config_data.get('ui', {}).get('animation_fps', 30))
-        
         # Update-Manager
         self.update_manager = UpdateManager(self.config_data)
 
@@ -63,6 +70,9 @@ class App(tk.Tk):
         self.bind("<Escape>", self._toggle_focus_mode)
         self.bind("<KeyPress>", self._on_key_press)
         self.bind("<KeyRelease>", self._on_key_release)
+        # Fokus und Minimieren steuern das Sync-Intervall
+        for sequence in ("<FocusIn>", "<FocusOut>", "<Map>", "<Unmap>"):
+            self.bind(sequence, self._on_focus_change, add="+")
         
         # Pan-Modus für Canvas
         self.pan_mode = False
@@ -150,6 +160,7 @@ class App(tk.Tk):
         # Haupt-Canvas
         self.canvas = BubbleCanvas(self, self.config_data)
         self.canvas.model = self.model  # Model für ToDo-Berechnungen
+        self.canvas.anim_manager = self.anim_manager
         self.canvas.pack(fill="both", expand=True)
 
         # Legende
@@ -159,6 +170,8 @@ class App(tk.Tk):
 
         # Mini-Radar
         self.radar = MiniRadar(self, self.config_data)
+        self.radar.anim_manager = self.anim_manager
+        self.radar.model = self.model
         self.radar.place(relx=0.98, rely=0.02, anchor="ne")
         if not self.config_data.get('ui', {}).get('enable_radar', False):
             self.radar.place_forget()
@@ -170,30 +183,147 @@ class App(tk.Tk):
         self.add_btn.bind("<Leave>", lambda e: self.add_btn.config(bg="#333333"))
 
     def _connect_and_load(self):
-        try:
-            self.backend.connect()
-            self.status_label.config(text="● Online", fg="green")
-            self.model.load_all()
-        except Exception as e:
-            self.status_label.config(text="● Offline", fg="red")
-            messagebox.showwarning("Setup benötigt", f"Bitte Einstellungen prüfen.\n\n{e}")
+        # Sofort mit dem lokalen Snapshot starten, Sheets im Hintergrund abgleichen
+        has_snapshot = self.model.load_snapshot()
+        if has_snapshot:
+            self.status_label.config(text="● Lokal", fg="orange")
         self.show_projects()
+        model = self.model
+        self.async_backend.submit(self._connect_and_fetch, self.backend, model,
+                                  on_done=lambda data: self._on_connected(model, data, has_snapshot),
+                                  on_error=lambda e: self._on_connect_failed(model, e, has_snapshot))
+        self._schedule_snapshot_save()
+
+    def _connect_and_fetch(self, backend, model):
+        """Läuft im Hintergrund: verbindet und ruft alle Daten ab, ohne das Model zu verändern."""
+        backend.connect()
+        return model.fetch_remote()
+
+    def _on_connected(self, model, data, has_snapshot):
+        if model is not self.model:
+            return  # Einstellungen wurden inzwischen geändert
+        if has_snapshot:
+            # Lokale (ggf. offline gemachte) Änderungen bleiben per Last-Write-Wins erhalten
+            model.apply_remote(*data)
+        else:
+            model.apply_full(*data)
+        self.status_label.config(text="● Online", fg="green")
+        self._refresh_view()
         self._start_sync()
+        # Erste Kompaktierung kurz nach dem Start, danach im festen Intervall
+        self._schedule_compaction(60 * 1000)
+
+    def _on_connect_failed(self, model, error, has_snapshot):
+        if model is not self.model:
+            return
+        self.status_label.config(text="● Offline", fg="red")
+        if not GSPREAD_AVAILABLE:
+            # Einmal pro Verbindungsaufbau - die Sync-Versuche danach scheitern nur still
+            messagebox.showerror("Fehlende Abhängigkeit", "Bitte installiere gspread:\n\npip install gspread")
+        elif not has_snapshot:
+            messagebox.showwarning("Setup benötigt", f"Bitte Einstellungen prüfen.\n\n{error}")
+        # Offline weiterarbeiten, der Sync versucht regelmäßig neu zu verbinden
+        self._start_sync()
+
+    def _schedule_snapshot_save(self):
+        if self.snapshot_job:
+            self.after_cancel(self.snapshot_job)
+        if self.model.snapshot_dirty:
+            # Daten im Tk-Thread kopieren, Datei im Hintergrund schreiben
+            self.model.save_snapshot(self.async_backend.write_file)
+        self.snapshot_job = self.after(config.SNAPSHOT_SAVE_MS, self._schedule_snapshot_save)
+
+    def _schedule_compaction(self, delay_ms=config.TOMBSTONE_COMPACT_MS):
+        if self.compact_job:
+            self.after_cancel(self.compact_job)
+        self.compact_job = self.after(delay_ms, self._compact_tick)
+
+    def _compact_tick(self):
+        """Entfernt alte Tombstones im Hintergrund physisch aus dem Sheet."""
+        self.compact_job = None
+        model = self.model
+        if model.backend.is_connected():
+            self.async_backend.submit(model.backend.compact_tombstones,
+                                      on_done=lambda removed: self._on_compacted(model, removed),
+                                      on_error=lambda e: print(f"Tombstone compaction failed: {e}"))
+        self._schedule_compaction()
+
+    def _on_compacted(self, model, removed):
+        if model is self.model:
+            model.prune_tombstones()
 
     def _start_sync(self):
         self.stop_sync.clear()
-        if not self.sync_thread or not self.sync_thread.is_alive():
-            self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
-            self.sync_thread.start()
+        self._schedule_next_sync()
 
-    def _sync_loop(self):
-        while not self.stop_sync.is_set():
-            try:
-                self.model.merge_remote()
-                self.after(0, self._refresh_view)
-            except Exception as e:
-                print(f"Sync failed: {e}") # Log error instead of popup
-            time.sleep(int(self.config_data.get("poll_seconds", config.DEFAULT_POLL_SECONDS)))
+    def _schedule_next_sync(self):
+        if self.stop_sync.is_set() or self.sync_job is not None or self.sync_in_flight:
+            return
+        self.sync_job = self.after(int(self.sync_scheduler.next_delay() * 1000), self._sync_tick)
+
+    def _reschedule_sync(self):
+        """Plant den nächsten Sync mit dem aktuellen Intervall neu (z.B. nach einer Änderung)."""
+        if self.sync_job is not None:
+            self.after_cancel(self.sync_job)
+            self.sync_job = None
+        self._schedule_next_sync()
+
+    def _on_local_change(self):
+        self.sync_scheduler.note_activity()
+        self._reschedule_sync()
+
+    def _on_focus_change(self, event=None):
+        # Fokus-Events kommen von allen Kind-Widgets - Zustand erst nach dem Wechsel prüfen
+        self.after_idle(self._update_focus_state)
+
+    def _update_focus_state(self):
+        try:
+            focused = self.state() != "iconic" and self.focus_displayof() is not None
+        except (tk.TclError, KeyError):
+            focused = False
+        if self.sync_scheduler.set_focused(focused):
+            # Zurück im Fenster: gleich abgleichen statt das lange Intervall abzuwarten
+            self._reschedule_sync()
+
+    def _sync_tick(self):
+        self.sync_job = None
+        if self.stop_sync.is_set():
+            return
+        model = self.model
+        delta = self.config_data.get("sync_mode", "delta") == "delta"
+        self.sync_in_flight = True
+        self.async_backend.submit(self._fetch_for_sync, self.backend, model, delta,
+                                  on_done=lambda result: self._on_sync_fetched(model, result),
+                                  on_error=self._on_sync_failed)
+
+    def _fetch_for_sync(self, backend, model, delta):
+        """Läuft im Hintergrund: holt Änderungen, verbindet bei Bedarf neu."""
+        reconnected = False
+        if not backend.is_connected():
+            # Offline: Verbindung erneut versuchen, dann vollständig abgleichen
+            backend.connect()
+            reconnected = True
+            delta = False
+        return reconnected, delta, model.fetch_remote(delta=delta)
+
+    def _on_sync_fetched(self, model, result):
+        self.sync_in_flight = False
+        reconnected, delta, (projects, tasks) = result
+        if model is self.model:
+            if reconnected:
+                self.status_label.config(text="● Online", fg="green")
+            # Übernahme im Tk-Thread - kann nicht mit Bearbeitungen kollidieren
+            changed = model.apply_remote(projects, tasks, delta)
+            if changed:
+                self._refresh_view()
+            self.sync_scheduler.note_result(changed or reconnected)
+        self._schedule_next_sync()
+
+    def _on_sync_failed(self, error):
+        self.sync_in_flight = False
+        print(f"Sync failed: {error}") # Log error instead of popup
+        self.sync_scheduler.note_error(error)
+        self._schedule_next_sync()
 
     def _refresh_view(self):
         # Im Landkarten-Modus: Nur Daten aktualisieren, nicht neu zeichnen
@@ -344,48 +474,12 @@ class App(tk.Tk):
         self.after(100, set_values)
     
     def _calculate_project_priorities(self, projects):
-        """Berechnet Prioritäten basierend auf Deadlines (1-5, 5 = höchste)."""
-        from datetime import datetime
-        
-        # Projekte mit Deadlines sammeln
-        projects_with_deadlines = []
-        for project in projects:
-            deadline = project.get("deadline", "")
-            if deadline:
-                try:
-                    deadline_date = datetime.strptime(deadline, "%Y-%m-%d")
-                    days_until = (deadline_date - datetime.now()).days
-                    projects_with_deadlines.append((project, days_until))
-                except:
-                    pass
-        
-        # Nach Tagen bis Deadline sortieren (nächste zuerst)
-        projects_with_deadlines.sort(key=lambda x: x[1])
-        
-        # Prioritäten zuweisen (5 Stufen)
-        priority_levels = [5, 4, 3, 2, 1]
-        projects_with_priority = []
-        
-        for i, (project, days_until) in enumerate(projects_with_deadlines):
-            # Priorität basierend auf Position in der sortierten Liste
-            if i < len(priority_levels):
-                priority = priority_levels[i]
-            else:
-                # Wenn mehr als 5 Projekte, wiederhole die niedrigeren Stufen
-                priority = priority_levels[i % len(priority_levels)]
-            
-            project["priority"] = priority
-            project["days_until_deadline"] = days_until
-            projects_with_priority.append(project)
-        
-        # Projekte ohne Deadline bekommen Priorität 1
+        """Übernimmt die Prioritäten (1-5, 5 = höchste) aus den Projekt-Aggregaten des Models."""
         for project in projects:
-            if not project.get("deadline"):
-                project["priority"] = 1
-                project["days_until_deadline"] = None
-                projects_with_priority.append(project)
-        
-        return projects_with_priority
+            stats = self.model.get_project_stats(project["project_id"])
+            project["priority"] = stats["priority"]
+            project["days_until_deadline"] = stats["days_until"]
+        return projects
     
     def _add_project_settings_button(self):
         """Fügt den Projekt-Einstellungen Button hinzu."""
@@ -437,7 +531,21 @@ class App(tk.Tk):
         def delete_cb(task_id):
             self.model.delete_task(task_id)
             self._draw_tasks(self.current_project_id)
-        TaskEditor(self, self.model, task, save_cb, delete_cb, self.config_data.get("current_user", "")).show()
+        TaskEditor(self, self.model, task, save_cb, delete_cb, self.config_data.get("current_user", ""),
+                   load_body=self._load_task_body).show()
+
+    def _load_task_body(self, task, callback):
+        """Lädt Ziel, Beschreibung und Beachtung eines Tasks im Hintergrund nach."""
+        model = self.model
+        def on_done(body):
+            if model is self.model:
+                model.apply_task_body(task["task_id"], body)
+            callback(body)
+        def on_error(error):
+            print(f"Task body could not be loaded: {error}")
+            callback(None)
+        self.async_backend.submit(model.backend.fetch_task_body, task["task_id"],
+                                  on_done=on_done, on_error=on_error)
 
     def open_settings(self):
         # Canvas-State speichern (nur im Dynamischen Modus)
@@ -460,6 +568,8 @@ class App(tk.Tk):
 
     def _on_settings_saved(self, new_config):
         self.config_data = new_config
+        self.anim_manager.set_fps(self.config_data.get('ui', {}).get('animation_fps', 30))
+        self.sync_scheduler.set_poll_seconds(self.config_data.get("poll_seconds", config.DEFAULT_POLL_SECONDS))
         try:
             # Update zoom mode in canvas
             if hasattr(self, 'canvas'):
@@ -468,8 +578,36 @@ class App(tk.Tk):
                 if hasattr(self.canvas, 'fixed_positions'):
                     self.canvas.fixed_positions.clear()
             
+            # Nur bei geänderten Verbindungsdaten neu verbinden, sonst Einstellungen übernehmen
+            self.backend.config = self.config_data
+            self.model.writer.set_interval(self.config_data.get("write_flush_seconds",
+                                                                config.DEFAULT_WRITE_FLUSH_SECONDS))
+            if not self.backend.needs_reconnect():
+                self._refresh_all_ui_elements()
+                return
+
+            old_model, old_async = self.model, self.async_backend
             self.backend = SheetsBackend(self.config_data)
-            self.model = Model(self.backend)
+            self.model = Model(self.backend, config.CACHE_FILE)
+            self.model.on_local_change = self._on_local_change
+            self.async_backend = AsyncBackend(self.backend, self)
+            # Ausstehende Schreibzugriffe des alten Modells nicht verlieren
+            # Der Dialog ändert die Konfiguration direkt - das alte Sheet kennt nur die Verbindung
+            old_settings = old_model.backend.connected_settings or ("", self.config_data.get("sheet_id"))
+            if old_settings[1] == self.config_data.get("sheet_id"):
+                # Gleiches Sheet: Puffer übernehmen statt doppelt zu schreiben
+                self.model.writer.import_pending(old_model.writer.take_pending())
+            else:
+                old_async.submit(old_model.flush_writes)
+            old_async.shutdown(wait=False)
+            # Die alte Pumpe liefert keine Callbacks mehr - ein laufender Sync würde
+            # sync_in_flight sonst dauerhaft gesetzt lassen und den Sync stoppen
+            if self.sync_job is not None:
+                self.after_cancel(self.sync_job)
+                self.sync_job = None
+            self.sync_in_flight = False
+            self.canvas.model = self.model
+            self.radar.model = self.model
             self._connect_and_load()
             self._refresh_all_ui_elements()
         except Exception as e:
@@ -547,7 +685,8 @@ class App(tk.Tk):
             zoom_level = float(value)
             # Deaktiviere Auto-Zoom wenn Benutzer manuell zoomt
             self.canvas.auto_zoom_enabled = False
-            self.canvas.set_zoom_level(zoom_level)
+            # Slider-Ticks werden im Canvas auf einen Zoom pro Frame zusammengefasst
+            self.canvas.request_zoom(zoom_level)
         except (ValueError, AttributeError):
             pass
     
@@ -568,6 +707,19 @@ class App(tk.Tk):
     def on_close(self):
         self.anim_manager.stop()
         self.stop_sync.set()
+        if self.sync_job:
+            self.after_cancel(self.sync_job)
+            self.sync_job = None
+        if self.compact_job:
+            self.after_cancel(self.compact_job)
+            self.compact_job = None
+        # Fenster sofort schließen, ausstehende Schreibzugriffe danach abschließen
+        self.withdraw()
+        self.model.flush_writes()
+        # Laufende Snapshot-Schreibvorgänge abwarten, sonst kollidieren sie mit dem letzten (gleiche .tmp-Datei)
+        self.async_backend.wait_for_disk()
+        self.model.save_snapshot()
+        self.async_backend.shutdown(wait=False)
         self.destroy()
 
 if __name__ == "__main__":
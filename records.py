@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Kompakte Datensätze für Projekte und Tasks.
+
+Das Model hält pro Zeile ein Objekt mit __slots__ statt eines dicts: Feldnamen
+werden nicht pro Record gespeichert, Projekt-IDs und Assignee-Namen sind
+interniert und die Checkliste eines Tasks wird einmal geparst und am Record
+abgelegt. Die Records verhalten sich wie ein dict (get, [], in, update,
+dict(record), ...), damit UI, Schreibpuffer und Snapshot unverändert bleiben.
+"""
+
+import sys
+
+from utils import parse_checklist, checklist_stats
+
+_UNSET = object()
+
+
+class Record:
+    """Basis für slotted Records mit dict-kompatibler Schnittstelle."""
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    FIELD_SET = frozenset()
+    INTERNED = ()  # Felder, deren (Listen-)Werte interniert werden
+
+    def __init__(self, data=(), **kwargs):
+        self._extra = None  # Zusätzliche Schlüssel (z.B. priority aus der UI)
+        self.update(data, **kwargs)
+
+    def _prepare(self, key, value):
+        if key in self.INTERNED:
+            if isinstance(value, str):
+                return sys.intern(value)
+            if isinstance(value, list):
+                return [sys.intern(v) if isinstance(v, str) else v for v in value]
+        return value
+
+    def __getitem__(self, key):
+        if key in self.FIELD_SET:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                return value
+        elif self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.FIELD_SET:
+            setattr(self, key, self._prepare(key, value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self.FIELD_SET and hasattr(self, key):
+            delattr(self, key)
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in self.FIELD_SET:
+            return hasattr(self, key)
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=_UNSET):
+        try:
+            value = self[key]
+        except KeyError:
+            if default is _UNSET:
+                raise
+            return default
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, data=(), **kwargs):
+        pairs = [(key, data[key]) for key in data.keys()] if hasattr(data, "keys") else data
+        for key, value in pairs:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def assign(self, data):
+        """Übernimmt den Inhalt von data vollständig (in place, fehlende Felder werden entfernt)."""
+        for key in self.FIELDS:
+            if key not in data and hasattr(self, key):
+                delattr(self, key)
+        self._extra = None
+        self.update(data)
+
+
+class Project(Record):
+    __slots__ = ("project_id", "name", "color", "deadline", "last_update", "deleted")
+    FIELDS = __slots__
+    FIELD_SET = frozenset(FIELDS)
+    INTERNED = ("project_id",)
+
+
+class Task(Record):
+    __slots__ = ("task_id", "project_id", "name", "goal", "description", "attention",
+                 "assignee", "checklist_json", "last_update", "deleted", "_checklist")
+    FIELDS = __slots__[:-1]
+    FIELD_SET = frozenset(FIELDS)
+    INTERNED = ("project_id", "assignee")
+
+    def checklist_entry(self):
+        """(checklist_json, Items, Kennzahlen) - wird nur nach Änderung des Rohtexts neu geparst."""
+        raw = self.get("checklist_json", "[]")
+        entry = getattr(self, "_checklist", None)
+        if entry is None or entry[0] != raw:
+            items = parse_checklist(raw)
+            entry = self._checklist = (raw, items, checklist_stats(items))
+        return entry
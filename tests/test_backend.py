@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Regressionstests für SheetsBackend gegen ein In-Memory-Sheet (ohne gspread/Netzwerk).
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import Model, SheetsBackend, WriteQueue, PROJECT_HEADERS, TASK_HEADERS
+
+
+def _col_number(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _parse_range(rng):
+    """'Tasks'!A2:J5 -> (erste Spalte, erste Zeile, letzte Spalte, letzte Zeile oder None)."""
+    first_col, first_row, last_col, last_row = re.match(
+        r"([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?$", rng.split("!")[-1]).groups()
+    return (_col_number(first_col), int(first_row or 1),
+            _col_number(last_col or first_col), int(last_row) if last_row else None)
+
+
+class FakeWorksheet:
+    def __init__(self, sheet_id, title, headers):
+        self.id = sheet_id
+        self.title = title
+        self.rows = [list(headers)]
+
+    def col_values(self, col):
+        return [row[col - 1] if len(row) >= col else "" for row in self.rows]
+
+    def append_rows(self, rows):
+        start = len(self.rows) + 1
+        self.rows.extend(list(r) for r in rows)
+        return {"updates": {"updatedRange": f"'{self.title}'!A{start}:J{len(self.rows)}"}}
+
+    def append_row(self, row):
+        return self.append_rows([row])
+
+    def get(self, rng):
+        first_col, first_row, last_col, last_row = _parse_range(rng)
+        values = []
+        for row in self.rows[first_row - 1:last_row]:
+            values.append([row[c - 1] if len(row) >= c else "" for c in range(first_col, last_col + 1)])
+        while values and not any(values[-1]):
+            values.pop()
+        return values
+
+    def set(self, rng, values):
+        first_col, first_row, _, _ = _parse_range(rng)
+        for offset, new in enumerate(values):
+            row = self.rows[first_row - 1 + offset]
+            row.extend([""] * (first_col - 1 + len(new) - len(row)))
+            row[first_col - 1:first_col - 1 + len(new)] = new
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.sheets = {"Projects": FakeWorksheet(1, "Projects", PROJECT_HEADERS),
+                       "Tasks": FakeWorksheet(2, "Tasks", TASK_HEADERS)}
+        self.calls = []  # (Methode, Argument) pro Request
+
+    def _sheet(self, rng):
+        return self.sheets[rng.split("!")[0].strip("'")]
+
+    def values_batch_get(self, ranges, params=None):
+        self.calls.append(("values_batch_get", list(ranges)))
+        return {"valueRanges": [{"range": r, "values": self._sheet(r).get(r)} for r in ranges]}
+
+    def values_batch_update(self, body):
+        self.calls.append(("values_batch_update", body))
+        for data in body["data"]:
+            self._sheet(data["range"]).set(data["range"], data["values"])
+
+    def batch_update(self, body):
+        by_id = {ws.id: ws for ws in self.sheets.values()}
+        for request in body["requests"]:
+            rng = request["deleteDimension"]["range"]
+            del by_id[rng["sheetId"]].rows[rng["startIndex"]:rng["endIndex"]]
+
+
+def _task(task_id, name, last_update="2025-01-01T00:00:00"):
+    return {"task_id": task_id, "project_id": "p1", "name": name, "goal": "", "description": "",
+            "attention": "", "assignee": "", "checklist_json": "[]", "last_update": last_update}
+
+
+def _client(sheet):
+    client = SheetsBackend({})
+    client.sh = sheet
+    client.ws_projects = sheet.sheets["Projects"]
+    client.ws_tasks = sheet.sheets["Tasks"]
+    return client
+
+
+class ApplyWritesTest(unittest.TestCase):
+    def setUp(self):
+        self.sheet = FakeSpreadsheet()
+        self.client_a = _client(self.sheet)
+        self.client_b = _client(self.sheet)
+        self.client_a.apply_writes(tasks=[_task(f"t{i}", f"T{i}") for i in range(5)])
+        # Client B kennt die Zeilen (und cached damit den Zeilen-Index)
+        self.client_b._reindex_ids(self.client_b.ws_tasks)
+
+    def task_rows(self):
+        return [(row[0], row[2]) for row in self.sheet.sheets["Tasks"].rows[1:]]
+
+    def test_rows_removed_above_target_by_other_client(self):
+        # Client A entfernt t1 physisch (z.B. Tombstone-Kompaktierung), alle Zeilen darunter rutschen nach oben
+        self.client_a._delete_rows_batch(self.client_a.ws_tasks, ["t1"])
+        self.client_b.apply_writes(tasks=[_task("t3", "T3-edited")])
+        self.assertEqual(self.task_rows(), [("t0", "T0"), ("t2", "T2"), ("t3", "T3-edited"), ("t4", "T4")])
+
+    def test_target_removed_by_other_client_is_appended(self):
+        self.client_a._delete_rows_batch(self.client_a.ws_tasks, ["t3"])
+        self.client_b.upsert_task(_task("t3", "T3-edited"))
+        self.assertEqual(self.task_rows(), [("t0", "T0"), ("t1", "T1"), ("t2", "T2"), ("t4", "T4"), ("t3", "T3-edited")])
+
+
+class DeltaSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.sheet = FakeSpreadsheet()
+        self.writer = _client(self.sheet)
+        self.writer.apply_writes(tasks=[_task(f"t{i}", f"T{i}") for i in range(5)])
+        self.reader = _client(self.sheet)
+        # Erster Abruf setzt das Wasserzeichen (alle Zeilen sind neu)
+        _, tasks = self.reader.fetch_changes()
+        self.assertEqual(len(tasks), 5)
+        self.sheet.calls.clear()
+
+    def test_single_row_edit(self):
+        self.writer.apply_writes(tasks=[_task("t3", "T3-edited", "2025-01-02T00:00:00")])
+        self.sheet.calls.clear()
+        projects, tasks = self.reader.fetch_changes()
+        self.assertEqual(projects, [])
+        self.assertEqual([(t["task_id"], t["name"], t["last_update"]) for t in tasks],
+                         [("t3", "T3-edited", "2025-01-02T00:00:00")])
+        # ID-/last_update-Spalten lesen, dann nur die Bereiche der geänderten Zeile
+        self.assertEqual(len(self.sheet.calls), 2)
+        self.assertTrue(all(r.startswith("'Tasks'!") and r.endswith("5") for r in self.sheet.calls[1][1]))
+
+    def test_no_changes_skips_rebuild(self):
+        self.assertEqual(self.reader.fetch_changes(), ([], []))
+        self.assertEqual([name for name, _ in self.sheet.calls], ["values_batch_get"])
+
+        model = Model(self.reader)
+        self.addCleanup(model.writer.stop, flush=False)
+        with mock.patch.object(model, "_rebuild_project_stats") as rebuild, \
+                mock.patch.object(model, "_rank_projects") as rank:
+            self.assertFalse(model.merge_remote(delta=True))
+        rebuild.assert_not_called()
+        rank.assert_not_called()
+        self.assertFalse(model.snapshot_dirty)
+
+
+class WriteQueueTest(unittest.TestCase):
+    def test_edits_to_one_task_are_coalesced(self):
+        sheet = FakeSpreadsheet()
+        client = _client(sheet)
+        client.apply_writes(tasks=[_task("t0", "T0")])
+        sheet.calls.clear()
+        writer = WriteQueue(client, interval=60)
+        self.addCleanup(writer.stop, flush=False)
+        for i in range(10):
+            writer.upsert_task(_task("t0", f"edit{i}", f"2025-01-01T00:00:{i:02d}"))
+        self.assertTrue(writer.flush())
+        updates = [body for name, body in sheet.calls if name == "values_batch_update"]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(sheet.sheets["Tasks"].rows[1][2], "edit9")
+        self.assertEqual(len(sheet.sheets["Tasks"].rows), 2)
+
+    def test_failed_flush_requeues_with_backoff(self):
+        backend = FailingBackend()
+        backend.release.set()
+        writer = WriteQueue(backend, interval=1)
+        self.addCleanup(writer.stop, flush=False)
+        writer.upsert_task(_task("t0", "T0"))
+        self.assertFalse(writer.flush())
+        self.assertTrue(writer.is_pending("t0"))
+        first_delay = writer.next_attempt - time.time()
+        self.assertFalse(writer.flush())
+        self.assertGreater(writer.next_attempt - time.time(), first_delay)
+        self.assertEqual(writer.failures, 2)
+
+
+class TombstoneColumnTest(unittest.TestCase):
+    def test_tombstone_keeps_header_row(self):
+        # Ältere Clients leeren Blätter mit abweichender Kopfzeile - Tombstones stecken in last_update
+        sheet = FakeSpreadsheet()
+        _client(sheet).apply_writes(tasks=[dict(_task("t0", "T0"), deleted=True)])
+        rows = sheet.sheets["Tasks"].rows
+        self.assertEqual(rows[0], TASK_HEADERS)
+        self.assertEqual(len(rows[1]), len(TASK_HEADERS))
+        record = SheetsBackend._normalize_task(dict(zip(TASK_HEADERS, rows[1])))
+        self.assertTrue(record["deleted"])
+        self.assertEqual(record["last_update"], "2025-01-01T00:00:00")
+
+
+class FullMergeTest(unittest.TestCase):
+    def setUp(self):
+        self.model = Model(_client(FakeSpreadsheet()))
+        # Stand aus dem lokalen Snapshot
+        project = {"project_id": "p1", "name": "P", "color": "", "deadline": "", "last_update": "2025-01-01T00:00:00"}
+        self.model.apply_remote([project], [_task(f"t{i}", f"T{i}") for i in range(3)])
+        self.project = project
+
+    def tearDown(self):
+        self.model.writer.stop(flush=False)
+
+    def test_rows_missing_remotely_are_dropped(self):
+        # t0 wurde remote gelöscht und kompaktiert - der Vollabruf enthält die Zeile nicht mehr
+        self.model.apply_remote([self.project], [_task("t1", "T1"), _task("t2", "T2")])
+        self.assertEqual(sorted(self.model.tasks), ["t1", "t2"])
+
+    def test_pending_local_writes_are_kept(self):
+        self.model.writer.upsert_task(_task("t0", "T0-local"))
+        self.model.apply_remote([], [_task("t1", "T1")])
+        self.assertEqual(sorted(self.model.tasks), ["t0", "t1"])
+        self.assertIn("p1", self.model.projects)
+
+    def test_older_tombstone_does_not_block_later_saves(self):
+        # Die lokale Änderung ist neuer als die Löschung und gewinnt - sie muss weiter speicherbar sein
+        tombstone = dict(_task("t0", "T0"), deleted=True, last_update="2024-12-31T00:00:00")
+        self.model.apply_remote([], [tombstone], delta=True)
+        self.assertIn("t0", self.model.tasks)
+        self.model.save_task(self.model.tasks["t0"])
+        self.assertTrue(self.model.writer.is_pending("t0"))
+
+    def test_newer_tombstone_blocks_stale_saves(self):
+        stale = self.model.tasks["t0"]
+        tombstone = dict(_task("t0", "T0"), deleted=True, last_update="2025-01-02T00:00:00")
+        self.model.apply_remote([], [tombstone], delta=True)
+        self.assertNotIn("t0", self.model.tasks)
+        self.model.save_task(stale)
+        self.assertFalse(self.model.writer.is_pending("t0"))
+
+
+class FailingBackend:
+    """Backend, dessen Schreibzugriff erst auf ein Signal hin fehlschlägt."""
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def is_connected(self):
+        return True
+
+    def apply_writes(self, *args):
+        self.started.set()
+        self.release.wait(5)
+        raise RuntimeError("offline")
+
+
+class TakePendingTest(unittest.TestCase):
+    def test_waits_for_in_flight_flush(self):
+        backend = FailingBackend()
+        writer = WriteQueue(backend, interval=60)
+        writer.upsert_task(_task("t0", "T0"))
+        flusher = threading.Thread(target=writer.flush)
+        flusher.start()
+        backend.started.wait(5)
+        # Der laufende Flush hat t0 schon aus dem Puffer genommen und legt es erst nach dem Fehlschlag zurück
+        threading.Timer(0.05, backend.release.set).start()
+        pending = writer.take_pending()
+        flusher.join(5)
+        self.assertEqual([t["task_id"] for t in pending["tasks"]], ["t0"])
+        self.assertFalse(writer.has_pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,27 +7,22 @@ Enthält alle Tkinter-Widgets, Dialoge und benutzerdefinierten Canvas-Elemente.
 import json
 import math
 import random
-import time
 from datetime import datetime
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, colorchooser
+from tkinter import messagebox, filedialog, colorchooser
 
 # Optionale UI-Bibliotheken
 try:
-    from PIL import Image, ImageDraw
+    from PIL import Image, ImageDraw, ImageTk
     PILLOW_AVAILABLE = True
 except ImportError:
     PILLOW_AVAILABLE = False
 
-try:
-    import webview
-    WEBVIEW_AVAILABLE = True
-except ImportError:
-    WEBVIEW_AVAILABLE = False
-
 # Lokale Importe
 import config
-from utils import now_iso
+from utils import now_iso, parse_checklist, checklist_stats, AnimationManager, SpatialHash, VectorAnimationState, NUMPY_AVAILABLE
+from layout_engine import ForceLayout
+from backend import has_task_body
 
 # ---------- Mini Radar Widget ----------
 class MiniRadar(tk.Canvas):
@@ -35,11 +30,15 @@ class MiniRadar(tk.Canvas):
     def __init__(self, master, app_config, **kwargs):
         super().__init__(master, width=200, height=200, bg="#000011", highlightthickness=0, **kwargs)
         self.app_config = app_config
+        self.model = None  # Wird von der App gesetzt (Checklisten-Cache)
         self.radius = 80
         self.center_x = 100
         self.center_y = 100
         self.sweep_angle = 0
         self.data_points = []
+        # Eigener Scheduler als Fallback, die App setzt ihren gemeinsamen
+        self.anim_manager = AnimationManager(self, app_config.get('ui', {}).get('animation_fps', 30))
+        self.anim_manager.start()
 
     def update_data(self, projects, tasks):
         """Aktualisiert das Radar mit aktuellen Daten."""
@@ -55,7 +54,11 @@ class MiniRadar(tk.Canvas):
 
             deadline = project.get("deadline", "")
             urgency = 0.5
-            if deadline:
+            if self.model:
+                days_until = self.model.get_project_stats(project.get("project_id"))["days_until"]
+                if days_until is not None:
+                    urgency = max(0.1, min(1.0, 1.0 - (days_until / 30)))
+            elif deadline:
                 try:
                     deadline_date = datetime.strptime(deadline, "%Y-%m-%d")
                     days_until = (deadline_date - datetime.now()).days
@@ -82,15 +85,24 @@ class MiniRadar(tk.Canvas):
             })
 
         self._draw_radar()
+        self.anim_manager.register("radar", self._animate_radar, interval=0.05)
+
+    def _animate_radar(self, dt):
+        """Frame-Callback: dreht den Radar-Strahl weiter."""
+        if not self.app_config.get('ui', {}).get('enable_radar', False) or not self.winfo_ismapped():
+            return False
+        self.sweep_angle = (self.sweep_angle + 2 * dt / 0.05) % 360
+        self._draw_radar()
 
     def _calculate_task_progress(self, task):
-        try:
-            checklist = json.loads(task.get("checklist_json", "[]"))
-            if not checklist: return 0
-            done = sum(1 for item in checklist if item.get("done", False))
-            return int((done / len(checklist)) * 100) if checklist else 0
-        except:
-            return 0
+        return self._checklist_stats(task)["percent"]
+
+    def _checklist_stats(self, task):
+        """Checklisten-Kennzahlen aus dem Cache des Models (ohne Model direkt geparst)."""
+        model = getattr(self, 'model', None)
+        if model:
+            return model.get_checklist_stats(task)
+        return checklist_stats(parse_checklist(task.get("checklist_json", "[]")))
 
     def _draw_radar(self):
         self.delete("all")
@@ -111,9 +123,6 @@ class MiniRadar(tk.Canvas):
                 size = int(3 + progress * 3)
                 self.create_oval(point['x'] - size, point['y'] - size, point['x'] + size, point['y'] + size, fill=color, outline="white", width=1)
 
-        self.sweep_angle = (self.sweep_angle + 2) % 360
-        self.after(50, self._draw_radar)
-
 # ---------- Dialoge und UI-Elemente ----------
 class ModalDialog:
     """Basisklasse für modale Dialoge, die als Overlay im Hauptfenster erscheinen."""
@@ -225,13 +234,16 @@ class NewProjectDialog(ModalDialog):
         self.hide()
 
 class TaskEditor(ModalDialog):
-    def __init__(self, parent, model, task, on_save, on_delete, current_user):
+    def __init__(self, parent, model, task, on_save, on_delete, current_user, load_body=None):
         super().__init__(parent, "Task bearbeiten", 644, 860)
         self.model = model
         self.task = task
         self.on_save = on_save
         self.on_delete = on_delete
         self.current_user = current_user
+        # load_body(task, callback) lädt Ziel/Beschreibung/Beachtung nach, falls sie fehlen
+        self.load_body = load_body
+        self.body_loaded = has_task_body(task) or load_body is None
 
     def create_content(self):
         app_config = getattr(self.parent, 'config_data', {})
@@ -264,7 +276,8 @@ class TaskEditor(ModalDialog):
         tk.Entry(scrollable_frame, textvariable=self.var_name, font=("Helvetica", 11), bg="#f8f8f8", fg="#000000", insertbackground="#000000", relief="sunken", bd=3).pack(fill="x", pady=(0, 15))
 
         tk.Label(scrollable_frame, text="Task Ziel:", bg=self.bg_color, fg="#000000", font=("Helvetica", 10, "bold")).pack(anchor="w", pady=(0, 5))
-        tk.Entry(scrollable_frame, textvariable=self.var_goal, font=("Helvetica", 11), bg="#f8f8f8", fg="#000000", insertbackground="#000000", relief="sunken", bd=3).pack(fill="x", pady=(0, 15))
+        self.entry_goal = tk.Entry(scrollable_frame, textvariable=self.var_goal, font=("Helvetica", 11), bg="#f8f8f8", fg="#000000", insertbackground="#000000", relief="sunken", bd=3)
+        self.entry_goal.pack(fill="x", pady=(0, 15))
 
         tk.Label(scrollable_frame, text="Beschreibung:", bg=self.bg_color, fg="#000000", font=("Helvetica", 10, "bold")).pack(anchor="w", pady=(0, 5))
         self.txt_desc = tk.Text(scrollable_frame, height=4, wrap="word", font=("Helvetica", 10), bg="#f8f8f8", fg="#000000", insertbackground="#000000", relief="sunken", bd=3)
@@ -276,6 +289,12 @@ class TaskEditor(ModalDialog):
         self.txt_attention.pack(fill="x", pady=(0, 15))
         self.txt_attention.insert("1.0", self.task.get("attention", ""))
 
+        if not self.body_loaded:
+            # Inhalte wurden beim Sync nicht übertragen - im Hintergrund nachladen
+            self.txt_desc.insert("1.0", "Wird geladen...")
+            self._set_body_state("disabled")
+            self.load_body(self.task, self._on_body_loaded)
+
         tk.Label(scrollable_frame, text="Bearbeitet von:", bg=self.bg_color, fg="#000000", font=("Helvetica", 10, "bold")).pack(anchor="w", pady=(0, 5))
         
         # Create multi-select interface for assignees
@@ -311,10 +330,7 @@ class TaskEditor(ModalDialog):
         self.checklist_frame = tk.Frame(scrollable_frame, bg=self.bg_color)
         self.checklist_frame.pack(fill="x", pady=(0, 10))
         self.check_items = []
-        try:
-            checklist = json.loads(self.task.get("checklist_json", "[]"))
-        except:
-            checklist = []
+        checklist = self.model.get_checklist(self.task) if self.model else parse_checklist(self.task.get("checklist_json", "[]"))
         for item in checklist:
             self._add_check_item(item.get("text", ""), bool(item.get("done", False)))
         tk.Button(scrollable_frame, text="+ To-Do hinzufügen", command=self._on_add_item, bg="#cccccc", fg="#000000", font=("Helvetica", 9), relief="sunken", bd=2, activebackground="#dddddd", activeforeground="#000000").pack(anchor="w", pady=(0, 20))
@@ -337,6 +353,28 @@ class TaskEditor(ModalDialog):
                 self.assignee_vars[self.current_user].set(True)
                 self.selected_assignees = [self.current_user]
 
+    def _set_body_state(self, state):
+        for widget in (self.entry_goal, self.txt_desc, self.txt_attention):
+            widget.configure(state=state)
+
+    def _on_body_loaded(self, body):
+        try:
+            if not self.txt_desc.winfo_exists():
+                return  # Editor wurde inzwischen geschlossen
+        except tk.TclError:
+            return
+        self._set_body_state("normal")
+        self.txt_desc.delete("1.0", "end")
+        if body is None:
+            # Ohne Inhalt wird beim Speichern nichts überschrieben
+            self.txt_desc.insert("1.0", "Inhalt konnte nicht geladen werden.")
+            self._set_body_state("disabled")
+            return
+        self.var_goal.set(body.get("goal", ""))
+        self.txt_desc.insert("1.0", body.get("description", ""))
+        self.txt_attention.insert("1.0", body.get("attention", ""))
+        self.body_loaded = True
+
     def _on_add_item(self):
         self._add_check_item("", False)
 
@@ -359,9 +397,10 @@ class TaskEditor(ModalDialog):
 
     def _on_save(self):
         self.task["name"] = self.var_name.get().strip()
-        self.task["goal"] = self.var_goal.get().strip()
-        self.task["description"] = self.txt_desc.get("1.0", "end").strip()
-        self.task["attention"] = self.txt_attention.get("1.0", "end").strip()
+        if self.body_loaded:
+            self.task["goal"] = self.var_goal.get().strip()
+            self.task["description"] = self.txt_desc.get("1.0", "end").strip()
+            self.task["attention"] = self.txt_attention.get("1.0", "end").strip()
         
         # Collect selected assignees
         selected_assignees = [user for user, var in self.assignee_vars.items() if var.get()]
@@ -601,22 +640,53 @@ class LegendWidget(tk.Frame):
                 tk.Label(user_frame, text=user, font=("Helvetica", 10, "bold"), fg="#000000", bg=surface_light).pack(side="left")
 
 class BubbleCanvas(tk.Canvas):
+    # Zusätzlicher Hover-Radius um eine Bubble (Halo-, Progress- und Assignee-Ringe)
+    HOVER_MARGIN = 14
+    # Rand um Bubble und Ringe, ab dem eine Gruppe als außerhalb des Viewports gilt
+    CULL_MARGIN = 30
+    # Sekunden, nach denen die Sichtbarkeit trotz Schwebe-Drift neu berechnet wird
+    CULL_REFRESH_SECONDS = 0.5
+
     def __init__(self, master, app_config, **kwargs):
         bg_color = config.get_color(app_config, "background", "#111111")
         super().__init__(master, bg=bg_color, highlightthickness=0, **kwargs)
         self.app_config = app_config
-        self.items_map = []
-        self.tooltip = None
-        self.tooltip_data = None
+        self.group_by_item = {}  # Canvas-Item-ID -> Bubble-Gruppe (Klick-Zuordnung)
+        self.hover_index = None  # SpatialHash der Bubble-Mittelpunkte, None = neu aufbauen
+        self.hover_reach = 0
+        self.hover_drift = 0  # Drift-Reserve, mit der der Hover-Index gebaut wurde
+        self.hover_pointer = None  # Letzte Mausposition, ausgewertet einmal pro Frame
+        self.pending_zoom = None  # Letzter Zoom-Wunsch des Sliders, angewendet einmal pro Frame
+        self.pending_pan = None  # Ziel-Offset beim Verschieben, angewendet einmal pro Frame
+        self.visible_groups = None  # Gruppen im Viewport, None = neu berechnen
+        self.visible_ids = set()  # id() der beim letzten Durchlauf sichtbaren Gruppen
+        self.visibility_age = 0.0
+        self.tooltip = None  # Wiederverwendetes Tooltip-Fenster (wird nur versteckt, nie zerstört)
+        self.tooltip_label = None
+        self.tooltip_data = None  # Payload des sichtbaren Tooltips
+        self.tooltip_pending = None  # Payload, dessen Tooltip nach der Hover-Verzögerung erscheint
+        self.tooltip_after_id = None
+        self.tooltip_texts = {}  # id(payload) -> (Signatur, Text)
         self.galaxy_animation_id = None
-        self.stars = []
+        self.stars = []  # Sterne in relativen Koordinaten (0..1), unabhängig von der Canvas-Größe
         self.galaxy_animation_offset = 0
+        self.galaxy_frames = {}  # (w, h) -> vorgerenderte Twinkle-Frames (PhotoImage, nur mit Pillow)
+        self.galaxy_image_item = None
+        self.galaxy_frame_index = 0
+        self.star_items = []  # Fallback ohne Pillow: fester Pool wiederverwendeter Stern-Items
         
         # Schwebebewegung für Bubbles
         self.floating_animation_id = None
         self.floating_offset = 0
         self.bubble_groups = []  # Speichert Gruppen von zusammengehörigen Bubble-Elementen
+        self.groups_by_key = {}  # project_id/task_id -> Bubble-Gruppe (für Diff-Rendering)
+        self.rendered_bubble_type = None
+        self.layout_engine = ForceLayout()  # Deterministisches Task-Layout mit Warmstart
+        self.anim_state = None  # Vektorisierter Animationszustand (nur mit NumPy)
         self.asteroid_animation_id = None  # Animation für Asteroiden
+        # Gemeinsamer Frame-Scheduler (wird von der App gesetzt, sonst eigener)
+        self.anim_manager = AnimationManager(self, app_config.get('ui', {}).get('animation_fps', 30))
+        self.anim_manager.start()
         
         # Zoom-Funktionalität
         self.zoom_level = 1.0  # 1.0 = normal, 0.5 = kleiner, 2.0 = größer
@@ -643,8 +713,10 @@ class BubbleCanvas(tk.Canvas):
         self.pan_start_offset_y = 0
         self.pan_cursor = "fleur"  # Hand-Cursor für Pan-Modus
 
-        self.bind("<Configure>", lambda e: self.redraw())
+        self.bind("<Configure>", self._on_configure)
         self.bind("<Motion>", self._on_mouse_move)
+        # Eine Bindung für alle Bubble-Items statt einer pro Item
+        self.tag_bind("bubble", "<Button-1>", self._on_bubble_click)
         # Mausrad-Zoom komplett entfernt
         self.bind("<Leave>", self._on_mouse_leave)
         
@@ -658,26 +730,57 @@ class BubbleCanvas(tk.Canvas):
 
     def clear(self):
         self.delete("all")
-        self.items_map.clear()
+        self.group_by_item.clear()
+        self._geometry_changed()
         self.bubble_groups.clear()
+        self.groups_by_key.clear()
+        self.rendered_bubble_type = None
+        self.anim_state = None
+        self.visible_ids = set()
+        self.galaxy_image_item = None
+        self.star_items = []
         self._hide_tooltip()
+        self.tooltip_texts.clear()
         # Stoppe Schwebebewegung
         if self.floating_animation_id:
-            self.after_cancel(self.floating_animation_id)
+            self.anim_manager.unregister(self.floating_animation_id)
             self.floating_animation_id = None
         # Stoppe Asteroid-Animation
         if self.asteroid_animation_id:
-            self.after_cancel(self.asteroid_animation_id)
+            self.anim_manager.unregister(self.asteroid_animation_id)
             self.asteroid_animation_id = None
 
     def draw_bubbles(self, data_list, label_key, bubble_type, on_click, assignee_getter=None):
+        # Filtere gültige Objekte (Fokus-Modus berücksichtigen)
+        valid_objects = []
+        for obj in data_list:
+            if (bubble_type == "task" and self.app_config.get('ui', {}).get('enable_focus_mode', False) and
+                assignee_getter):
+                # Für Multi-Assignee: Prüfe ob aktueller Benutzer in der Assignee-Liste ist
+                assignees = assignee_getter(obj) or []
+                if isinstance(assignees, str):
+                    assignees = [assignees] if assignees else []
+                elif not isinstance(assignees, list):
+                    assignees = []
+                
+                current_user = self.app_config.get('current_user', '')
+                if current_user and current_user not in assignees:
+                    continue
+            valid_objects.append(obj)
+
+        # Inkrementeller Pfad: nur geänderte Bubbles neu aufbauen
+        if self._can_update_incrementally(valid_objects, bubble_type):
+            self._update_bubbles(valid_objects, label_key, bubble_type, on_click, assignee_getter)
+            return
+
         # Store current animation state before clearing
         was_floating_active = self.floating_animation_id is not None
         current_floating_offset = self.floating_offset
         
         self.clear()
         if self.app_config.get('ui', {}).get('enable_galaxy_bg', False):
-            self._generate_galaxy_stars()
+            if not self.stars:
+                self._generate_galaxy_stars()
             self._animate_galaxy()
 
         w = self.winfo_width()
@@ -687,31 +790,47 @@ class BubbleCanvas(tk.Canvas):
             return
 
         base_radius = 80 if bubble_type == "project" else 70
-        radius = self.get_effective_radius(base_radius)
         
         # Update zoom mode from config
         self.zoom_mode = self.app_config.get('ui', {}).get('zoom_mode', 'dynamic')
         
-        # Filtere gültige Objekte (Fokus-Modus berücksichtigen)
-        valid_objects = []
-        for obj in data_list:
-            if (bubble_type == "task" and self.app_config.get('ui', {}).get('enable_focus_mode', False) and
-                assignee_getter):
-                # Für Multi-Assignee: Prüfe ob aktueller Benutzer in der Assignee-Liste ist
-                assignees = assignee_getter(obj) or []
-                if isinstance(assignees, str):
-                    assignees = [assignees] if assignees else []
-                elif not isinstance(assignees, list):
-                    assignees = []
-                
-                current_user = self.app_config.get('current_user', '')
-                if current_user and current_user not in assignees:
-                    continue
-            valid_objects.append(obj)
-        
         if not valid_objects:
             return
         
+        positions = self._calculate_positions(valid_objects, bubble_type, base_radius, auto_zoom=True)
+
+        for i, obj in enumerate(valid_objects):
+            x, y = positions[i]
+            
+            # Offset anwenden (Landkarten-Modus oder Pan-Modus)
+            if self.zoom_mode == 'map' or self.pan_mode:
+                x += self.map_offset_x
+                y += self.map_offset_y
+
+            bubble_group = self._create_bubble_group(obj, x, y, label_key, bubble_type, on_click, assignee_getter)
+            self.bubble_groups.append(bubble_group)
+            self.groups_by_key[bubble_group['key']] = bubble_group
+        self.rendered_bubble_type = bubble_type
+        
+        # Schwebebewegung starten
+        self._start_floating_animation()
+        # Asteroid-Animation starten
+        self._start_asteroid_animation()
+        
+        # Restore animation state if it was previously active
+        if was_floating_active:
+            self.floating_offset = current_floating_offset
+        
+        # Im Landkarten-Modus: Echtzeit-Skalierung nach dem Zeichnen anwenden
+        if self.zoom_mode == 'map' and self.zoom_level != 1.0:
+            self._place_map_groups()
+
+    def _calculate_positions(self, valid_objects, bubble_type, base_radius, auto_zoom=False):
+        """Berechnet die Bubble-Positionen abhängig von Zoom-Modus und Bubble-Typ."""
+        w = self.winfo_width()
+        h = self.winfo_height()
+        radius = self.get_effective_radius(base_radius)
+
         # Berechne Canvas-Mitte
         center_x = w // 2
         center_y = h // 2
@@ -738,173 +857,211 @@ class BubbleCanvas(tk.Canvas):
                     positions = self._calculate_circular_positions(num_bubbles, center_x, center_y, w, h, radius, valid_objects)
                     
                     # Prüfe auf Überlappungen und zoome automatisch raus wenn nötig
-                    max_auto_zoom_attempts = 5
+                    max_auto_zoom_attempts = 5 if auto_zoom else 0
                     for attempt in range(max_auto_zoom_attempts):
                         if not self._check_for_overlaps_and_auto_zoom(positions, radius):
                             break
                         # Neu berechnen mit kleinerem Radius
                         radius = self.get_effective_radius(base_radius)
-                        positions = self._calculate_circular_positions(num_bubbles, center_x, center_y, w, h, radius)
+                        positions = self._calculate_circular_positions(num_bubbles, center_x, center_y, w, h, radius, valid_objects)
+        return positions
 
-        for i, obj in enumerate(valid_objects):
-            x, y = positions[i]
-            
-            # Offset anwenden (Landkarten-Modus oder Pan-Modus)
-            if self.zoom_mode == 'map' or self.pan_mode:
-                x += self.map_offset_x
-                y += self.map_offset_y
-            
-            label = obj.get(label_key, "")[:18]
-            color = obj.get("color") or "#222222"
-
-            # Bubble-Gruppe für diese Bubble erstellen
-            bubble_group = {
-                'base_x': x,
-                'base_y': y,
-                'current_x': x,  # Aktuelle Position für kontinuierliche Animation
-                'current_y': y,  # Aktuelle Position für kontinuierliche Animation
-                'radius': radius,
-                'base_radius': base_radius,  # Speichere den ursprünglichen Radius für Skalierung
-                'bubble_type': bubble_type,  # Speichere den Bubble-Typ für Skalierung
-                'items': [],
-                'phase': random.uniform(0, 6.28),  # Zufällige Phase für individuelle Bewegung
-                'rotation_offset': 0,  # Rotations-Offset für Ringe
-                'ring_items': []  # Separate Liste für rotierende Ringe
-            }
+    def _bubble_key(self, obj, bubble_type):
+        """Stabiler Schlüssel einer Bubble (project_id bzw. task_id)."""
+        key = obj.get("project_id") if bubble_type == "project" else obj.get("task_id")
+        return key or id(obj)
+
+    def _bubble_signature(self, obj, label_key, bubble_type, assignee_getter):
+        """Alle Werte, die das Aussehen einer Bubble bestimmen - ändert sich einer, wird sie neu aufgebaut."""
+        assignees = assignee_getter(obj) if assignee_getter else None
+        if isinstance(assignees, list):
+            assignees = tuple(assignees)
+        signature = (obj.get(label_key, ""), obj.get("color"), obj.get("deadline"), obj.get("priority"),
+                     assignees, obj.get("checklist_json"), obj.get("last_update"))
+        if bubble_type == "project":
+            # Deadline-Halos hängen von der Arbeitslast des Projekts ab
+            signature += (self._calculate_project_workload(obj.get("project_id")),)
+        return signature
+
+    def _can_update_incrementally(self, valid_objects, bubble_type):
+        """Prüft, ob die bestehenden Bubbles per Diff aktualisiert werden können statt neu gezeichnet."""
+        if not self.bubble_groups or self.rendered_bubble_type != bubble_type:
+            return False
+        if self.zoom_mode != 'dynamic' or self.app_config.get('ui', {}).get('zoom_mode', 'dynamic') != 'dynamic':
+            return False
+        # Nur wenn zumindest ein Teil der Bubbles erhalten bleibt (sonst z.B. Projektwechsel)
+        return any(self._bubble_key(obj, bubble_type) in self.groups_by_key for obj in valid_objects)
 
-            # Verwende den zoom-angepassten Radius für alle Kreise
-            effective_radius = self.get_effective_radius(base_radius)
-            
-            if bubble_type == "project":
-                halo_items = self._draw_deadline_halo(x, y, effective_radius, obj.get("deadline", ""), obj.get("project_id"))
-                if halo_items:
-                    bubble_group['ring_items'].extend(halo_items)
-            
-            if bubble_type == "project":
-                oval = self.create_oval(x-effective_radius, y-effective_radius, x+effective_radius, y+effective_radius, fill="#1a1a1a", outline=color or "#444444", width=4, tags="world")
+    def _create_bubble_group(self, obj, x, y, label_key, bubble_type, on_click, assignee_getter, template=None):
+        """Erstellt alle Canvas-Elemente einer Bubble und gibt die Bubble-Gruppe zurück."""
+        base_radius = 80 if bubble_type == "project" else 70
+        # Verwende den zoom-angepassten Radius für alle Kreise
+        effective_radius = self.get_effective_radius(base_radius)
+
+        label = obj.get(label_key, "")[:18]
+        color = obj.get("color") or "#222222"
+        lod = self._lod_tier()
+
+        # Bubble-Gruppe für diese Bubble erstellen
+        bubble_group = {
+            'key': self._bubble_key(obj, bubble_type),
+            'payload': obj,
+            'signature': self._bubble_signature(obj, label_key, bubble_type, assignee_getter),
+            'base_x': x,
+            'base_y': y,
+            'current_x': x,  # Aktuelle Position für kontinuierliche Animation
+            'current_y': y,  # Aktuelle Position für kontinuierliche Animation
+            'radius': effective_radius,
+            'base_radius': base_radius,  # Speichere den ursprünglichen Radius für Skalierung
+            'bubble_type': bubble_type,  # Speichere den Bubble-Typ für Skalierung
+            'on_click': on_click,
+            'label_key': label_key,  # Für den Neuaufbau beim Wechsel der Detailstufe
+            'assignee_getter': assignee_getter,
+            'lod': lod,
+            'items': [],
+            'phase': random.uniform(0, 6.28),  # Zufällige Phase für individuelle Bewegung
+            'rotation_offset': 0,  # Rotations-Offset für Ringe
+            'ring_items': []  # Separate Liste für rotierende Ringe
+        }
+        if template:
+            # Position und Animationsphase einer ersetzten Bubble übernehmen
+            for field in ('base_x', 'base_y', 'phase', 'rotation_offset'):
+                bubble_group[field] = template[field]
+
+        if bubble_type == "project" and lod != "far":
+            # Mittlere Stufe: nur ein Halo-Ring statt bis zu drei
+            halo_items = self._draw_deadline_halo(x, y, effective_radius, obj.get("deadline", ""), obj.get("project_id"),
+                                                  max_rings=3 if lod == "full" else 1)
+            if halo_items:
+                bubble_group['ring_items'].extend(halo_items)
+        
+        # Innerer Ring und Textschatten nur in voller Detailstufe
+        if bubble_type == "project":
+            oval = self.create_oval(x-effective_radius, y-effective_radius, x+effective_radius, y+effective_radius, fill="#1a1a1a", outline=color or "#444444", width=4, tags="world")
+            bubble_group['items'].append(oval)
+            if lod == "full":
                 inner_ring = self.create_oval(x-effective_radius+8, y-effective_radius+8, x+effective_radius-8, y-effective_radius-8, fill="", outline="#ffffff", width=1, tags="world")
-                bubble_group['items'].extend([oval, inner_ring])
-            else:
-                oval = self.create_oval(x-effective_radius, y-effective_radius, x+effective_radius, y+effective_radius, fill=color, outline="#555555", width=3, tags="world")
+                bubble_group['items'].append(inner_ring)
+        else:
+            oval = self.create_oval(x-effective_radius, y-effective_radius, x+effective_radius, y+effective_radius, fill=color, outline="#555555", width=3, tags="world")
+            bubble_group['items'].append(oval)
+            if lod == "full":
                 inner_ring = self.create_oval(x-effective_radius+6, y-effective_radius+6, x+effective_radius-6, y+effective_radius-6, fill="", outline="#ffffff", width=1, tags="world")
-                bubble_group['items'].extend([oval, inner_ring])
+                bubble_group['items'].append(inner_ring)
 
+        if lod != "far":
             # Text-Größe basierend auf Zoom-Level anpassen
             font_size = max(8, int(12 * self.zoom_level))  # Mindestens 8px, skaliert mit Zoom
             text_width = effective_radius * 1.6  # Text-Breite auch mit Zoom skalieren
-            text_shadow = self.create_text(x+1, y+1, text=label, fill="#000000", font=("Helvetica", font_size, "bold"), width=text_width, tags="world")
+            if lod == "full":
+                text_shadow = self.create_text(x+1, y+1, text=label, fill="#000000", font=("Helvetica", font_size, "bold"), width=text_width, tags="world")
+                bubble_group['items'].append(text_shadow)
             text = self.create_text(x, y, text=label, fill="#ffffff", font=("Helvetica", font_size, "bold"), width=text_width, tags="world")
-            bubble_group['items'].extend([text_shadow, text])
-
-            if bubble_type == "task":
-                if assignee_getter:
-                    assignees = assignee_getter(obj) or []
-                    # Handle both old single assignee format and new list format
-                    if isinstance(assignees, str):
-                        assignees = [assignees] if assignees else []
-                    elif not isinstance(assignees, list):
-                        assignees = []
-                    
-                    # Limit to 4 assignees maximum
-                    assignees = assignees[:4]
-                    
-                    if assignees:
-                        self._draw_multi_assignee_ring(x, y, effective_radius, assignees, bubble_group)
-                progress_items = self._draw_progress_ring(x, y, effective_radius, obj)
-                if progress_items:
-                    bubble_group['ring_items'].extend(progress_items)
+            bubble_group['items'].append(text)
+            bubble_group['font_size'] = font_size
 
-            def make_cb(payload): return lambda e: on_click(payload)
-            for item in bubble_group['items']:
-                self.tag_bind(item, "<Button-1>", make_cb(obj))
-                self.items_map.append((item, bubble_type, obj))
-            
-            # Auch Ring-Items für Klicks binden
-            for item in bubble_group['ring_items']:
-                self.tag_bind(item, "<Button-1>", make_cb(obj))
-                self.items_map.append((item, bubble_type, obj))
-
-            # Asteroiden für To-Do-Items hinzufügen (nur für Tasks)
-            if bubble_type == "task":
-                self._add_asteroids_to_bubble(bubble_group, obj, x, y, effective_radius)
-            
-            # Bubble-Gruppe zur Liste hinzufügen
-            self.bubble_groups.append(bubble_group)
-        
-        # Schwebebewegung starten
-        self._start_floating_animation()
-        # Asteroid-Animation starten
-        self._start_asteroid_animation()
-        
-        # Restore animation state if it was previously active
-        if was_floating_active:
-            self.floating_offset = current_floating_offset
-        
-        # Im Landkarten-Modus: Echtzeit-Skalierung nach dem Zeichnen anwenden
-        if self.zoom_mode == 'map' and self.zoom_level != 1.0:
-            # Echtzeit-Skalierung aller Bubble-Objekte
-            if hasattr(self, 'bubble_groups'):
-                for bubble_group in self.bubble_groups:
-                    if 'base_radius' not in bubble_group:
-                        continue
-                    
-                    # Radius skalieren
-                    base_radius = bubble_group['base_radius']
-                    new_radius = int(base_radius * self.zoom_level)
-                    bubble_group['radius'] = new_radius
-                    
-                    # Position mit Pan-Offset und Zoom-Skalierung
-                    base_x = bubble_group['base_x']
-                    base_y = bubble_group['base_y']
-                    # Abstände skalieren mit dem Zoom-Level
-                    scaled_x = base_x * self.zoom_level
-                    scaled_y = base_y * self.zoom_level
-                    bubble_group['current_x'] = scaled_x + self.map_offset_x
-                    bubble_group['current_y'] = scaled_y + self.map_offset_y
-                    
-                    # Alle Items in der Bubble-Gruppe aktualisieren
-                    for item in bubble_group.get('items', []):
-                        if self.type(item) in ['oval', 'arc']:
-                            # Koordinaten aktualisieren
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            radius = bubble_group['radius']
-                            
-                            if self.type(item) == 'oval':
-                                self.coords(item, x - radius, y - radius, x + radius, y + radius)
-                            elif self.type(item) == 'arc':
-                                self.coords(item, x - radius, y - radius, x + radius, y + radius)
-                    
-                    # Text-Items aktualisieren
-                    for item in bubble_group.get('items', []):
-                        if self.type(item) == 'text':
-                            # Schriftgröße skalieren
-                            base_font_size = 12
-                            new_size = max(6, int(base_font_size * self.zoom_level))
-                            self.itemconfig(item, font=("Helvetica", new_size, "bold"))
-                            
-                            # Position aktualisieren
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            self.coords(item, x, y)
-                    
-                    # Ring-Items aktualisieren
-                    for item in bubble_group.get('ring_items', []):
-                        if self.type(item) in ['oval', 'arc']:
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            radius = bubble_group['radius']
-                            ring_radius = radius + 8
-                            
-                            if self.type(item) == 'oval':
-                                self.coords(item, x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius)
-                            elif self.type(item) == 'arc':
-                                self.coords(item, x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius)
+        if bubble_type == "task" and lod != "far":
+            if assignee_getter:
+                assignees = assignee_getter(obj) or []
+                # Handle both old single assignee format and new list format
+                if isinstance(assignees, str):
+                    assignees = [assignees] if assignees else []
+                elif not isinstance(assignees, list):
+                    assignees = []
+                
+                # Limit to 4 assignees maximum
+                assignees = assignees[:4]
+                
+                if assignees:
+                    self._draw_multi_assignee_ring(x, y, effective_radius, assignees, bubble_group)
+            progress_items = self._draw_progress_ring(x, y, effective_radius, obj, with_label=lod == "full")
+            if progress_items:
+                bubble_group['ring_items'].extend(progress_items)
+
+        # Klicks laufen über die gemeinsame "bubble"-Bindung (auch für Ring-Items)
+        for item in bubble_group['items'] + bubble_group['ring_items']:
+            self.addtag_withtag("bubble", item)
+            self.group_by_item[item] = bubble_group
+        # Item-Typen einmal beim Erstellen lesen - Zoom, Pan und Animation fragen Tk nicht mehr
+        self._item_types(bubble_group)
+        self._ring_item_types(bubble_group)
+        self._geometry_changed()
+
+        # Asteroiden für To-Do-Items hinzufügen (nur für Tasks in voller Detailstufe)
+        if bubble_type == "task" and lod == "full":
+            self._add_asteroids_to_bubble(bubble_group, obj, x, y, effective_radius)
+
+        return bubble_group
+
+    def _delete_bubble_group(self, bubble_group):
+        """Entfernt alle Canvas-Elemente einer Bubble-Gruppe."""
+        for item in bubble_group['items'] + bubble_group['ring_items']:
+            self.delete(item)
+            self.group_by_item.pop(item, None)
+        self._geometry_changed()
+        for asteroid_data in bubble_group.get('asteroids', []):
+            self.delete(asteroid_data['item'])
+        payload = bubble_group['payload']
+        if self.tooltip_data is payload or self.tooltip_pending is payload:
+            self._hide_tooltip()
+        self.tooltip_texts.pop(id(payload), None)
+
+    def _update_bubbles(self, valid_objects, label_key, bubble_type, on_click, assignee_getter):
+        """
+        Diff-basiertes Aktualisieren: Bubbles werden über project_id/task_id zugeordnet.
+        Unveränderte Bubbles behalten Position und Animationsphase, geänderte werden an
+        ihrer aktuellen Position neu aufgebaut, neue hinzugefügt und entfernte gelöscht.
+        """
+        self._invalidate_animation_state()
+        new_keys = [self._bubble_key(obj, bubble_type) for obj in valid_objects]
+        wanted = set(new_keys)
+
+        # Entfernte Bubbles löschen
+        for key, group in list(self.groups_by_key.items()):
+            if key not in wanted:
+                self._delete_bubble_group(group)
+                del self.groups_by_key[key]
+
+        # Positionen nur berechnen, wenn neue Bubbles platziert werden müssen
+        positions = None
+        if any(key not in self.groups_by_key for key in new_keys):
+            positions = self._calculate_positions(valid_objects, bubble_type, 80 if bubble_type == "project" else 70)
+
+        added = False
+        bubble_groups = []
+        for i, obj in enumerate(valid_objects):
+            key = new_keys[i]
+            group = self.groups_by_key.get(key)
+            if group is None:
+                x, y = positions[i]
+                if self.pan_mode:
+                    x += self.map_offset_x
+                    y += self.map_offset_y
+                group = self._create_bubble_group(obj, x, y, label_key, bubble_type, on_click, assignee_getter)
+                added = True
+            elif group['signature'] != self._bubble_signature(obj, label_key, bubble_type, assignee_getter):
+                # Geänderte Bubble an ihrer aktuellen Position neu aufbauen
+                old_group = group
+                group = self._create_bubble_group(obj, old_group['current_x'], old_group['current_y'], label_key,
+                                                  bubble_type, on_click, assignee_getter, template=old_group)
+                self._delete_bubble_group(old_group)
+            else:
+                group['payload'] = obj
+            self.groups_by_key[key] = group
+            bubble_groups.append(group)
+        self.bubble_groups[:] = bubble_groups
+        self._geometry_changed()
+
+        if added:
+            # Neue Bubbles von bestehenden wegdrücken
+            self._push_bubbles_apart()
+        if self.floating_animation_id is None:
+            self._start_floating_animation()
+        if self.asteroid_animation_id is None:
+            self._start_asteroid_animation()
 
     def _draw_multi_assignee_ring(self, x, y, radius, assignees, bubble_group):
         """Draws a ring around the bubble with proportional color segments for multiple assignees."""
-        import math
-        
         num_assignees = len(assignees)
         if num_assignees == 0:
             return
@@ -943,15 +1100,9 @@ class BubbleCanvas(tk.Canvas):
 
     def _add_asteroids_to_bubble(self, bubble_group, task, x, y, radius):
         """Fügt Asteroiden für To-Do-Items zu einer Bubble hinzu."""
-        import json
-        import math
-        import random
-        
-        try:
-            checklist = json.loads(task.get("checklist_json", "[]"))
-            if not checklist:
-                return
-        except:
+        model = getattr(self, 'model', None)
+        checklist = model.get_checklist(task) if model else parse_checklist(task.get("checklist_json", "[]"))
+        if not checklist:
             return
         
         # Asteroiden-Liste für diese Bubble initialisieren
@@ -996,23 +1147,33 @@ class BubbleCanvas(tk.Canvas):
     def _start_asteroid_animation(self):
         """Startet die Asteroid-Animation."""
         if self.asteroid_animation_id:
-            self.after_cancel(self.asteroid_animation_id)
+            self.anim_manager.unregister(self.asteroid_animation_id)
+            self.asteroid_animation_id = None
         # Nur starten wenn Schwebebewegung aktiviert ist
         if self.app_config.get('ui', {}).get('enable_floating_animation', True):
-            self._animate_asteroids()
+            self.asteroid_animation_id = self.anim_manager.register("asteroids", self._animate_asteroids)
 
-    def _animate_asteroids(self):
-        """Animiert alle Asteroiden um ihre Bubbles."""
-        import math
-        
+    def _animate_asteroids(self, dt):
+        """Frame-Callback: animiert alle Asteroiden um ihre Bubbles."""
         # Prüfe ob Schwebebewegung aktiviert ist (gleiche Einstellung wie für Bubbles)
         if not self.app_config.get('ui', {}).get('enable_floating_animation', True):
-            return
+            self.asteroid_animation_id = None
+            return False
         
         # Verwende die gleiche Geschwindigkeit wie die Schwebebewegung
         floating_speed = self.app_config.get('ui', {}).get('floating_speed', 0.07)
+        # Schritte waren auf 6ms-Ticks ausgelegt - auf die echte Frame-Zeit skalieren
+        steps = dt / 0.006
+        
+        state = self._animation_state()
+        visible = self._visible_groups()  # Asteroiden außerhalb des Viewports ruhen
+        if state is not None:
+            # Vektorisiert: alle sichtbaren Orbits in einem Schritt, nur die Koordinaten gehen an Tk
+            for asteroid_data, coords in state.step_asteroids(steps, floating_speed, self.zoom_level):
+                self.coords(asteroid_data['item'], *coords)
+            return
         
-        for bubble_group in self.bubble_groups:
+        for bubble_group in visible:
             if 'asteroids' not in bubble_group:
                 continue
             
@@ -1022,30 +1183,24 @@ class BubbleCanvas(tk.Canvas):
                 
             for asteroid_data in bubble_group['asteroids']:
                 # Asteroid um die Bubble rotieren lassen (Geschwindigkeit basierend auf Schwebeeinstellung)
-                asteroid_data['angle'] += asteroid_data['speed'] * floating_speed * 2
-                
-                # Zentrum-Position aktualisieren
-                asteroid_data['center_x'] = current_x
-                asteroid_data['center_y'] = current_y
-                
-                # Neue Position berechnen
-                new_x = asteroid_data['center_x'] + asteroid_data['distance'] * math.cos(asteroid_data['angle'])
-                new_y = asteroid_data['center_y'] + asteroid_data['distance'] * math.sin(asteroid_data['angle'])
+                asteroid_data['angle'] += asteroid_data['speed'] * floating_speed * 2 * steps
                 
                 # Asteroid bewegen (nur die Asteroiden, nicht die Bubbles)
-                base_asteroid_size = 5 if asteroid_data.get('done', False) else 7
-                asteroid_size = int(base_asteroid_size * self.zoom_level)
-                self.coords(asteroid_data['item'], 
-                           new_x - asteroid_size, new_y - asteroid_size, 
-                           new_x + asteroid_size, new_y + asteroid_size)
-        
-        # Animation fortsetzen (gleiche Framerate wie Schwebebewegung für maximale Flüssigkeit)
-        self.asteroid_animation_id = self.after(6, self._animate_asteroids)  # Gleiche Framerate wie floating
+                self.coords(asteroid_data['item'], *self._asteroid_coords(asteroid_data, current_x, current_y))
+
+    def _asteroid_coords(self, asteroid_data, current_x, current_y):
+        """Oval-Koordinaten eines Asteroiden um das (aktualisierte) Bubble-Zentrum."""
+        asteroid_data['center_x'] = current_x
+        asteroid_data['center_y'] = current_y
+        new_x = current_x + asteroid_data['distance'] * math.cos(asteroid_data['angle'])
+        new_y = current_y + asteroid_data['distance'] * math.sin(asteroid_data['angle'])
+        base_asteroid_size = 5 if asteroid_data.get('done', False) else 7
+        asteroid_size = int(base_asteroid_size * self.zoom_level)
+        return (new_x - asteroid_size, new_y - asteroid_size,
+                new_x + asteroid_size, new_y + asteroid_size)
 
     def _calculate_priority_positions(self, num_bubbles, center_x, center_y, canvas_width, canvas_height, bubble_radius, data_list=None):
         """Berechnet Positionen basierend auf Priorität (5 = Mitte, niedrigere = außen)."""
-        import math
-        
         if num_bubbles <= 0:
             return []
         
@@ -1085,104 +1240,28 @@ class BubbleCanvas(tk.Canvas):
         return positions
 
     def _calculate_circular_positions(self, num_bubbles, center_x, center_y, canvas_width, canvas_height, bubble_radius, data_list=None):
-        """Berechnet Positionen basierend auf Task-Anzahl - höchste Anzahl in der Mitte."""
-        import math
-        import random
-        
+        """Berechnet Positionen für Tasks - meiste offene To-dos in der Mitte."""
         if num_bubbles <= 0:
             return []
         
         if num_bubbles == 1:
             return [(center_x, center_y)]
         
-        positions = []
         min_distance = bubble_radius * 2.5  # Mindestabstand zwischen Kreisen
         
-        # Sortiere Bubbles nach Task-Anzahl (höchste zuerst)
+        # Rang-Kriterien: offene To-dos (meiste zuerst = näher zur Mitte), dann geringster Fortschritt
         if data_list:
-            # Berechne Task-Anzahl für jedes Projekt
-            priority_list = []
-            for i, obj in enumerate(data_list):
-                task_count = self._get_task_count_for_project(obj)
-                priority_list.append((i, task_count, obj))
-            
-            # Sortiere nach Task-Anzahl (höchste zuerst = näher zur Mitte)
-            priority_list.sort(key=lambda x: x[1], reverse=True)
+            items = []
+            for obj in data_list:
+                stats = self._checklist_stats(obj)
+                items.append((self._bubble_key(obj, "task"), stats["total"] - stats["done"], stats["percent"]))
+            scope = data_list[0].get("project_id")
         else:
-            # Fallback: zufällige Reihenfolge
-            priority_list = [(i, 0, None) for i in range(num_bubbles)]
-        
-        # Platziere Bubbles basierend auf Task-Anzahl
-        for priority_index, (original_index, task_count, obj) in enumerate(priority_list):
-            max_attempts = 200  # Mehr Versuche für bessere Positionierung
-            position_found = False
-            
-            # Bestimme Distanz zur Mitte basierend auf Priorität
-            if priority_index == 0:  # Höchste Task-Anzahl = Mitte
-                preferred_distance = random.uniform(20, 60)
-            elif priority_index < 4:  # Top 4 = nah zur Mitte
-                preferred_distance = random.uniform(80, 120)
-            elif priority_index < 8:  # Nächste 4 = mittlere Distanz
-                preferred_distance = random.uniform(140, 200)
-            elif priority_index < 12:  # Weitere 4 = weiter weg
-                preferred_distance = random.uniform(220, 300)
-            else:  # Rest = am weitesten weg
-                preferred_distance = random.uniform(320, 500)
-            
-            for attempt in range(max_attempts):
-                if attempt == 0:
-                    # Erste Versuche: bevorzugte Distanz
-                    distance_from_center = preferred_distance
-                    angle = random.uniform(0, 2 * math.pi)
-                    x = center_x + distance_from_center * math.cos(angle)
-                    y = center_y + distance_from_center * math.sin(angle)
-                elif attempt < 50:
-                    # Variation um die bevorzugte Distanz
-                    distance_from_center = preferred_distance + random.uniform(-30, 30)
-                    angle = random.uniform(0, 2 * math.pi)
-                    x = center_x + distance_from_center * math.cos(angle)
-                    y = center_y + distance_from_center * math.sin(angle)
-                elif attempt < 100:
-                    # Erweiterte Suche um die bevorzugte Distanz
-                    distance_from_center = preferred_distance + random.uniform(-60, 60)
-                    angle = random.uniform(0, 2 * math.pi)
-                    x = center_x + distance_from_center * math.cos(angle)
-                    y = center_y + distance_from_center * math.sin(angle)
-                else:
-                    # Weite Suche - kann über den Bildschirmrand hinausgehen
-                    distance_from_center = random.uniform(50, 800)
-                    angle = random.uniform(0, 2 * math.pi)
-                    x = center_x + distance_from_center * math.cos(angle)
-                    y = center_y + distance_from_center * math.sin(angle)
-                
-                # KEINE Rand-Beschränkung - Kreise können über den Display hinausgehen
-                # Nur minimale Sicherheitsabstände
-                x = max(bubble_radius, min(canvas_width + bubble_radius * 2, x))
-                y = max(bubble_radius, min(canvas_height + bubble_radius * 2, y))
-                
-                # STRENGE Überlappungsprüfung - KEINE Überschneidungen erlaubt
-                overlaps = False
-                for existing_x, existing_y in positions:
-                    distance = math.sqrt((x - existing_x)**2 + (y - existing_y)**2)
-                    if distance < min_distance:
-                        overlaps = True
-                        break
-                
-                # Wenn keine Überlappung, Position verwenden
-                if not overlaps:
-                    # Füge kleine organische Variation hinzu
-                    x += random.uniform(-5, 5)
-                    y += random.uniform(-5, 5)
-                    
-                    positions.append((int(x), int(y)))
-                    position_found = True
-                    break
-            
-            # Wenn keine Position gefunden, verwende die letzte versuchte Position
-            if not position_found:
-                positions.append((int(x), int(y)))
+            items = [(i, 0, 999) for i in range(num_bubbles)]
+            scope = None
         
-        return positions
+        # Deterministische Relaxation mit Warmstart vom letzten Layout dieser Ansicht
+        return self.layout_engine.layout(scope, items, center_x, center_y, min_distance)
     
     def _get_task_count_for_project(self, project_obj):
         """Berechnet die Anzahl der Tasks für ein Projekt."""
@@ -1190,8 +1269,7 @@ class BubbleCanvas(tk.Canvas):
             if hasattr(self, 'model') and self.model:
                 project_id = project_obj.get('project_id')
                 if project_id:
-                    tasks = self.model.get_tasks_for_project(project_id)
-                    return len(tasks) if tasks else 0
+                    return self.model.get_project_stats(project_id)["task_count"]
             return 0
         except:
             return 0
@@ -1202,9 +1280,11 @@ class BubbleCanvas(tk.Canvas):
             return 999  # Keine Deadline = niedrigste Priorität
         
         try:
-            from datetime import datetime
-            # Parse Deadline (Format: DD.MM.YYYY)
-            deadline_date = datetime.strptime(deadline_str, "%d.%m.%Y")
+            # Parse Deadline (Format: YYYY-MM-DD, ältere Einträge DD.MM.YYYY)
+            try:
+                deadline_date = datetime.strptime(deadline_str, "%Y-%m-%d")
+            except ValueError:
+                deadline_date = datetime.strptime(deadline_str, "%d.%m.%Y")
             today = datetime.now()
             
             # Berechne Tage bis zur Deadline
@@ -1227,6 +1307,7 @@ class BubbleCanvas(tk.Canvas):
 
     def set_zoom_level(self, zoom_level):
         """Setzt den Zoom-Level und skaliert alle Elemente in Echtzeit."""
+        self._geometry_changed()
         old_zoom = self.zoom_level
         self.zoom_level = max(self.min_zoom, min(self.max_zoom, zoom_level))
         
@@ -1234,77 +1315,123 @@ class BubbleCanvas(tk.Canvas):
         if hasattr(self, 'master') and hasattr(self.master, 'zoom_var'):
             self.master.zoom_var.set(self.zoom_level)
         
-        # Im Landkarten-Modus: Echtzeit-Skalierung wie bei Asteroiden
         if self.zoom_mode == 'map':
-            # Echtzeit-Skalierung aller Bubble-Objekte
-            if hasattr(self, 'bubble_groups'):
-                for bubble_group in self.bubble_groups:
-                    if 'base_radius' not in bubble_group:
-                        continue
-                    
-                    # Radius skalieren
-                    base_radius = bubble_group['base_radius']
-                    new_radius = int(base_radius * self.zoom_level)
-                    bubble_group['radius'] = new_radius
-                    
-                    # Position mit Pan-Offset und Zoom-Skalierung
-                    base_x = bubble_group['base_x']
-                    base_y = bubble_group['base_y']
-                    # Abstände skalieren mit dem Zoom-Level
-                    scaled_x = base_x * self.zoom_level
-                    scaled_y = base_y * self.zoom_level
-                    bubble_group['current_x'] = scaled_x + self.map_offset_x
-                    bubble_group['current_y'] = scaled_y + self.map_offset_y
-                    
-                    # Alle Items in der Bubble-Gruppe aktualisieren
-                    for item in bubble_group.get('items', []):
-                        if self.type(item) in ['oval', 'arc']:
-                            # Koordinaten aktualisieren
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            radius = bubble_group['radius']
-                            
-                            if self.type(item) == 'oval':
-                                self.coords(item, x - radius, y - radius, x + radius, y + radius)
-                            elif self.type(item) == 'arc':
-                                self.coords(item, x - radius, y - radius, x + radius, y + radius)
-                    
-                    # Text-Items aktualisieren
-                    for item in bubble_group.get('items', []):
-                        if self.type(item) == 'text':
-                            # Schriftgröße skalieren
-                            base_font_size = 12
-                            new_size = max(6, int(base_font_size * self.zoom_level))
-                            self.itemconfig(item, font=("Helvetica", new_size, "bold"))
-                            
-                            # Position aktualisieren
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            self.coords(item, x, y)
-                    
-                    # Ring-Items aktualisieren
-                    for item in bubble_group.get('ring_items', []):
-                        if self.type(item) in ['oval', 'arc']:
-                            x = bubble_group['current_x']
-                            y = bubble_group['current_y']
-                            radius = bubble_group['radius']
-                            ring_radius = radius + 8
-                            
-                            if self.type(item) == 'oval':
-                                self.coords(item, x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius)
-                            elif self.type(item) == 'arc':
-                                self.coords(item, x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius)
+            # Landkarten-Modus: eine Transformation für alle Items, danach Detailstufe anpassen
+            self._scale_world(old_zoom)
+            self._apply_lod()
         else:
             # Dynamischer Modus: Normale Skalierung
+            self._apply_lod()
             self._scale_existing_bubbles()
-    
+
+    def request_zoom(self, zoom_level):
+        """Merkt einen Zoom-Wunsch (z.B. vom Slider) vor; angewendet wird höchstens einmal pro Frame."""
+        self.pending_zoom = zoom_level
+        if not self.anim_manager.is_registered("zoom"):
+            self.anim_manager.register("zoom", self._apply_pending_zoom)
+
+    def _apply_pending_zoom(self, dt):
+        """Frame-Callback (einmalig): wendet den zuletzt angeforderten Zoom an."""
+        zoom_level, self.pending_zoom = self.pending_zoom, None
+        if zoom_level is not None and zoom_level != self.zoom_level:
+            self.set_zoom_level(zoom_level)
+        return False
+
+    def _scale_world(self, old_zoom):
+        """
+        Landkarten-Zoom als eine Canvas-Transformation: alle "world"-Items werden um den
+        Pan-Ursprung skaliert, die Gruppen-Dicts rechnen dieselbe Transformation nach.
+        Schriften werden nur beim Wechsel der Schriftgröße angepasst.
+        """
+        self._invalidate_animation_state()
+        if not self.bubble_groups or not old_zoom or old_zoom == self.zoom_level:
+            return
+        factor = self.zoom_level / old_zoom
+        origin_x, origin_y = self.map_offset_x, self.map_offset_y
+        self.scale("world", origin_x, origin_y, factor, factor)
+        for bubble_group in self.bubble_groups:
+            if 'base_radius' not in bubble_group:
+                continue
+            bubble_group['radius'] = int(bubble_group['base_radius'] * self.zoom_level)
+            bubble_group['current_x'] = origin_x + (bubble_group['current_x'] - origin_x) * factor
+            bubble_group['current_y'] = origin_y + (bubble_group['current_y'] - origin_y) * factor
+            for asteroid_data in bubble_group.get('asteroids', []):
+                asteroid_data['distance'] *= factor
+        self._apply_map_fonts()
+
+    def _apply_map_fonts(self):
+        """Setzt die Schriftgröße der Bubble-Texte im Landkarten-Modus (nur wenn sie sich ändert)."""
+        new_size = max(6, int(12 * self.zoom_level))
+        for bubble_group in self.bubble_groups:
+            if bubble_group.get('font_size') == new_size:
+                continue
+            bubble_group['font_size'] = new_size
+            for item, item_type in zip(bubble_group['items'], self._item_types(bubble_group)):
+                if item_type == 'text':
+                    self.itemconfig(item, font=("Helvetica", new_size, "bold"))
+
+    def _place_map_groups(self):
+        """Setzt alle Bubbles im Landkarten-Modus absolut aus Basisposition, Zoom und Pan-Offset."""
+        self._invalidate_animation_state()
+        for bubble_group in self.bubble_groups:
+            if 'base_radius' not in bubble_group:
+                continue
+            
+            # Radius skalieren
+            radius = bubble_group['radius'] = int(bubble_group['base_radius'] * self.zoom_level)
+            
+            # Position mit Pan-Offset und Zoom-Skalierung (Abstände skalieren mit dem Zoom-Level)
+            x = bubble_group['current_x'] = bubble_group['base_x'] * self.zoom_level + self.map_offset_x
+            y = bubble_group['current_y'] = bubble_group['base_y'] * self.zoom_level + self.map_offset_y
+            
+            for item, item_type in zip(bubble_group['items'], self._item_types(bubble_group)):
+                if item_type in ('oval', 'arc'):
+                    self.coords(item, x - radius, y - radius, x + radius, y + radius)
+                elif item_type == 'text':
+                    self.coords(item, x, y)
+            
+            ring_radius = radius + 8
+            for item, item_type in zip(bubble_group['ring_items'], self._ring_item_types(bubble_group)):
+                if item_type in ('oval', 'arc'):
+                    self.coords(item, x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius)
+        self._apply_map_fonts()
+
+    def _lod_tier(self):
+        """Detailstufe zum aktuellen Zoom: 'full', 'mid' (einfache Ringe, keine Asteroiden) oder 'far' (flache Kreise)."""
+        if self.zoom_level >= config.LOD_FULL_ZOOM:
+            return "full"
+        if self.zoom_level >= config.LOD_MID_ZOOM:
+            return "mid"
+        return "far"
+
+    def _apply_lod(self):
+        """
+        Baut Bubbles, deren Detailstufe nicht mehr zum Zoom passt, an ihrer aktuellen Position neu auf.
+
+        Details werden so erst beim Überschreiten einer Schwelle erzeugt bzw. entfernt,
+        innerhalb einer Stufe bleibt es beim Skalieren der vorhandenen Items.
+        """
+        lod = self._lod_tier()
+        if all(group.get('lod', lod) == lod for group in self.bubble_groups):
+            return
+        self._invalidate_animation_state()
+        for index, old_group in enumerate(self.bubble_groups):
+            if old_group.get('lod', lod) == lod:
+                continue
+            group = self._create_bubble_group(old_group['payload'], old_group['current_x'], old_group['current_y'],
+                                              old_group['label_key'], old_group['bubble_type'], old_group['on_click'],
+                                              old_group['assignee_getter'], template=old_group)
+            self._delete_bubble_group(old_group)
+            self.bubble_groups[index] = group
+            self.groups_by_key[group['key']] = group
+
     def get_effective_radius(self, base_radius):
         """Gibt den effektiven Radius basierend auf dem Zoom-Level zurück."""
         return int(base_radius * self.zoom_level)
     
     def _scale_existing_bubbles(self):
         """Skaliert alle bestehenden Bubbles in Echtzeit und drückt sie gegenseitig weg."""
-        import math
+        self._invalidate_animation_state()
         
         # Erste Phase: Skaliere alle Radien
         for bubble_group in self.bubble_groups:
@@ -1349,10 +1476,11 @@ class BubbleCanvas(tk.Canvas):
             x, y = bubble_group['current_x'], bubble_group['current_y']
             
             # Offset bereits in der Positionierung angewendet, nicht nochmal
+            item_types = self._item_types(bubble_group)
             
             # Skaliere alle Oval-Elemente (Hauptkreis und innerer Ring)
-            for i, item in enumerate(bubble_group['items']):
-                if self.type(item) == 'oval':
+            for i, (item, item_type) in enumerate(zip(bubble_group['items'], item_types)):
+                if item_type == 'oval':
                     if i == 0:  # Hauptkreis
                         self.coords(item, x-new_radius, y-new_radius, x+new_radius, y+new_radius)
                     elif i == 1:  # Innerer Ring
@@ -1363,9 +1491,10 @@ class BubbleCanvas(tk.Canvas):
             # Skaliere Text-Größe und -Breite
             font_size = max(8, int(12 * self.zoom_level))  # Mindestens 8px, skaliert mit Zoom
             text_width = new_radius * 1.6
+            bubble_group['font_size'] = font_size
             
-            for item in bubble_group['items']:
-                if self.type(item) == 'text':
+            for item, item_type in zip(bubble_group['items'], item_types):
+                if item_type == 'text':
                     # Text-Größe und -Breite anpassen
                     self.itemconfig(item, font=("Helvetica", font_size, "bold"), width=text_width)
             
@@ -1374,12 +1503,12 @@ class BubbleCanvas(tk.Canvas):
                 for asteroid_data in bubble_group['asteroids']:
                     # Aktualisiere die Orbit-Distanz basierend auf dem neuen Radius
                     asteroid_data['distance'] = new_radius + 30 + (bubble_group['asteroids'].index(asteroid_data) * 5)
-                    # Aktualisiere die Zentrum-Position
-                    asteroid_data['center_x'] = x
-                    asteroid_data['center_y'] = y
+                    # Zentrum aktualisieren und Asteroid sofort nachziehen (auch ohne Animation)
+                    self.coords(asteroid_data['item'], *self._asteroid_coords(asteroid_data, x, y))
     
     def _redraw_all_bubbles(self):
         """Zeichnet alle Bubbles mit aktuellen Positionen und Größen."""
+        self._invalidate_animation_state()
         for bubble_group in self.bubble_groups:
             if 'base_radius' not in bubble_group:
                 continue
@@ -1417,36 +1546,45 @@ class BubbleCanvas(tk.Canvas):
     
     def _push_bubbles_apart(self):
         """Drückt Bubbles gegenseitig weg um Überlappungen zu vermeiden, bevorzugt Positionen im Fenster."""
-        import math
+        self._invalidate_animation_state()
         
         max_iterations = 50
         canvas_width = self.winfo_width()
         canvas_height = self.winfo_height()
         
+        groups = [g for g in self.bubble_groups if 'current_x' in g]
+        if len(groups) < 2:
+            return
+        start = [(g.get('current_x'), g.get('current_y')) for g in self.bubble_groups]
+        # Zellgröße = größter möglicher Mindestabstand, dann genügen die Nachbarzellen
+        max_radius = max(g.get('radius', 0) for g in groups)
+        reach = max_radius * 2 * 1.1
+        grid = SpatialHash(reach)
+        
         for iteration in range(max_iterations):
             overlaps_found = False
+            grid.clear()
+            for j, bubble in enumerate(groups):
+                grid.insert(j, bubble['current_x'], bubble['current_y'])
             
-            # Prüfe alle Bubbles auf Überlappungen
-            for i, bubble1 in enumerate(self.bubble_groups):
-                if 'current_x' not in bubble1:
-                    continue
-                    
-                x1, y1 = bubble1['current_x'], bubble1['current_y']
-                r1 = bubble1.get('radius', 0)
-                
-                for j, bubble2 in enumerate(self.bubble_groups[i+1:], i+1):
-                    if 'current_x' not in bubble2:
+            # Prüfe alle Bubbles auf Überlappungen (nur Nachbarzellen)
+            for i, bubble1 in enumerate(groups):
+                for j in sorted(grid.candidates(bubble1['current_x'], bubble1['current_y'], reach)):
+                    if j <= i:
                         continue
-                        
+                    bubble2 = groups[j]
+                    x1, y1 = bubble1['current_x'], bubble1['current_y']
+                    r1 = bubble1.get('radius', 0)
                     x2, y2 = bubble2['current_x'], bubble2['current_y']
                     r2 = bubble2.get('radius', 0)
                     
-                    # Berechne Distanz zwischen den Zentren
-                    distance = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+                    # Quadrierte Distanz zwischen den Zentren
+                    distance_sq = (x1 - x2)**2 + (y1 - y2)**2
                     min_required_distance = (r1 + r2) * 1.1  # 10% Puffer
                     
-                    if distance < min_required_distance:
+                    if distance_sq < min_required_distance * min_required_distance:
                         overlaps_found = True
+                        distance = math.sqrt(distance_sq)
                         
                         # Berechne Richtungsvektor zwischen den Bubbles
                         if distance > 0:
@@ -1454,7 +1592,7 @@ class BubbleCanvas(tk.Canvas):
                             dy = (y2 - y1) / distance
                         else:
                             # Falls sie exakt übereinander sind, zufällige Richtung
-                            angle = math.pi * 2 * (i / len(self.bubble_groups))
+                            angle = math.pi * 2 * (i / len(groups))
                             dx = math.cos(angle)
                             dy = math.sin(angle)
                         
@@ -1510,6 +1648,12 @@ class BubbleCanvas(tk.Canvas):
             
             if not overlaps_found:
                 break
+
+        # Verschobene Bubbles auch auf dem Canvas nachziehen - die Schwebe-Animation
+        # (die das sonst mit erledigt) kann deaktiviert sein
+        for index, group in enumerate(self.bubble_groups):
+            if (group.get('current_x'), group.get('current_y')) != start[index]:
+                self._sync_group(index)
     
     def _is_position_in_window(self, x, y, radius, canvas_width, canvas_height):
         """Prüft ob eine Position mit gegebenem Radius im Fenster liegt."""
@@ -1519,23 +1663,19 @@ class BubbleCanvas(tk.Canvas):
     
     def _check_for_overlaps_and_auto_zoom(self, positions, bubble_radius):
         """Prüft auf Überlappungen und zoomt automatisch für optimale Größe."""
-        import math
-        
         if not self.auto_zoom_enabled:
             return False
             
         min_distance = bubble_radius * 2.5
         
-        # Prüfe alle Bubbles auf Überlappungen
+        # Prüfe alle Bubbles auf Überlappungen (räumlicher Index statt Paarvergleich)
         has_overlaps = False
+        grid = SpatialHash(min_distance)
         for i, (x1, y1) in enumerate(positions):
-            for j, (x2, y2) in enumerate(positions[i+1:], i+1):
-                distance = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-                if distance < min_distance:
-                    has_overlaps = True
-                    break
-            if has_overlaps:
+            if grid.has_within(x1, y1, min_distance):
+                has_overlaps = True
                 break
+            grid.insert(i, x1, y1)
         
         if has_overlaps:
             # Überlappung gefunden - zoom raus
@@ -1554,37 +1694,29 @@ class BubbleCanvas(tk.Canvas):
     def _calculate_project_workload(self, project_id):
         """Berechnet die Arbeitslast eines Projekts basierend auf Tasks und ToDos."""
         try:
-            # Alle Tasks für dieses Projekt holen
-            tasks = self.model.get_tasks_for_project(project_id) if hasattr(self, 'model') else []
-            if not tasks:
+            if not getattr(self, 'model', None):
+                return 0, 0
+            # Aggregat wird vom Model inkrementell gepflegt
+            stats = self.model.get_project_stats(project_id)
+            if not stats["task_count"]:
                 return 0, 0  # Keine Tasks = keine Arbeitslast
             
-            total_todos = 0
-            completed_todos = 0
-            total_tasks = len(tasks)
-            
-            for task in tasks:
-                try:
-                    checklist = json.loads(task.get("checklist_json", "[]"))
-                    if checklist:
-                        total_todos += len(checklist)
-                        completed_todos += sum(1 for item in checklist if item.get("done", False))
-                except:
-                    continue
-            
             # Arbeitslast = Anzahl Tasks + Anzahl ToDos
-            workload = total_tasks + total_todos
-            completion_rate = int((completed_todos / total_todos) * 100) if total_todos > 0 else 100
-            
-            return workload, completion_rate
+            return stats["workload"], stats["completion_rate"]
         except:
             return 0, 0
 
-    def _draw_deadline_halo(self, x, y, radius, deadline, project_id=None):
+    def _draw_deadline_halo(self, x, y, radius, deadline, project_id=None, max_rings=3):
         if not self.app_config.get('ui', {}).get('enable_deadline_halo', True) or not deadline:
             return []
         try:
-            days_until = (datetime.strptime(deadline, "%Y-%m-%d") - datetime.now()).days
+            if project_id and getattr(self, 'model', None):
+                # Deadline ist im Projekt-Aggregat bereits geparst
+                days_until = self.model.get_project_stats(project_id)["days_until"]
+                if days_until is None:
+                    return []
+            else:
+                days_until = (datetime.strptime(deadline, "%Y-%m-%d") - datetime.now()).days
             
             # Arbeitslast berechnen (nur Anzahl Tasks)
             workload, _ = self._calculate_project_workload(project_id) if project_id else (0, 100)
@@ -1608,6 +1740,7 @@ class BubbleCanvas(tk.Canvas):
                 num_rings = 2
             else:  # 1-3 Tasks = 1 Ring
                 num_rings = 1
+            num_rings = min(num_rings, max_rings)
 
             # 4. Ringe zeichnen
             halo_items = []
@@ -1621,7 +1754,7 @@ class BubbleCanvas(tk.Canvas):
         except: 
             return []
 
-    def _draw_progress_ring(self, x, y, radius, task):
+    def _draw_progress_ring(self, x, y, radius, task, with_label=True):
         if not self.app_config.get('ui', {}).get('enable_progress_ring', True):
             return []
         progress = self._calculate_task_progress(task)
@@ -1633,32 +1766,146 @@ class BubbleCanvas(tk.Canvas):
         ring_items.append(self.create_arc(x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius, start=0, extent=360, outline="#333333", width=3, style="arc", tags="world"))
         progress_color = "#00ff88" if progress == 100 else "#0088ff"
         ring_items.append(self.create_arc(x - ring_radius, y - ring_radius, x + ring_radius, y + ring_radius, start=90, extent=progress_angle, outline=progress_color, width=3, style="arc", tags="world"))
-        ring_items.append(self.create_text(x, y + ring_radius + 15, text=f"{progress}%", fill="white", font=("Helvetica", 8, "bold"), tags="world"))
+        if with_label:
+            ring_items.append(self.create_text(x, y + ring_radius + 15, text=f"{progress}%", fill="white", font=("Helvetica", 8, "bold"), tags="world"))
         return ring_items
 
     def _calculate_task_progress(self, task):
-        try:
-            checklist = json.loads(task.get("checklist_json", "[]"))
-            if not checklist: return 0
-            done = sum(1 for item in checklist if item.get("done", False))
-            return int((done / len(checklist)) * 100) if checklist else 0
-        except:
-            return 0
+        return self._checklist_stats(task)["percent"]
+
+    def _checklist_stats(self, task):
+        """Checklisten-Kennzahlen aus dem Cache des Models (ohne Model direkt geparst)."""
+        model = getattr(self, 'model', None)
+        if model:
+            return model.get_checklist_stats(task)
+        return checklist_stats(parse_checklist(task.get("checklist_json", "[]")))
 
     def redraw(self): pass # Redraws are handled externally
 
+    def _on_configure(self, event):
+        self.visible_groups = None  # Viewport-Größe hat sich geändert
+        self.redraw()
+
+    def _geometry_changed(self):
+        """Positionen oder Größen der Bubbles haben sich geändert: Hover-Index und Sichtbarkeit verwerfen."""
+        self.hover_index = None
+        self.visible_groups = None
+
+    def _visible_groups(self):
+        """
+        Gruppen, deren Bubble, Ringe oder Asteroiden den sichtbaren Bereich berühren.
+
+        Nur diese werden pro Frame animiert. Gruppen, die den Viewport betreten oder
+        verlassen, werden einmal auf ihre aktuelle Position nachgezogen.
+        """
+        if self.visible_groups is not None:
+            return self.visible_groups
+        x0, y0 = self.canvasx(0), self.canvasy(0)
+        x1, y1 = x0 + self.winfo_width(), y0 + self.winfo_height()
+        visible, indices, changed = [], [], []
+        for index, group in enumerate(self.bubble_groups):
+            reach = group['radius'] + self.CULL_MARGIN
+            if group.get('asteroids'):
+                reach = max(reach, max(a['distance'] for a in group['asteroids']) + 10)
+            x, y = self._group_position(index)
+            inside = x + reach >= x0 and x - reach <= x1 and y + reach >= y0 and y - reach <= y1
+            if inside:
+                visible.append(group)
+                indices.append(index)
+            if inside != (id(group) in self.visible_ids):
+                changed.append(index)
+        self.visible_groups = visible
+        self.visible_ids = {id(group) for group in visible}
+        self.visibility_age = 0.0
+        if self.anim_state is not None:
+            self.anim_state.set_active(indices)
+        for index in changed:
+            self._sync_group(index)
+        return visible
+
+    def _sync_group(self, index):
+        """Zieht alle Items einer Gruppe (Bubble, Ringe, Asteroiden) auf ihre aktuelle Position nach."""
+        group = self.bubble_groups[index]
+        x, y = self._group_position(index)
+        state = self.anim_state
+        self._update_bubble_items(group, x, y)
+        self._rotate_ring_items(group, x, y, None if state is None else float(state.rotation[index]))
+        if not group.get('asteroids'):
+            return
+        if state is not None:
+            pairs = state.asteroid_coords(state.group_asteroids(index), self.zoom_level)
+        else:
+            pairs = [(a, self._asteroid_coords(a, x, y)) for a in group['asteroids']]
+        for asteroid_data, coords in pairs:
+            self.coords(asteroid_data['item'], *coords)
+
     def _on_mouse_move(self, event):
         if not self.app_config.get('ui', {}).get('enable_tooltips', True): return
-        item = self.find_closest(event.x, event.y)
-        if not item: self._hide_tooltip(); return
+        # Nur die letzte Position merken - ausgewertet wird einmal pro Frame
+        self.hover_pointer = (event.x, event.y, event.x_root, event.y_root)
+        if not self.anim_manager.is_registered("hover"):
+            self.anim_manager.register("hover", self._process_hover)
+
+    def _process_hover(self, dt):
+        """Frame-Callback (einmalig): Tooltip für die Bubble unter der letzten Mausposition."""
+        pointer, self.hover_pointer = self.hover_pointer, None
+        if pointer:
+            x, y, x_root, y_root = pointer
+            group = self._group_at(self.canvasx(x), self.canvasy(y))
+            if group:
+                self._show_tooltip(x_root, y_root, group['payload'], group['bubble_type'])
+            else:
+                self._hide_tooltip()
+        return False
 
-        for item_id, item_type, payload in self.items_map:
-            if item_id == item[0]:
-                self._show_tooltip(event.x_root, event.y_root, payload, item_type)
-                return
+    def _group_at(self, x, y):
+        """Bubble-Gruppe, deren Kreis (inkl. Ringe) den Punkt enthält - die nächste gewinnt."""
+        drift = self._float_drift_margin() or 0
+        if self.hover_index is None or drift != self.hover_drift:
+            # Index über die aktuellen Mittelpunkte, nur nach Geometrie-Änderungen neu aufgebaut.
+            # Die Schwebe-Drift verschiebt Bubbles nur um wenige Pixel - der Index bleibt über
+            # Frames gültig, weil die Suchweite um den maximalen Drift-Weg erweitert wird
+            self.hover_drift = drift
+            self.hover_reach = max((g['radius'] for g in self.bubble_groups), default=0) + self.HOVER_MARGIN + drift
+            self.hover_index = SpatialHash(2 * self.hover_reach)
+            for index in range(len(self.bubble_groups)):
+                self.hover_index.insert(index, *self._group_position(index))
+        best, best_dist = None, None
+        for index in self.hover_index.candidates(x, y, self.hover_reach):
+            group = self.bubble_groups[index]
+            reach = group['radius'] + self.HOVER_MARGIN
+            group_x, group_y = self._group_position(index)
+            dist = (group_x - x) ** 2 + (group_y - y) ** 2
+            if dist <= reach * reach and (best_dist is None or dist < best_dist):
+                best, best_dist = group, dist
+        return best
+
+    def _float_drift_margin(self):
+        """
+        Maximaler Weg (Pixel), den eine Bubble durch die Schwebe-Drift von einer Position
+        aus zurücklegen kann, oder None, wenn die Drift nicht beschränkt ist.
+        """
+        if not self.app_config.get('ui', {}).get('enable_floating_animation', True):
+            return 0
+        floating_speed = self.app_config.get('ui', {}).get('floating_speed', 0.07)
+        if floating_speed <= 0:
+            return None
+        # Drift pro Schritt: sin(Phase * k) * a * 0.05 bei Phasenfortschritt floating_speed -
+        # aufintegriert eine Schwingung mit Amplitude a * 0.05 / (floating_speed * k) je Achse
+        amplitude_x = 0.8 * 0.05 / (floating_speed * 0.3)
+        amplitude_y = 1.2 * 0.05 / (floating_speed * 0.5)
+        return math.hypot(2 * amplitude_x, 2 * amplitude_y) + 1  # +1 px für die Frame-Diskretisierung
+
+    def _on_bubble_click(self, event):
+        items = self.find_withtag("current")
+        group = self.group_by_item.get(items[0]) if items else None
+        if group and group.get('on_click'):
+            # Klick liefert immer den aktuellen Record der Gruppe
+            group['on_click'](group['payload'])
+
+    def _on_mouse_leave(self, event):
+        self.hover_pointer = None
         self._hide_tooltip()
-
-    def _on_mouse_leave(self, event): self._hide_tooltip()
     
     # Mausrad-Zoom komplett entfernt
     
@@ -1705,7 +1952,7 @@ class BubbleCanvas(tk.Canvas):
                                 self.itemconfig(item, width=new_width)
                             except ValueError:
                                 pass
-        except Exception as e:
+        except Exception:
             # Fehler beim Style-Anpassen ignorieren
             pass
     
@@ -1726,17 +1973,35 @@ class BubbleCanvas(tk.Canvas):
             delta_x = event.x - self.pan_start_x
             delta_y = event.y - self.pan_start_y
             
-            # Aktualisiere Offset mit Begrenzung
-            self.map_offset_x = self.pan_start_offset_x + delta_x
-            self.map_offset_y = self.pan_start_offset_y + delta_y
-            
-            # Begrenze Offset auf vernünftige Werte
+            # Ziel-Offset mit Begrenzung auf vernünftige Werte
             max_offset = 5000  # Maximaler Offset
-            self.map_offset_x = max(-max_offset, min(max_offset, self.map_offset_x))
-            self.map_offset_y = max(-max_offset, min(max_offset, self.map_offset_y))
+            target_x = max(-max_offset, min(max_offset, self.pan_start_offset_x + delta_x))
+            target_y = max(-max_offset, min(max_offset, self.pan_start_offset_y + delta_y))
             
-            # Schnelle Position-Update ohne vollständiges Neuzeichnen
-            self._update_bubble_positions()
+            # Nur vormerken - verschoben wird einmal pro Frame
+            self.pending_pan = (target_x, target_y)
+            if not self.anim_manager.is_registered("pan"):
+                self.anim_manager.register("pan", self._apply_pending_pan)
+
+    def _apply_pending_pan(self, dt):
+        """Frame-Callback (einmalig): verschiebt die ganze Szene per move() um die aufgelaufene Differenz."""
+        target, self.pending_pan = self.pending_pan, None
+        if target is None:
+            return False
+        dx = target[0] - self.map_offset_x
+        dy = target[1] - self.map_offset_y
+        if dx or dy:
+            self.map_offset_x, self.map_offset_y = target
+            # Ein Tk-Aufruf für alle Items, die Gruppen-Dicts ziehen die Verschiebung nach
+            self.move("world", dx, dy)
+            if self.anim_state is not None:
+                self.anim_state.translate(dx, dy)
+            else:
+                for bubble_group in self.bubble_groups:
+                    bubble_group['current_x'] += dx
+                    bubble_group['current_y'] += dy
+            self._geometry_changed()
+        return False
     
     def _on_pan_end(self, event):
         """Beendet Pan-Navigation."""
@@ -1752,147 +2017,164 @@ class BubbleCanvas(tk.Canvas):
         else:
             self.config(cursor="")
     
-    def _update_bubble_positions(self):
-        """Aktualisiert alle Bubble-Positionen für flüssige Pan-Animation."""
-        for bubble_group in self.bubble_groups:
-            if 'base_radius' not in bubble_group:
-                continue
-                
-            # Berechne neue Position mit Offset und Zoom-Skalierung
-            base_x = bubble_group['base_x']
-            base_y = bubble_group['base_y']
-            
-            # Im Landkarten-Modus: Abstände skalieren mit Zoom-Level
-            if self.zoom_mode == 'map':
-                scaled_x = base_x * self.zoom_level
-                scaled_y = base_y * self.zoom_level
-                new_x = scaled_x + self.map_offset_x
-                new_y = scaled_y + self.map_offset_y
-            else:
-                # Dynamischer Modus: Normale Positionierung
-                new_x = base_x + self.map_offset_x
-                new_y = base_y + self.map_offset_y
-            
-            # Aktualisiere aktuelle Position
-            bubble_group['current_x'] = new_x
-            bubble_group['current_y'] = new_y
-            
-            # Aktualisiere alle Canvas-Elemente dieser Bubble
-            self._update_bubble_canvas_items(bubble_group)
-    
-    def _update_bubble_canvas_items(self, bubble_group):
-        """Aktualisiert alle Canvas-Elemente einer Bubble-Gruppe."""
-        try:
-            x = bubble_group['current_x']
-            y = bubble_group['current_y']
-            radius = bubble_group['radius']
-            
-            # Debug: Prüfe ob Koordinaten gültig sind
-            if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
-                return
-            if abs(x) > 10000 or abs(y) > 10000:  # Unrealistische Koordinaten
-                return
-            
-            # Aktualisiere alle Oval-Elemente (Hauptkreis und innerer Ring)
-            for i, item in enumerate(bubble_group['items']):
-                if self.type(item) == 'oval':
-                    if i == 0:  # Hauptkreis
-                        self.coords(item, x-radius, y-radius, x+radius, y+radius)
-                    elif i == 1:  # Innerer Ring
-                        offset = 8 if bubble_group.get('bubble_type') == 'project' else 6
-                        self.coords(item, x-radius+offset, y-radius+offset, 
-                                   x+radius-offset, y+radius-offset)
-            
-            # Aktualisiere Text-Position
-            for item in bubble_group['items']:
-                if self.type(item) == 'text':
-                    self.coords(item, x, y)
-            
-            # Aktualisiere Ring-Elemente
-            if 'ring_items' in bubble_group:
-                self._update_ring_items(bubble_group)
-                
-        except Exception as e:
-            # Falls ein Item nicht mehr existiert, ignorieren
-            pass
-    
-    def _update_ring_items(self, bubble_group):
-        """Aktualisiert Ring-Elemente (Deadline-Halos, Progress-Ringe) für Pan."""
-        try:
-            x = bubble_group['current_x']
-            y = bubble_group['current_y']
-            radius = bubble_group['radius']
-            
-            for i, item in enumerate(bubble_group['ring_items']):
-                if self.type(item) == 'arc':
-                    # Arc-Elemente (Deadline-Halos, Progress-Ringe)
-                    arc_radius = radius + 15 + (i % 3) * 5
-                    x1 = x - arc_radius
-                    y1 = y - arc_radius
-                    x2 = x + arc_radius
-                    y2 = y + arc_radius
-                    self.coords(item, x1, y1, x2, y2)
-                elif self.type(item) == 'oval':
-                    # Oval-Ringe
-                    ring_radius = radius + 8
-                    x1 = x - ring_radius
-                    y1 = y - ring_radius
-                    x2 = x + ring_radius
-                    y2 = y + ring_radius
-                    self.coords(item, x1, y1, x2, y2)
-        except Exception as e:
-            # Falls ein Item nicht mehr existiert, ignorieren
-            pass
+    def _cancel_tooltip(self):
+        """Bricht einen noch ausstehenden (verzögerten) Tooltip ab."""
+        if self.tooltip_after_id:
+            self.after_cancel(self.tooltip_after_id)
+            self.tooltip_after_id = None
+        self.tooltip_pending = None
 
     def _hide_tooltip(self):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+        self._cancel_tooltip()
+        if self.tooltip_data is not None:
+            self.tooltip.withdraw()
             self.tooltip_data = None
 
     def _show_tooltip(self, x, y, payload, item_type):
-        if self.tooltip_data == payload: return
-        self._hide_tooltip()
+        """Zeigt den Tooltip - beim ersten Hover erst nach TOOLTIP_DELAY_MS, danach sofort."""
+        if self.tooltip_data is payload: return
+        if self.tooltip_data is not None:
+            # Tooltip ist schon sichtbar: direkt zur neuen Bubble wechseln
+            self._cancel_tooltip()
+            self._display_tooltip(x, y, payload, item_type)
+            return
+        if self.tooltip_pending is payload: return
+        self._cancel_tooltip()
+        self.tooltip_pending = payload
+        self.tooltip_after_id = self.after(config.TOOLTIP_DELAY_MS, lambda: self._display_tooltip(x, y, payload, item_type))
+
+    def _display_tooltip(self, x, y, payload, item_type):
+        self.tooltip_after_id = None
+        self.tooltip_pending = None
+        if self.tooltip is None:
+            self.tooltip = tk.Toplevel(self)
+            self.tooltip.wm_overrideredirect(True)
+            self.tooltip.withdraw()
+            self.tooltip_label = tk.Label(self.tooltip, bg="#1a1a1a", fg="#ffffff", font=("Helvetica", 9), relief="solid", bd=1, padx=8, pady=4, justify="left")
+            self.tooltip_label.pack()
+        self.tooltip_label.config(text=self._tooltip_text(payload, item_type))
+        self.tooltip.wm_geometry(f"+{x+15}+{y+10}")
+        if self.tooltip_data is None:
+            self.tooltip.deiconify()
+            self.tooltip.lift()
+        self.tooltip_data = payload
 
+    def _tooltip_text(self, payload, item_type):
+        """Tooltip-Text aus dem Cache; neu erzeugt, sobald sich die angezeigten Felder ändern."""
         if item_type == "project":
-            content = f"Projekt: {payload.get('name', '')}\nDeadline: {payload.get('deadline', 'N/A')}"
+            signature = (payload.get('name', ''), payload.get('deadline', 'N/A'))
         else:
-            content = f"Task: {payload.get('name', '')}\nBearbeiter: {payload.get('assignee', 'N/A')}\nFortschritt: {self._calculate_task_progress(payload)}%"
+            signature = (payload.get('name', ''), payload.get('assignee', 'N/A'), payload.get('checklist_json', '[]'))
+        cached = self.tooltip_texts.get(id(payload))
+        if cached and cached[0] == signature:
+            return cached[1]
+        if item_type == "project":
+            content = f"Projekt: {signature[0]}\nDeadline: {signature[1]}"
+        else:
+            content = f"Task: {signature[0]}\nBearbeiter: {signature[1]}\nFortschritt: {self._calculate_task_progress(payload)}%"
+        self.tooltip_texts[id(payload)] = (signature, content)
+        return content
 
-        self.tooltip = tk.Toplevel(self)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x+15}+{y+10}")
-        tk.Label(self.tooltip, text=content, bg="#1a1a1a", fg="#ffffff", font=("Helvetica", 9), relief="solid", bd=1, padx=8, pady=4).pack()
-        self.tooltip_data = payload
+    # Anzahl vorgerenderter Twinkle-Phasen und Sizes, für die Frames im Cache bleiben
+    GALAXY_FRAMES = 6
+    GALAXY_CACHE_SIZES = 2
 
     def _generate_galaxy_stars(self):
         self.stars.clear()
-        w, h = self.winfo_width(), self.winfo_height()
-        if w < 50 or h < 50: return
+        self.galaxy_frames.clear()
         for _ in range(100):
-            self.stars.append({'x': random.randint(0, w), 'y': random.randint(0, h), 'size': random.choice([1, 2, 3]), 'brightness': random.randint(50, 150), 'speed': random.uniform(0.5, 2.0), 'phase': random.uniform(0, 6.28)})
+            self.stars.append({'x': random.random(), 'y': random.random(), 'size': random.choice([1, 2, 3]), 'brightness': random.randint(50, 150), 'speed': random.uniform(0.5, 2.0), 'phase': random.uniform(0, 6.28)})
 
     def _animate_galaxy(self):
+        """Startet die Hintergrund-Animation im gemeinsamen Frame-Scheduler."""
         if not self.app_config.get('ui', {}).get('enable_galaxy_bg', False):
-            if self.galaxy_animation_id: self.after_cancel(self.galaxy_animation_id)
+            self.anim_manager.unregister("galaxy")
             self.galaxy_animation_id = None
             return
+        # Mit Pillow werden nur vorgerenderte Frames getauscht - dafür reicht ein langsamer Takt
+        interval = 0.25 if PILLOW_AVAILABLE else 0.05
+        self.galaxy_animation_id = self.anim_manager.register("galaxy", self._galaxy_frame, interval=interval)
+
+    @staticmethod
+    def _star_color(star, angle):
+        """Grauwert eines Sterns beim Twinkle-Winkel, None wenn er zu dunkel ist."""
+        twinkle = 0.5 + 0.5 * math.sin(star['phase'] + angle)
+        brightness = int(star['brightness'] * twinkle)
+        if brightness <= 80:
+            return None
+        level = min(brightness // 3, 80)
+        return f"#{level:02x}{level:02x}{level:02x}"
+
+    def _galaxy_frame(self, dt):
+        """Frame-Callback: tauscht das Sternenhimmel-Bild bzw. bewegt den Stern-Pool."""
+        if not self.app_config.get('ui', {}).get('enable_galaxy_bg', False):
+            self.delete("galaxy")
+            self.galaxy_image_item = None
+            self.star_items = []
+            self.galaxy_animation_id = None
+            return False
 
-        self.delete("galaxy")
-        self.galaxy_animation_offset += 0.01
         w, h = self.winfo_width(), self.winfo_height()
         if w < 50 or h < 50: return
+        if not self.stars:
+            self._generate_galaxy_stars()
 
-        for star in self.stars:
-            x = (star['x'] + self.galaxy_animation_offset * star['speed'] * 5) % w
-            y = (star['y'] + self.galaxy_animation_offset * star['speed'] * 3) % h
-            twinkle = 0.5 + 0.5 * math.sin(star['phase'] + self.galaxy_animation_offset * star['speed'])
-            brightness = int(star['brightness'] * twinkle)
-            if brightness > 80:
-                color = f"#{min(brightness//3, 80):02x}{min(brightness//3, 80):02x}{min(brightness//3, 80):02x}"
-                self.create_oval(x-star['size'], y-star['size'], x+star['size'], y+star['size'], fill=color, outline="", tags="galaxy")
+        frames = self._galaxy_frames_for(w, h) if PILLOW_AVAILABLE else None
+        if frames:
+            self.galaxy_frame_index = (self.galaxy_frame_index + 1) % len(frames)
+            if self.galaxy_image_item is None:
+                self.galaxy_image_item = self.create_image(0, 0, anchor="nw", image=frames[self.galaxy_frame_index], tags="galaxy")
+                self.tag_lower("galaxy")
+            else:
+                self.itemconfig(self.galaxy_image_item, image=frames[self.galaxy_frame_index])
+            return
+        self._move_star_pool(dt, w, h)
 
-        self.galaxy_animation_id = self.after(50, self._animate_galaxy)
+    def _galaxy_frames_for(self, w, h):
+        """Twinkle-Frames für die Canvas-Größe - einmal mit Pillow gerendert und gecacht."""
+        frames = self.galaxy_frames.get((w, h))
+        if frames is not None:
+            return frames
+        try:
+            frames = []
+            for index in range(self.GALAXY_FRAMES):
+                # Phasen gleichmäßig über eine Periode verteilt, damit der Frame-Zyklus nahtlos ist
+                angle = 2 * math.pi * index / self.GALAXY_FRAMES
+                img = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+                draw = ImageDraw.Draw(img)
+                for star in self.stars:
+                    color = self._star_color(star, angle)
+                    if color:
+                        x, y, size = star['x'] * w, star['y'] * h, star['size']
+                        draw.ellipse([x-size, y-size, x+size, y+size], fill=color)
+                frames.append(ImageTk.PhotoImage(img, master=self))
+        except Exception as e:
+            print(f"Galaxy-Hintergrund konnte nicht gerendert werden: {e}")
+            return None
+        # Nur die zuletzt genutzten Größen behalten (Fenster-Resize erzeugt viele Zwischengrößen)
+        while len(self.galaxy_frames) >= self.GALAXY_CACHE_SIZES:
+            self.galaxy_frames.pop(next(iter(self.galaxy_frames)))
+        self.galaxy_frames[(w, h)] = frames
+        return frames
+
+    def _move_star_pool(self, dt, w, h):
+        """Fallback ohne Pillow: ein fester Pool von Ovalen wird per coords/itemconfig bewegt."""
+        if len(self.star_items) != len(self.stars):
+            self.delete("galaxy")
+            self.star_items = [self.create_oval(0, 0, 0, 0, outline="", state="hidden", tags="galaxy") for _ in self.stars]
+            self.tag_lower("galaxy")
+        self.galaxy_animation_offset += 0.01 * dt / 0.05
+        offset = self.galaxy_animation_offset
+        for item, star in zip(self.star_items, self.stars):
+            color = self._star_color(star, offset * star['speed'])
+            if color is None:
+                self.itemconfig(item, state="hidden")
+                continue
+            x = (star['x'] * w + offset * star['speed'] * 5) % w
+            y = (star['y'] * h + offset * star['speed'] * 3) % h
+            size = star['size']
+            self.coords(item, x-size, y-size, x+size, y+size)
+            self.itemconfig(item, fill=color, state="normal")
 
     def _start_floating_animation(self):
         """Startet die Schwebebewegung für alle Bubbles."""
@@ -1901,24 +2183,39 @@ class BubbleCanvas(tk.Canvas):
         
         # Stoppe vorherige Animation falls vorhanden
         if self.floating_animation_id:
-            self.after_cancel(self.floating_animation_id)
+            self.anim_manager.unregister(self.floating_animation_id)
         
-        self._animate_floating()
+        self.floating_animation_id = self.anim_manager.register("floating", self._animate_floating)
 
-    def _animate_floating(self):
-        """Animiert die Schwebebewegung aller Bubbles."""
-        if not self.bubble_groups:
-            return
-        
+    def _animate_floating(self, dt):
+        """Frame-Callback: animiert die Schwebebewegung aller Bubbles."""
         # Prüfe ob Schwebebewegung aktiviert ist
-        if not self.app_config.get('ui', {}).get('enable_floating_animation', True):
-            return
+        if not self.bubble_groups or not self.app_config.get('ui', {}).get('enable_floating_animation', True):
+            self.floating_animation_id = None
+            return False
         
+        # Schritte waren auf 6ms-Ticks ausgelegt - auf die echte Frame-Zeit skalieren
+        steps = dt / 0.006
         # Geschwindigkeit aus Konfiguration lesen
         floating_speed = self.app_config.get('ui', {}).get('floating_speed', 0.07)
-        self.floating_offset += floating_speed
+        self.floating_offset += floating_speed * steps
+        if self._float_drift_margin() is None:
+            self.hover_index = None  # Drift ohne Phasenfortschritt ist unbeschränkt
+        # Die Drift ist langsam - die Sichtbarkeit reicht gelegentlich neu zu bestimmen
+        self.visibility_age += dt
+        if self.visibility_age >= self.CULL_REFRESH_SECONDS:
+            self.visible_groups = None
+        
+        state = self._animation_state()
+        visible = self._visible_groups()  # Bubbles außerhalb des Viewports ruhen
+        if state is not None:
+            # Vektorisiert: Drift und Rotation der sichtbaren Bubbles in einem Schritt
+            for bubble_group, x, y, rotation in state.step_floating(self.floating_offset, steps):
+                self._update_bubble_items(bubble_group, x, y)
+                self._rotate_ring_items(bubble_group, x, y, rotation)
+            return
         
-        for bubble_group in self.bubble_groups:
+        for bubble_group in visible:
             # Kontinuierliche Drift-Animation ohne Sprünge
             phase = self.floating_offset + bubble_group['phase']
             
@@ -1927,63 +2224,111 @@ class BubbleCanvas(tk.Canvas):
             drift_y = math.sin(phase * 0.5) * 1.2  # Sehr kleine Y-Drift
             
             # Aktualisiere aktuelle Position kontinuierlich (nur Drift, keine Basis-Rückkehr)
-            bubble_group['current_x'] += drift_x * 0.05
-            bubble_group['current_y'] += drift_y * 0.05
+            bubble_group['current_x'] += drift_x * 0.05 * steps
+            bubble_group['current_y'] += drift_y * 0.05 * steps
             
             # Ring-Rotation aktualisieren
-            bubble_group['rotation_offset'] += 0.02  # Rotationsgeschwindigkeit
+            bubble_group['rotation_offset'] += 0.02 * steps  # Rotationsgeschwindigkeit
             
             # Aktualisiere alle Items in der Bubble-Gruppe
             self._update_bubble_items(bubble_group)
             
             # Ring-Items rotieren
             self._rotate_ring_items(bubble_group, bubble_group['current_x'], bubble_group['current_y'])
-        
-        # Nächste Animation planen (6ms = ~166 FPS für Mikro-Schritte)
-        self.floating_animation_id = self.after(6, self._animate_floating)
 
-    def _update_bubble_items(self, bubble_group):
-        """Aktualisiert alle Items einer Bubble-Gruppe mit der aktuellen Position."""
-        current_x = bubble_group['current_x']
-        current_y = bubble_group['current_y']
+    def _update_bubble_items(self, bubble_group, current_x=None, current_y=None):
+        """Aktualisiert alle Items einer Bubble-Gruppe mit der aktuellen Position (Standard: aus dem Dict)."""
+        if current_x is None:
+            current_x, current_y = bubble_group['current_x'], bubble_group['current_y']
         radius = bubble_group['radius']
         
-        for item in bubble_group['items']:
+        for item, coord_count in zip(bubble_group['items'], self._item_coord_counts(bubble_group)):
             try:
-                # Hole aktuelle Koordinaten
-                coords = self.coords(item)
-                if not coords:
-                    continue
-                
                 # Berechne neue Position basierend auf Item-Typ
-                if len(coords) >= 4:  # Oval oder Arc
+                if coord_count >= 4:  # Oval oder Arc
                     # Für Ovale und Arcs: [x1, y1, x2, y2]
                     self.coords(item, current_x - radius, current_y - radius, 
                               current_x + radius, current_y + radius)
-                elif len(coords) >= 2:  # Text
+                elif coord_count >= 2:  # Text
                     # Für Text: [x, y]
                     self.coords(item, current_x, current_y)
             except:
                 # Falls ein Item nicht mehr existiert, ignorieren
                 continue
 
-    def _rotate_ring_items(self, bubble_group, current_x, current_y):
-        """Rotiert die Ring-Items um die Bubble."""
+    def _item_types(self, bubble_group):
+        """Canvas-Typen der Bubble-Items (beim Erstellen der Gruppe einmal gelesen und gecacht)."""
+        types = bubble_group.get('item_types')
+        if types is None:
+            types = bubble_group['item_types'] = [self.type(item) for item in bubble_group['items']]
+        return types
+
+    def _ring_item_types(self, bubble_group):
+        """Canvas-Typen der Ring-Items (beim Erstellen der Gruppe einmal gelesen und gecacht)."""
+        types = bubble_group.get('ring_item_types')
+        if types is None:
+            types = bubble_group['ring_item_types'] = [self.type(item) for item in bubble_group['ring_items']]
+        return types
+
+    def _item_coord_counts(self, bubble_group):
+        """Anzahl Koordinaten je Item (aus den gecachten Item-Typen abgeleitet)."""
+        counts = bubble_group.get('item_coord_counts')
+        if counts is None:
+            counts = [2 if item_type == 'text' else 4 for item_type in self._item_types(bubble_group)]
+            bubble_group['item_coord_counts'] = counts
+        return counts
+
+    def _ring_item_is_arc(self, bubble_group):
+        """Ob die Ring-Items Arcs sind (aus den gecachten Item-Typen abgeleitet)."""
+        flags = bubble_group.get('ring_item_is_arc')
+        if flags is None:
+            flags = [item_type == 'arc' for item_type in self._ring_item_types(bubble_group)]
+            bubble_group['ring_item_is_arc'] = flags
+        return flags
+
+    def _animation_state(self):
+        """Liefert den NumPy-Animationszustand (neu aufgebaut, wenn sich die Bubbles geändert haben)."""
+        if not NUMPY_AVAILABLE:
+            return None
+        state = self.anim_state
+        if state is None or len(state.groups) != len(self.bubble_groups):
+            self._invalidate_animation_state()
+            state = self.anim_state = VectorAnimationState(self.bubble_groups)
+            self.visible_groups = None  # Aktive Gruppen des neuen Zustands setzen
+        return state
+
+    def _group_position(self, index):
+        """Aktuelle Position der Gruppe index - aus dem NumPy-Zustand, solange er lebt."""
+        if self.anim_state is not None:
+            return self.anim_state.position(index)
+        group = self.bubble_groups[index]
+        return group['current_x'], group['current_y']
+
+    def _invalidate_animation_state(self):
+        """Verwirft den NumPy-Zustand, nachdem Positionen und Orbit-Winkel in die Dicts zurückgeschrieben wurden."""
+        self._geometry_changed()
+        if self.anim_state is not None:
+            self.anim_state.sync_back()
+            self.anim_state = None
+
+    def _rotate_ring_items(self, bubble_group, current_x, current_y, rotation=None):
+        """Rotiert die Ring-Items um die Bubble (Rotation standardmäßig aus dem Dict)."""
         if not bubble_group['ring_items']:
             return
         
         center_x = current_x
         center_y = current_y
         radius = bubble_group['radius']
-        rotation = bubble_group['rotation_offset']
+        if rotation is None:
+            rotation = bubble_group['rotation_offset']
         
-        for i, item in enumerate(bubble_group['ring_items']):
+        for i, (item, is_arc) in enumerate(zip(bubble_group['ring_items'], self._ring_item_is_arc(bubble_group))):
             try:
                 # Berechne rotierte Position für jeden Ring
                 angle_offset = (i * 0.5) + rotation  # Verschiedene Winkel für verschiedene Ringe
                 
                 # Für Deadline-Halos: Rotiere um die Bubble
-                if 'arc' in str(self.type(item)):
+                if is_arc:
                     # Arc-Items rotieren
                     arc_radius = radius + 15 + (i % 3) * 5  # Verschiedene Radien
                     start_angle = (angle_offset * 57.3) % 360  # Konvertiere zu Grad
@@ -2000,7 +2345,7 @@ class BubbleCanvas(tk.Canvas):
                     self.itemconfig(item, start=start_angle, extent=extent)
                 
                 # Für Progress-Ringe: Rotiere um die Bubble
-                elif 'arc' in str(self.type(item)) and 'progress' in str(item):
+                elif is_arc and 'progress' in str(item):
                     ring_radius = radius + 8
                     start_angle = (angle_offset * 57.3) % 360
                     
@@ -2086,8 +2431,8 @@ class BubbleCanvas(tk.Canvas):
         min_distance = radius * 7.5  # Mindestabstand zwischen Bubbles (3x mehr Abstand)
         
         # Grid-basierte Verteilung mit Kollisionserkennung
-        grid_size = int(math.ceil(math.sqrt(num_bubbles * 2)))  # Größeres Grid für bessere Verteilung
         cell_size = min_distance
+        placed = SpatialHash(min_distance)
         
         # Versuche Positionen zu finden
         for i in range(num_bubbles):
@@ -2108,14 +2453,11 @@ class BubbleCanvas(tk.Canvas):
                     y = center_y + distance * math.sin(angle)
                 
                 # Prüfe auf Überlappungen
-                overlap = False
-                for existing_x, existing_y in positions:
-                    if math.sqrt((x - existing_x)**2 + (y - existing_y)**2) < min_distance:
-                        overlap = True
-                        break
+                overlap = placed.has_within(x, y, min_distance)
                 
                 if not overlap:
                     positions.append((x, y))
+                    placed.insert(i, x, y)
                     break
                 
                 attempts += 1
@@ -2127,5 +2469,6 @@ class BubbleCanvas(tk.Canvas):
                 x = center_x + spiral_radius * math.cos(angle)
                 y = center_y + spiral_radius * math.sin(angle)
                 positions.append((x, y))
+                placed.insert(i, x, y)
         
         return positions
\ No newline at end of file
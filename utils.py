@@ -4,6 +4,7 @@ Hilfsfunktionen und -klassen für das Coworking Tool.
 """
 
 import os
+import json
 import random
 import time
 import math
@@ -15,10 +16,32 @@ try:
 except ImportError:
     PILLOW_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 def now_iso():
     """Gibt die aktuelle Zeit als ISO 8601 String in UTC zurück."""
     return datetime.now(timezone.utc).isoformat()
 
+def parse_checklist(raw):
+    """Parst checklist_json robust - ungültige Daten ergeben eine leere Liste."""
+    try:
+        items = json.loads(raw or "[]")
+    except (ValueError, TypeError):
+        return []
+    if not isinstance(items, list):
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+def checklist_stats(items):
+    """Kennzahlen einer Checkliste: Anzahl, erledigt und Fortschritt in Prozent."""
+    total = len(items)
+    done = sum(1 for item in items if item.get("done", False))
+    return {"total": total, "done": done, "percent": int((done / total) * 100) if total else 0}
+
 def ease_in_out_sine(t):
     """Easing-Funktion für sanfte Animationen (0-1 Input, 0-1 Output)."""
     return -(math.cos(math.pi * t) - 1) / 2
@@ -68,35 +91,86 @@ def generate_fallback_assets():
         pass
 
 class AnimationManager:
-    """Verwaltet Animationen für UI-Elemente."""
+    """
+    Zentraler Frame-Scheduler für alle Animationen.
+
+    Ein einziger after()-Tick pro Frame treibt sowohl Tweens (animate) als auch
+    registrierte Subsysteme (register). Das Frame-Budget ergibt sich aus
+    ui.animation_fps; dauert ein Frame länger, wird die Framerate adaptiv gesenkt.
+    Ohne laufende Animationen wird kein Tick geplant.
+    """
+    MIN_FPS = 10
+    MAX_DT = 0.25  # Maximal angerechnete Zeit pro Frame (z.B. nach Pausen)
+
     def __init__(self, master, fps=30):
         self.master = master
-        self.fps = fps
-        self.interval = int(1000 / fps)
+        self.target_fps = max(self.MIN_FPS, int(fps or 30))
+        self.fps = self.target_fps
+        self.interval = int(1000 / self.fps)
         self.animations = {}  # {id: AnimationData}
+        self.subsystems = {}  # {name: {'callback', 'interval', 'elapsed'}}
         self.running = False
         self.animation_id = None
+        self.last_tick = None
+        self.last_frame_time = 0.0
+        self.fast_frames = 0
 
     def start(self):
         if not self.running:
             self.running = True
-            self._tick()
+            self._wake()
 
     def stop(self):
         self.running = False
         if self.animation_id:
             self.master.after_cancel(self.animation_id)
             self.animation_id = None
+        self.last_tick = None
+
+    def set_fps(self, fps):
+        """Setzt die Ziel-Framerate (z.B. nach Änderung in den Einstellungen)."""
+        self.target_fps = max(self.MIN_FPS, int(fps or 30))
+        self.fps = self.target_fps
+        self.interval = int(1000 / self.fps)
+
+    def register(self, name, callback, interval=None):
+        """
+        Registriert ein Subsystem, das einmal pro Frame mit der vergangenen Zeit (dt, Sekunden)
+        aufgerufen wird. Mit interval (Sekunden) wird es seltener aufgerufen. Gibt der Callback
+        False zurück, wird das Subsystem entfernt. Ein erneutes Registrieren ersetzt den Eintrag.
+        """
+        self.subsystems[name] = {'callback': callback, 'interval': interval or 0, 'elapsed': 0.0}
+        self._wake()
+        return name
+
+    def unregister(self, name):
+        """Entfernt ein Subsystem."""
+        self.subsystems.pop(name, None)
+
+    def is_registered(self, name):
+        return name in self.subsystems
+
+    def _wake(self):
+        """Plant den nächsten Tick, falls der Scheduler gerade ruht."""
+        if self.running and self.animation_id is None and (self.animations or self.subsystems):
+            self.last_tick = None
+            self.animation_id = self.master.after(self.interval, self._tick)
 
     def _tick(self):
+        self.animation_id = None
         if not self.running:
             return
 
+        frame_start = time.perf_counter()
+        dt = frame_start - self.last_tick if self.last_tick is not None else self.interval / 1000.0
+        dt = min(dt, self.MAX_DT)
+        self.last_tick = frame_start
+
         current_time = time.time()
 
         # Alle Animationen aktualisieren
         to_remove = []
-        for anim_id, anim_data in self.animations.items():
+        for anim_id, anim_data in list(self.animations.items()):
             if current_time >= anim_data['end_time']:
                 # Animation beendet
                 if anim_data['callback']:
@@ -120,10 +194,46 @@ class AnimationManager:
 
         # Beendete Animationen entfernen
         for anim_id in to_remove:
-            del self.animations[anim_id]
+            self.animations.pop(anim_id, None)
+
+        # Subsysteme in einem Durchlauf treiben
+        for name, entry in list(self.subsystems.items()):
+            entry['elapsed'] += dt
+            if entry['elapsed'] < entry['interval']:
+                continue
+            step, entry['elapsed'] = entry['elapsed'], 0.0
+            try:
+                keep = entry['callback'](step)
+            except Exception as e:
+                print(f"Animation '{name}' stopped: {e}")
+                keep = False
+            if keep is False and self.subsystems.get(name) is entry:
+                del self.subsystems[name]
 
-        # Nächsten Tick planen
-        self.animation_id = self.master.after(self.interval, self._tick)
+        self._adapt_frame_rate(time.perf_counter() - frame_start)
+
+        # Nächsten Tick nur planen, wenn noch etwas animiert wird
+        if self.animations or self.subsystems:
+            delay = max(1, self.interval - int(self.last_frame_time * 1000))
+            self.animation_id = self.master.after(delay, self._tick)
+        else:
+            self.last_tick = None
+
+    def _adapt_frame_rate(self, frame_time):
+        """Senkt die Framerate bei überlaufenden Frames und hebt sie langsam wieder an."""
+        self.last_frame_time = frame_time
+        budget = self.interval / 1000.0
+        if frame_time > budget and self.fps > self.MIN_FPS:
+            self.fps = max(self.MIN_FPS, int(self.fps * 0.75))
+            self.fast_frames = 0
+        elif frame_time < budget * 0.5 and self.fps < self.target_fps:
+            self.fast_frames += 1
+            if self.fast_frames >= self.fps:  # ca. eine Sekunde stabil
+                self.fps = min(self.target_fps, self.fps + 5)
+                self.fast_frames = 0
+        else:
+            self.fast_frames = 0
+        self.interval = int(1000 / self.fps)
 
     def animate(self, anim_id, start_value, end_value, duration, update_callback=None, finished_callback=None):
         """Startet eine neue Animation."""
@@ -135,8 +245,175 @@ class AnimationManager:
             'update_callback': update_callback,
             'callback': finished_callback
         }
+        self._wake()
 
     def stop_animation(self, anim_id):
         """Stoppt eine bestimmte Animation."""
         if anim_id in self.animations:
-            del self.animations[anim_id]
\ No newline at end of file
+            del self.animations[anim_id]
+
+class SpatialHash:
+    """
+    Gleichmäßiges Gitter als räumlicher Index für Kreis-Positionen.
+
+    Nachbarschaftsabfragen prüfen nur die Zellen im Umkreis statt aller Punkte
+    und vergleichen quadrierte Abstände (kein sqrt).
+    """
+    def __init__(self, cell_size):
+        self.cell_size = max(1.0, float(cell_size))
+        self.cells = {}  # {(cx, cy): [key, ...]}
+        self.positions = {}  # {key: (x, y)}
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def insert(self, key, x, y):
+        """Fügt einen Punkt ein (ein bestehender Schlüssel wird verschoben)."""
+        if key in self.positions:
+            self.remove(key)
+        self.positions[key] = (x, y)
+        self.cells.setdefault(self._cell(x, y), []).append(key)
+
+    def remove(self, key):
+        pos = self.positions.pop(key, None)
+        if pos is None:
+            return
+        cell = self._cell(*pos)
+        bucket = self.cells.get(cell)
+        if bucket:
+            bucket.remove(key)
+            if not bucket:
+                del self.cells[cell]
+
+    def move(self, key, x, y):
+        """Aktualisiert die Position eines Punkts (Zellwechsel nur bei Bedarf)."""
+        old = self.positions.get(key)
+        if old is not None and self._cell(*old) == self._cell(x, y):
+            self.positions[key] = (x, y)
+        else:
+            self.insert(key, x, y)
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def candidates(self, x, y, distance):
+        """Alle Schlüssel in den Zellen, die den Umkreis (x, y, distance) berühren."""
+        cx0, cy0 = self._cell(x - distance, y - distance)
+        cx1, cy1 = self._cell(x + distance, y + distance)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query(self, x, y, distance):
+        """Liefert (key, px, py) aller Punkte, die näher als distance an (x, y) liegen."""
+        limit = distance * distance
+        for key in self.candidates(x, y, distance):
+            px, py = self.positions[key]
+            if (px - x) ** 2 + (py - y) ** 2 < limit:
+                yield key, px, py
+
+    def has_within(self, x, y, distance):
+        """True, falls ein Punkt näher als distance an (x, y) liegt."""
+        for _ in self.query(x, y, distance):
+            return True
+        return False
+
+class VectorAnimationState:
+    """
+    Animationszustand der Bubbles und Asteroiden als zusammenhängende NumPy-Arrays.
+
+    Positionen, Phasen, Rotationen, Orbit-Winkel, Geschwindigkeiten und Distanzen werden
+    einmal aus den Bubble-Gruppen übernommen und pro Frame in einem vektorisierten Schritt
+    weitergerechnet. Solange der Zustand lebt, sind die Arrays maßgeblich; in die
+    Gruppen- und Asteroiden-Dicts wird erst beim Verwerfen zurückgeschrieben (sync_back).
+    Mit set_active werden nur die sichtbaren Gruppen und ihre Asteroiden weitergerechnet.
+    """
+    def __init__(self, groups):
+        self.groups = list(groups)
+        self.x = np.array([g['current_x'] for g in self.groups], dtype=float)
+        self.y = np.array([g['current_y'] for g in self.groups], dtype=float)
+        self.phase = np.array([g.get('phase', 0.0) for g in self.groups], dtype=float)
+        self.rotation = np.array([g.get('rotation_offset', 0.0) for g in self.groups], dtype=float)
+
+        self.asteroids = []
+        owners = []
+        for index, group in enumerate(self.groups):
+            for asteroid_data in group.get('asteroids', []):
+                self.asteroids.append(asteroid_data)
+                owners.append(index)
+        self.owner = np.array(owners, dtype=np.intp)
+        self.angle = np.array([a['angle'] for a in self.asteroids], dtype=float)
+        self.speed = np.array([a['speed'] for a in self.asteroids], dtype=float)
+        self.distance = np.array([a['distance'] for a in self.asteroids], dtype=float)
+        self.base_size = np.array([5 if a.get('done', False) else 7 for a in self.asteroids], dtype=float)
+
+        self.set_active(None)
+
+    def set_active(self, active):
+        """Beschränkt die Frame-Schritte auf die Gruppen-Indizes active (None = alle Gruppen)."""
+        if active is None:
+            self.active = np.arange(len(self.groups), dtype=np.intp)
+            self.active_asteroids = np.arange(len(self.asteroids), dtype=np.intp)
+        else:
+            self.active = np.asarray(active, dtype=np.intp)
+            self.active_asteroids = np.flatnonzero(np.isin(self.owner, self.active))
+
+    def position(self, index):
+        """Aktuelle Position (x, y) der Gruppe index."""
+        return float(self.x[index]), float(self.y[index])
+
+    def translate(self, dx, dy):
+        """Verschiebt alle Bubbles (Pan) um dx/dy."""
+        self.x += dx
+        self.y += dy
+
+    def step_floating(self, floating_offset, steps):
+        """Drift und Ring-Rotation der aktiven Bubbles in einem Schritt; liefert (Gruppe, x, y, Rotation)-Tupel."""
+        active = self.active
+        phase = floating_offset + self.phase[active]
+        self.x[active] += np.sin(phase * 0.3) * 0.8 * 0.05 * steps
+        self.y[active] += np.sin(phase * 0.5) * 1.2 * 0.05 * steps
+        self.rotation[active] += 0.02 * steps
+        groups = [self.groups[i] for i in active.tolist()]
+        return list(zip(groups, self.x[active].tolist(), self.y[active].tolist(), self.rotation[active].tolist()))
+
+    def step_asteroids(self, steps, floating_speed, zoom_level):
+        """Dreht die Asteroiden aktiver Bubbles weiter; liefert (Asteroid, [x1, y1, x2, y2])-Paare."""
+        selected = self.active_asteroids
+        if not len(selected):
+            return []
+        self.angle[selected] += self.speed[selected] * floating_speed * 2 * steps
+        return self.asteroid_coords(selected, zoom_level)
+
+    def asteroid_coords(self, selected, zoom_level):
+        """Oval-Koordinaten der Asteroiden mit den Indizes selected, ohne sie weiterzudrehen."""
+        selected = np.asarray(selected, dtype=np.intp)
+        if not len(selected):
+            return []
+        owners = self.owner[selected]
+        angle = self.angle[selected]
+        distance = self.distance[selected]
+        new_x = self.x[owners] + distance * np.cos(angle)
+        new_y = self.y[owners] + distance * np.sin(angle)
+        size = (self.base_size[selected] * zoom_level).astype(int)
+        coords = np.column_stack((new_x - size, new_y - size, new_x + size, new_y + size)).tolist()
+        return [(self.asteroids[i], c) for i, c in zip(selected.tolist(), coords)]
+
+    def group_asteroids(self, index):
+        """Indizes der Asteroiden, die zur Gruppe index gehören."""
+        return np.flatnonzero(self.owner == index)
+
+    def sync_back(self):
+        """Überträgt Positionen und Rotationen in die Gruppen-Dicts, Orbit-Winkel und Zentren in die Asteroiden-Dicts."""
+        xs, ys = self.x.tolist(), self.y.tolist()
+        for group, x, y, rotation in zip(self.groups, xs, ys, self.rotation.tolist()):
+            group['current_x'] = x
+            group['current_y'] = y
+            group['rotation_offset'] = rotation
+        for asteroid_data, owner, angle in zip(self.asteroids, self.owner.tolist(), self.angle.tolist()):
+            asteroid_data['angle'] = angle
+            asteroid_data['center_x'] = xs[owner]
+            asteroid_data['center_y'] = ys[owner]